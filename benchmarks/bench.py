@@ -0,0 +1,265 @@
+"""
+Микробенчмарки разбора вакансий, хранилища и запросов.
+
+Запуск из корня репозитория:
+    python benchmarks/bench.py --sizes 1000 100000 --output bench.json
+    python benchmarks/bench.py --sizes 1000 100000 --baseline bench.json
+
+Результаты сохраняются в JSON: для каждого замера лучшее время из нескольких
+повторов в секундах. При сравнении с базовым файлом замеры, ставшие медленнее
+больше чем на --threshold, выводятся как регрессии, а код возврата равен 1.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "hhapi"))
+
+from datajob import select_top_by_salary  # noqa: E402
+from datajobhhjson import DataJobHHJSON  # noqa: E402
+from vacancyhh import VacancyHH  # noqa: E402
+
+CURRENCY_RATES = {"RUR": 1.0, "USD": 0.011, "EUR": 0.0095, "KZT": 5.3}
+NAMES = ("Python", "Java", "Go", "Data", "QA", "Frontend", "DevOps", "Analyst")
+LEVELS = ("Junior", "Middle", "Senior", "Lead")
+EMPLOYERS = ("Яндекс", "Сбер", "Тинькофф", "VK", "Ozon", "Авито", "Kaspersky")
+
+
+def generate_vacancies(count: int, seed: int = 0) -> list:
+    """
+    Генерирует вакансии в формате ответа hh.ru /vacancies:
+    около четверти без зарплаты, часть в иностранной валюте.
+    """
+    rnd = random.Random(seed)
+    start = datetime(2024, 1, 1, tzinfo=timezone(timedelta(hours=3)))
+    items = []
+    for i in range(count):
+        salary = None
+        if rnd.random() > 0.25:
+            currency = rnd.choice(("RUR", "RUR", "RUR", "USD", "EUR", "KZT"))
+            # Зарплата задаётся в рублях и переводится в валюту вакансии
+            low = rnd.randint(30, 400) * 1000 * CURRENCY_RATES[currency]
+            salary = {
+                "from": low if rnd.random() > 0.3 else None,
+                "to": low * 1.5 if rnd.random() > 0.3 else None,
+                "currency": currency,
+                "gross": True,
+            }
+        published_at = start + timedelta(seconds=rnd.randint(0, 365 * 24 * 3600))
+        items.append(
+            {
+                "id": str(100000000 + i),
+                "name": f"{rnd.choice(LEVELS)} {rnd.choice(NAMES)} разработчик",
+                "url": f"https://api.hh.ru/vacancies/{100000000 + i}",
+                "published_at": published_at.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "employer": {
+                    "id": str(rnd.randint(1, 10**6)),
+                    "name": rnd.choice(EMPLOYERS),
+                },
+                "salary": salary,
+                "area": {"id": "1", "name": "Москва"},
+            }
+        )
+    return items
+
+
+def best_of(func, repeat: int) -> float:
+    """
+    Лучшее время выполнения func из repeat запусков в секундах
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(sizes, repeat: int) -> dict:
+    results = {}
+
+    def record(name: str, size: int, seconds: float) -> None:
+        key = f"{name}@{size}"
+        results[key] = seconds
+        print(f"{key:40} {seconds * 1000:12.2f} ms", flush=True)
+
+    for size in sizes:
+        items = generate_vacancies(size)
+        # Большие наборы повторяются меньше раз, чтобы прогон оставался разумным
+        size_repeat = repeat if size <= 100_000 else 1
+
+        record(
+            "vacancy_init",
+            size,
+            best_of(
+                lambda: [VacancyHH(item, CURRENCY_RATES) for item in items], size_repeat
+            ),
+        )
+        record(
+            "vacancy_from_api_items",
+            size,
+            best_of(
+                lambda: list(VacancyHH.from_api_items(items, CURRENCY_RATES)),
+                size_repeat,
+            ),
+        )
+        foreign = [
+            item
+            for item in items
+            if item["salary"] and item["salary"]["currency"] != "RUR"
+        ]
+        record(
+            "currency_conversion",
+            size,
+            best_of(
+                lambda: [VacancyHH(item, CURRENCY_RATES).salary for item in foreign],
+                size_repeat,
+            ),
+        )
+
+        vacancies = list(VacancyHH.from_api_items(items, CURRENCY_RATES))
+        record(
+            "sort_all",
+            size,
+            best_of(lambda: sorted(vacancies, reverse=True)[:10], size_repeat),
+        )
+
+        record(
+            "top_n_heap",
+            size,
+            best_of(
+                lambda: select_top_by_salary(vacancies, 10, lambda v: v.salary),
+                size_repeat,
+            ),
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "vacancies.json"
+            data_job = DataJobHHJSON(str(path))
+            record(
+                "json_add_many", size, best_of(lambda: data_job.add_many(vacancies), 1)
+            )
+            extra = VacancyHH({"id": "1", "name": "Extra", "salary": 1000})
+            record(
+                "json_add_one", size, best_of(lambda: data_job.add(extra), size_repeat)
+            )
+            record(
+                "json_get_vacancies", size, best_of(data_job.get_vacancies, size_repeat)
+            )
+            record(
+                "json_get_vacancies_regex",
+                size,
+                best_of(lambda: data_job.get_vacancies(name="python"), size_repeat),
+            )
+            record(
+                "json_find_vacancies",
+                size,
+                best_of(lambda: data_job.find_vacancies("python"), size_repeat),
+            )
+            record(
+                "json_top_by_salary",
+                size,
+                best_of(lambda: data_job.top_by_salary(10), size_repeat),
+            )
+            record(
+                "json_iter_vacancies",
+                size,
+                best_of(lambda: sum(1 for _ in data_job.iter_vacancies()), size_repeat),
+            )
+            csv_path = str(Path(directory) / "vacancies.csv")
+            record(
+                "json_save_to_csv",
+                size,
+                best_of(lambda: data_job.save_to_csv(csv_path), size_repeat),
+            )
+
+            cached_job = DataJobHHJSON(str(path), use_cache=True)
+            cached_job.get_vacancies()
+            record(
+                "json_cached_get_vacancies",
+                size,
+                best_of(cached_job.get_vacancies, size_repeat),
+            )
+            cached_job.find_vacancies("")
+            record(
+                "json_cached_find_vacancies",
+                size,
+                best_of(lambda: cached_job.find_vacancies("python"), size_repeat),
+            )
+
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Возвращает замеры, ставшие медленнее базовых больше чем на threshold (доля)
+    """
+    regressions = []
+    for key, seconds in results.items():
+        base = baseline.get(key)
+        if base and seconds > base * (1 + threshold):
+            regressions.append((key, base, seconds))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 100_000],
+        help="размеры наборов вакансий",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="количество повторов каждого замера"
+    )
+    parser.add_argument("--output", help="файл для сохранения результатов в JSON")
+    parser.add_argument("--baseline", help="файл с базовыми результатами для сравнения")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="допустимое замедление (0.2 = 20%%)",
+    )
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat)
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": args.sizes,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for key, base, seconds in regressions:
+            print(
+                f"Регрессия {key}: {base * 1000:.2f} ms -> {seconds * 1000:.2f} ms ({seconds / base - 1:+.0%})"
+            )
+        if regressions:
+            sys.exit(1)
+        print("Регрессий относительно базовых результатов нет.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Нагрузочный тест APIJobHH на локальном сервере-имитации hh.ru.
+
+Запуск из корня репозитория:
+    python benchmarks/loadtest.py --operations 200 --concurrency 16 --latency 0.02
+    python benchmarks/loadtest.py --error-rate 0.05 --rate-limit 200
+    python benchmarks/loadtest.py --base-url http://127.0.0.1:8080 --operations 50
+
+Без --base-url запускается встроенный HHStubServer с заданными параметрами.
+Каждая операция — поиск вакансий на --pages страниц и запрос подробностей
+по --details первым вакансиям. Выводятся пропускная способность,
+задержки p50/p99 по типам операций и количество ошибок.
+"""
+
+import argparse
+import json
+import math
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "hhapi"))
+
+from apijobhh import APIJobHH  # noqa: E402
+from hhstub import HHStubServer  # noqa: E402
+from metrics import metrics  # noqa: E402
+
+
+def percentile(values: list, q: float) -> float:
+    """
+    Перцентиль методом ближайшего ранга, для пустого списка — NaN
+    """
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def run_load_test(
+    base_url: str,
+    operations: int = 100,
+    concurrency: int = 8,
+    pages: int = 3,
+    details: int = 2,
+    keyword: str = "python",
+) -> dict:
+    """
+    Выполняет operations операций в concurrency потоков против сервера base_url.
+    :return: отчёт с длительностью, пропускной способностью, задержками и ошибками
+    """
+    APIJobHH.configure_transport(pool_size=concurrency, max_retries=3)
+    APIJobHH.configure_base_url(base_url)
+    transport = APIJobHH.get_transport()
+    latencies = {"search": [], "details": []}
+    errors = {}
+    lock = threading.Lock()
+
+    def timed(kind: str, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        except Exception as error:
+            name = type(error).__name__
+            with lock:
+                errors[name] = errors.get(name, 0) + 1
+            return None
+        finally:
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies[kind].append(elapsed)
+
+    def operation(number: int) -> None:
+        api = APIJobHH()
+        vacancies = timed("search", api.search_vacancies, f"{keyword} {number}", pages)
+        for vacancy in (vacancies or [])[:details]:
+            timed("details", APIJobHH.get_vacancy_details, vacancy["id"])
+
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(operation, range(operations)))
+    finally:
+        elapsed = time.perf_counter() - start
+        stats = transport.stats
+        APIJobHH.configure_base_url(None)
+
+    return {
+        "elapsed": elapsed,
+        "operations": operations,
+        "operations_per_second": operations / elapsed if elapsed else math.nan,
+        "http_requests": stats["requests"],
+        "http_requests_per_second": (
+            stats["requests"] / elapsed if elapsed else math.nan
+        ),
+        "retries": stats["retries"],
+        "failures": stats["failures"],
+        "errors": errors,
+        "latency": {
+            kind: {
+                "count": len(values),
+                "p50": percentile(values, 50),
+                "p99": percentile(values, 99),
+            }
+            for kind, values in latencies.items()
+        },
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"Длительность:          {report['elapsed']:.2f} s")
+    print(
+        f"Операций:              {report['operations']} "
+        f"({report['operations_per_second']:.1f} в секунду)"
+    )
+    print(
+        f"HTTP-запросов:         {report['http_requests']} "
+        f"({report['http_requests_per_second']:.1f} в секунду)"
+    )
+    print(f"Повторов:              {report['retries']}")
+    print(f"Неудачных запросов:    {report['failures']}")
+    print(f"Ошибок операций:       {sum(report['errors'].values())} {report['errors']}")
+    for kind, latency in report["latency"].items():
+        print(
+            f"Задержка {kind:8}      p50 {latency['p50'] * 1000:8.1f} ms   "
+            f"p99 {latency['p99'] * 1000:8.1f} ms   ({latency['count']} вызовов)"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--base-url", help="адрес сервера вместо встроенной имитации")
+    parser.add_argument(
+        "--operations", type=int, default=100, help="количество операций"
+    )
+    parser.add_argument("--concurrency", type=int, default=8, help="количество потоков")
+    parser.add_argument("--pages", type=int, default=3, help="страниц на поиск")
+    parser.add_argument(
+        "--details", type=int, default=2, help="запросов подробностей на поиск"
+    )
+    stub = parser.add_argument_group("параметры встроенной имитации")
+    stub.add_argument("--found", type=int, default=2000, help="вакансий в выдаче")
+    stub.add_argument("--latency", type=float, default=0.0, help="задержка ответа, s")
+    stub.add_argument(
+        "--error-rate", type=float, default=0.0, help="доля ответов 503 (0..1)"
+    )
+    stub.add_argument(
+        "--rate-limit", type=float, help="запросов в секунду до ответов 429"
+    )
+    stub.add_argument(
+        "--max-depth", type=int, default=2000, help="ограничение глубины выдачи"
+    )
+    parser.add_argument("--output", help="файл для сохранения отчёта в JSON")
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="собрать метрики клиента и вывести их в формате Prometheus",
+    )
+    args = parser.parse_args()
+    if args.metrics:
+        metrics.enable()
+
+    options = dict(
+        operations=args.operations,
+        concurrency=args.concurrency,
+        pages=args.pages,
+        details=args.details,
+    )
+    if args.base_url:
+        report = run_load_test(args.base_url, **options)
+    else:
+        with HHStubServer(
+            found=args.found,
+            latency=args.latency,
+            error_rate=args.error_rate,
+            rate_limit=args.rate_limit,
+            max_depth=args.max_depth,
+        ) as server:
+            report = run_load_test(server.url, **options)
+            report["server"] = server.stats
+
+    print_report(report)
+    if args.metrics:
+        print(metrics.to_prometheus(), end="")
+        report["metrics"] = metrics.snapshot()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+
+
+if __name__ == "__main__":
+    main()
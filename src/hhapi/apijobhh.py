@@ -1,25 +1,45 @@
-from typing import Optional
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, Optional
 
-import requests
 from apijob import APIJob
+from detailcache import VacancyDetailsCache
+from ratelimit import RateLimiter
+from transport import HHTransport
 
 
 class APIJobHH(APIJob):
     """Класс для сбора вакансий с hh.ru"""
 
-    __VACANCIES_URL = "https://api.hh.ru/vacancies"
-    __DICTS_URL = "https://api.hh.ru/dictionaries"
+    __DEFAULT_BASE_URL = "https://api.hh.ru"
+    __vacancies_url = f"{__DEFAULT_BASE_URL}/vacancies"
+    __dicts_url = f"{__DEFAULT_BASE_URL}/dictionaries"
     __HEADERS = {"User-Agent": "HH-User-Agent"}
     __PER_PAGE = 100  # Предопределённое количество результатов поиска на страницу
+    __MAX_DEPTH = (
+        2000  # hh.ru отдаёт не больше 2000 результатов (page * per_page) на запрос
+    )
 
     __currency_rates = {}  # Атрибут класса для хранения курсов валют
+    __currency_lock = threading.Lock()  # Защищает первую загрузку и обновление курсов
+    __currency_rates_file = None  # Файл для сохранения курсов между запусками
+    __currency_rates_ttl = 24 * 60 * 60  # Время жизни сохранённых курсов в секундах
+
+    # Общий для всех экземпляров транспорт с пулом соединений и повторами запросов
+    __transport = HHTransport(headers=__HEADERS)
+    # Общий для всех экземпляров ограничитель частоты запросов или None
+    __rate_limiter = None
 
     def __init__(self):
         self.params = {"text": "", "page": 0, "per_page": 100}
         self.__vacancies = []
         self.__detailed_vacancies = []
-        if not APIJobHH.__currency_rates:
-            APIJobHH.load_currency_rates()
+        self.search_stats = {}  # Статистика последнего вызова search_vacancies
+        self.harvest_stats = {}  # Статистика последнего вызова harvest_vacancies
 
     def connect(self) -> None:
         """
@@ -27,30 +47,257 @@ class APIJobHH(APIJob):
         """
         pass
 
-    def search_vacancies(self, keyword: str, pages_count: int = 1) -> list:
+    @classmethod
+    def configure_transport(cls, **options) -> HHTransport:
+        """
+        Пересоздаёт общий транспорт с новыми настройками.
+        Принимает параметры HHTransport: pool_size, timeout, max_retries,
+        backoff_factor, backoff_max, cache, rate_limiter. Если rate_limiter
+        не передан, используется заданный в configure_rate_limiter.
+        :return: новый транспорт
+        """
+        options.setdefault("headers", cls.__HEADERS)
+        options.setdefault("rate_limiter", cls.__rate_limiter)
+        cls.__transport.close()
+        cls.__transport = HHTransport(**options)
+        return cls.__transport
+
+    @classmethod
+    def configure_rate_limiter(cls, rate_limiter: Optional[RateLimiter]) -> None:
+        """
+        Задаёт ограничитель частоты запросов, общий для поиска, загрузки
+        подробностей и обновления курсов валют во всех экземплярах.
+        :param rate_limiter: ограничитель или None, чтобы снять ограничение
+        """
+        cls.__rate_limiter = rate_limiter
+        cls.__transport.rate_limiter = rate_limiter
+
+    @classmethod
+    def configure_base_url(cls, base_url: Optional[str] = None) -> None:
+        """
+        Задаёт адрес API, например локального тестового сервера.
+        :param base_url: адрес без завершающего "/" или None для https://api.hh.ru
+        """
+        base_url = (base_url or cls.__DEFAULT_BASE_URL).rstrip("/")
+        cls.__vacancies_url = f"{base_url}/vacancies"
+        cls.__dicts_url = f"{base_url}/dictionaries"
+
+    @classmethod
+    def get_transport(cls) -> HHTransport:
+        """
+        Возвращает общий транспорт, в том числе для чтения счётчиков запросов
+        """
+        return cls.__transport
+
+    def search_vacancies(
+        self,
+        keyword: str,
+        pages_count: int = 1,
+        max_workers: int = 1,
+        date_from: Optional[str] = None,
+    ) -> list:
         """
         Метод для поиска вакансий по ключевому слову.
         При каждом новом поиске список найденных вакансий сбрасывается.
+        Первая страница запрашивается всегда, из её поля "pages" берётся общее
+        количество страниц, чтобы не запрашивать страницы за пределами выдачи.
+        Статистика последнего поиска доступна в search_stats: found — количество
+        найденных вакансий, pages — количество страниц выдачи, fetched_pages —
+        количество загруженных страниц, truncated — выдача загружена не полностью
+        (из-за pages_count или ограничения hh.ru на глубину выдачи).
+        :param keyword: строка для поиска вакансий
+        :param pages_count: максимальное количество страниц для загрузки
+        :param max_workers: количество потоков для параллельной загрузки страниц,
+        при значении 1 страницы загружаются последовательно
+        :param date_from: если задана, ищутся только вакансии, опубликованные
+        начиная с этой даты (ISO 8601), от новых к старым
+        :return: список вакансий в порядке страниц выдачи
         """
         self.params = {"text": keyword, "page": 0, "per_page": APIJobHH.__PER_PAGE}
+        if date_from:
+            self.params["date_from"] = date_from
+            self.params["order_by"] = "publication_time"
         self.__vacancies = []
         self.__detailed_vacancies = []
+        self.search_stats = {
+            "found": 0,
+            "pages": 0,
+            "fetched_pages": 0,
+            "truncated": False,
+        }
 
-        while self.params.get("page") != pages_count:
-            response = requests.get(
-                APIJobHH.__VACANCIES_URL, headers=APIJobHH.__HEADERS, params=self.params
-            )
-            vacancies = response.json().get("items", [])
+        if pages_count <= 0:
+            return self.__vacancies
+
+        first_page = self.__fetch_page(0)
+        self.__vacancies.extend(first_page.get("items", []))
+
+        # Если в ответе нет поля "pages", ограничиваемся запрошенным количеством
+        total_pages = min(pages_count, first_page.get("pages", pages_count))
+        pages = range(1, total_pages)
+
+        if max_workers > 1 and len(pages) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # map возвращает результаты в порядке страниц
+                for page_data in executor.map(self.__fetch_page, pages):
+                    self.__vacancies.extend(page_data.get("items", []))
+        else:
+            for page in pages:
+                self.__vacancies.extend(self.__fetch_page(page).get("items", []))
+
+        # for vacancy in vacancies:
+        #     vacancy_details = self.get_vacancy_details(vacancy['id'])
+        #     self.__detailed_vacancies.append(vacancy_details)
+
+        # Если в ответе нет полей "found" и "pages", выдача считается загруженной целиком
+        found = first_page.get("found", len(self.__vacancies))
+        available_pages = first_page.get("pages", total_pages)
+        self.search_stats = {
+            "found": found,
+            "pages": available_pages,
+            "fetched_pages": total_pages,
+            "truncated": total_pages < available_pages
+            or found > available_pages * APIJobHH.__PER_PAGE,
+        }
+
+        self.params["page"] = total_pages
+        return self.__vacancies
+
+    def __fetch_page(self, page: int) -> dict:
+        """
+        Загружает одну страницу результатов поиска с текущими параметрами.
+        :param page: номер страницы, начиная с 0
+        :return: словарь с данными страницы
+        """
+        return self.__request_page({**self.params, "page": page})
+
+    @classmethod
+    def get_vacancies_page(cls, keyword: str, page: int = 0) -> dict:
+        """
+        Загружает одну страницу результатов поиска без сохранения состояния экземпляра,
+        например для параллельной загрузки страниц в IngestPipeline.
+        :param keyword: строка для поиска вакансий
+        :param page: номер страницы, начиная с 0
+        :return: словарь с данными страницы, включая "items" и "pages"
+        """
+        return cls.__request_page(
+            {"text": keyword, "page": page, "per_page": cls.__PER_PAGE}
+        )
+
+    @classmethod
+    def __request_page(cls, params: dict) -> dict:
+        return cls.__transport.get_json(cls.__vacancies_url, params=params)
 
-            # for vacancy in vacancies:
-            #     vacancy_details = self.get_vacancy_details(vacancy['id'])
-            #     self.__detailed_vacancies.append(vacancy_details)
+    def harvest_vacancies(
+        self,
+        keyword: str,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        areas: Optional[Iterable[str]] = None,
+        max_workers: int = 4,
+        min_window: timedelta = timedelta(minutes=10),
+        max_depth: Optional[int] = None,
+    ) -> list:
+        """
+        Метод для полной выгрузки вакансий по ключевому слову в обход ограничения
+        hh.ru на глубину выдачи (не больше 2000 результатов на запрос).
+        Запрос разбивается на подзапросы по окнам дат публикации (и, при необходимости,
+        по регионам): окно, в котором найдено больше результатов, чем помещается
+        в выдачу, делится пополам, пока подзапрос не уложится в ограничение
+        или окно не станет меньше min_window. Подзапросы выполняются параллельно,
+        результаты объединяются без повторов по id вакансии.
+        Статистика последней выгрузки доступна в harvest_stats.
+        :param keyword: строка для поиска вакансий
+        :param date_from: начало периода публикации, по умолчанию — 30 дней назад
+        :param date_to: конец периода публикации, по умолчанию — текущий момент
+        :param areas: id регионов hh.ru для дополнительного разбиения запроса
+        :param max_workers: количество потоков для параллельной загрузки
+        :param min_window: минимальная длительность окна дат
+        :param max_depth: ограничение глубины выдачи, по умолчанию 2000
+        :return: список вакансий без повторов
+        """
+        max_depth = max_depth or APIJobHH.__MAX_DEPTH
+        date_to = date_to or datetime.now(timezone.utc)
+        date_from = date_from or date_to - timedelta(days=30)
+        base_params = {"text": keyword, "per_page": APIJobHH.__PER_PAGE}
+
+        self.params = {**base_params, "page": 0}
+        self.__vacancies = []
+        self.__detailed_vacancies = []
+        self.harvest_stats = {"partitions": 0, "requests": 0, "truncated": 0}
 
-            self.__vacancies.extend(vacancies)
-            self.params["page"] += 1
+        windows = [
+            (date_from, date_to, area) for area in (list(areas) if areas else [None])
+        ]
+        first_pages = []  # (окно, первая страница) для подзапросов в пределах глубины
 
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            # Разбиение: первая страница каждого окна показывает, сколько найдено
+            while windows:
+                pages = list(
+                    executor.map(
+                        lambda window: self.__request_page(
+                            self.__window_params(base_params, window, 0)
+                        ),
+                        windows,
+                    )
+                )
+                self.harvest_stats["requests"] += len(windows)
+                next_windows = []
+                for window, page in zip(windows, pages):
+                    start, end, area = window
+                    if page.get("found", 0) > max_depth:
+                        if end - start > min_window:
+                            middle = start + (end - start) / 2
+                            next_windows.append((middle, end, area))
+                            next_windows.append((start, middle, area))
+                            continue
+                        self.harvest_stats["truncated"] += 1
+                    first_pages.append((window, page))
+                windows = next_windows
+
+            # Загрузка остальных страниц подзапросов
+            tasks = []
+            for window, page in first_pages:
+                pages_count = min(
+                    page.get("pages", 1), max_depth // APIJobHH.__PER_PAGE
+                )
+                tasks.extend((window, number) for number in range(1, pages_count))
+            rest_pages = executor.map(
+                lambda task: self.__request_page(
+                    self.__window_params(base_params, task[0], task[1])
+                ),
+                tasks,
+            )
+            pages_by_window = {window: [page] for window, page in first_pages}
+            for (window, _), page in zip(tasks, rest_pages):
+                pages_by_window[window].append(page)
+            self.harvest_stats["requests"] += len(tasks)
+
+        # Объединение: окна от новых к старым, страницы по порядку, без повторов по id
+        self.harvest_stats["partitions"] = len(first_pages)
+        seen = set()
+        for window, _ in sorted(first_pages, key=lambda item: item[0][1], reverse=True):
+            for page in pages_by_window[window]:
+                for vacancy in page.get("items", []):
+                    if vacancy["id"] not in seen:
+                        seen.add(vacancy["id"])
+                        self.__vacancies.append(vacancy)
         return self.__vacancies
 
+    @staticmethod
+    def __window_params(base_params: dict, window: tuple, page: int) -> dict:
+        start, end, area = window
+        params = {
+            **base_params,
+            "page": page,
+            "date_from": start.isoformat(timespec="seconds"),
+            "date_to": end.isoformat(timespec="seconds"),
+        }
+        if area is not None:
+            params["area"] = area
+        return params
+
     @classmethod
     def get_vacancy_details(cls, vacancy_id: str) -> dict:
         """
@@ -58,25 +305,134 @@ class APIJobHH(APIJob):
         :param vacancy_id: id вакансии hh.ru
         :return: словарь с данными вакансии
         """
-        response = requests.get(
-            f"{APIJobHH.__VACANCIES_URL}/{vacancy_id}", headers=APIJobHH.__HEADERS
-        )
-        if response.status_code != 200:
-            raise ConnectionError(f"Ошибка получения данных: {response.status_code}")
-        return response.json()
+        return cls.__transport.get_json(f"{cls.__vacancies_url}/{vacancy_id}")
+
+    @classmethod
+    def get_vacancy_details_many(
+        cls,
+        vacancy_ids: Iterable[str],
+        max_workers: int = 4,
+        cache: Optional[VacancyDetailsCache] = None,
+    ) -> dict:
+        """
+        Метод для получения деталей нескольких вакансий с параллельной загрузкой.
+        Вакансии, найденные в кэше, не запрашиваются, загруженные сохраняются в кэш
+        сразу после получения, поэтому при ошибке уже полученные данные не теряются.
+        :param vacancy_ids: id вакансий hh.ru, повторы запрашиваются один раз
+        :param max_workers: максимальное количество одновременных запросов
+        :param cache: дисковый кэш деталей вакансий или None, чтобы не кэшировать
+        :return: словарь id -> данные вакансии в порядке переданных id
+        """
+        vacancy_ids = list(dict.fromkeys(vacancy_ids))
+        details = {}
+        if cache is not None:
+            for vacancy_id in vacancy_ids:
+                cached = cache.get(vacancy_id)
+                if cached is not None:
+                    details[vacancy_id] = cached
+
+        def fetch(vacancy_id: str) -> dict:
+            vacancy_details = cls.get_vacancy_details(vacancy_id)
+            if cache is not None:
+                cache.set(vacancy_id, vacancy_details)
+            return vacancy_details
+
+        missing_ids = [
+            vacancy_id for vacancy_id in vacancy_ids if vacancy_id not in details
+        ]
+        if missing_ids:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                for vacancy_id, vacancy_details in zip(
+                    missing_ids, executor.map(fetch, missing_ids)
+                ):
+                    details[vacancy_id] = vacancy_details
+
+        return {vacancy_id: details[vacancy_id] for vacancy_id in vacancy_ids}
+
+    @classmethod
+    def configure_currency_rates(
+        cls, file_path: Optional[str] = None, ttl: float = 24 * 60 * 60
+    ) -> None:
+        """
+        Настраивает сохранение курсов валют в файл между запусками.
+        Если сохранённые курсы не старше ttl, они загружаются из файла без запроса к API.
+        :param file_path: путь к файлу с курсами или None, чтобы не сохранять курсы
+        :param ttl: время жизни сохранённых курсов в секундах
+        """
+        with cls.__currency_lock:
+            cls.__currency_rates_file = Path(file_path) if file_path else None
+            cls.__currency_rates_ttl = ttl
 
     @classmethod
     def load_currency_rates(cls) -> None:
         """
         Метод для загрузки курсов валют в атрибут класса.
+        Курсы загружаются при первом обращении: из файла, если он настроен
+        и не устарел, иначе из API. Одновременная первая загрузка из нескольких
+        потоков выполняется один раз.
         """
-        if not cls.__currency_rates:  # Загружаем курсы только если они ещё не загружены
-            response = requests.get(cls.__DICTS_URL, headers=cls.__HEADERS)
-            if response.status_code != 200:
-                print(f"Ошибка получения данных: {response.status_code}")
+        if cls.__currency_rates:  # Загружаем курсы только если они ещё не загружены
+            return
+        with cls.__currency_lock:
+            if cls.__currency_rates:
                 return
-            for currency in response.json()["currency"]:
-                cls.__currency_rates[currency["code"]] = currency["rate"]
+            rates = cls.__read_currency_rates_file()
+            if rates is None:
+                rates = cls.__fetch_currency_rates()
+            if rates:
+                cls.__currency_rates = rates
+
+    @classmethod
+    def refresh_currency_rates(cls) -> None:
+        """
+        Метод для принудительного обновления курсов валют из API.
+        При ошибке загрузки остаются прежние курсы.
+        """
+        with cls.__currency_lock:
+            rates = cls.__fetch_currency_rates()
+            if rates:
+                cls.__currency_rates = rates
+
+    @classmethod
+    def __fetch_currency_rates(cls) -> Optional[dict]:
+        """
+        Загружает курсы валют из справочников hh.ru и сохраняет их в файл, если он настроен
+        """
+        try:
+            dictionaries = cls.__transport.get_json(cls.__dicts_url)
+        except ConnectionError as error:
+            print(error)
+            return None
+
+        # Курсы собираются в новый словарь и подменяются целиком,
+        # поэтому читатели не видят частично заполненный словарь
+        rates = {}
+        for currency in dictionaries["currency"]:
+            rates[currency["code"]] = currency["rate"]
+
+        if cls.__currency_rates_file is not None:
+            cls.__currency_rates_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(cls.__currency_rates_file, "w", encoding="utf-8") as f:
+                json.dump({"loaded_at": time.time(), "rates": rates}, f)
+        return rates
+
+    @classmethod
+    def __read_currency_rates_file(cls) -> Optional[dict]:
+        """
+        Читает сохранённые курсы валют, если файл настроен, существует и не устарел
+        """
+        if cls.__currency_rates_file is None:
+            return None
+        try:
+            with open(cls.__currency_rates_file, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            if time.time() - saved["loaded_at"] > cls.__currency_rates_ttl:
+                return None
+            return dict(saved["rates"]) or None
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+            return None
 
     @classmethod
     def get_currency_rate(cls, currency_code: str) -> Optional[float]:
@@ -92,7 +448,7 @@ class APIJobHH(APIJob):
     @property
     def currency_rates(self) -> dict:
         """
-        Возвращает курсы валют в виде словаря
+        Возвращает курсы валют в виде словаря, загружая их при первом обращении
         """
         self.__class__.load_currency_rates()
         return self.__class__.__currency_rates
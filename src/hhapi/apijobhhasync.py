@@ -0,0 +1,234 @@
+import asyncio
+from typing import AsyncIterator, Iterable, Optional
+
+from apijob import APIJob
+from asynctransport import AsyncHHTransport
+from ratelimit import RateLimiter
+
+
+class APIJobHHAsync(APIJob):
+    """
+    Асинхронный класс для сбора вакансий с hh.ru.
+    Все экземпляры используют общий асинхронный транспорт с пулом соединений,
+    поэтому множество поисков может выполняться одновременно в одном цикле событий.
+    """
+
+    __DEFAULT_BASE_URL = "https://api.hh.ru"
+    __vacancies_url = f"{__DEFAULT_BASE_URL}/vacancies"
+    __dicts_url = f"{__DEFAULT_BASE_URL}/dictionaries"
+    __HEADERS = {"User-Agent": "HH-User-Agent"}
+    __PER_PAGE = 100  # Предопределённое количество результатов поиска на страницу
+
+    __currency_rates = {}  # Атрибут класса для хранения курсов валют
+    __currency_task = None  # Выполняющаяся загрузка курсов, общая для всех ожидающих
+
+    # Общий для всех экземпляров транспорт с пулом соединений и повторами запросов
+    __transport = AsyncHHTransport(headers=__HEADERS)
+
+    def __init__(self):
+        self.params = {"text": "", "page": 0, "per_page": 100}
+
+    def connect(self) -> None:
+        """
+        Отдельная установка соединения для hh.ru не требуется,
+        соединения пула открываются при первых запросах
+        """
+        pass
+
+    @classmethod
+    def configure_transport(cls, **options) -> AsyncHHTransport:
+        """
+        Пересоздаёт общий транспорт с новыми настройками.
+        Принимает параметры AsyncHHTransport: pool_size, timeout, max_retries,
+        backoff_factor, backoff_max, rate_limiter. Соединения прежнего транспорта
+        закрываются в close_transport или при завершении цикла событий.
+        :return: новый транспорт
+        """
+        options.setdefault("headers", cls.__HEADERS)
+        options.setdefault("rate_limiter", cls.__transport.rate_limiter)
+        cls.__transport = AsyncHHTransport(**options)
+        return cls.__transport
+
+    @classmethod
+    def configure_rate_limiter(cls, rate_limiter: Optional[RateLimiter]) -> None:
+        """
+        Задаёт ограничитель частоты запросов. Чтобы синхронный и асинхронный
+        клиенты делили бюджет, передайте тот же объект в APIJobHH.configure_rate_limiter.
+        """
+        cls.__transport.rate_limiter = rate_limiter
+
+    @classmethod
+    def configure_base_url(cls, base_url: Optional[str] = None) -> None:
+        """
+        Задаёт адрес API, например локального тестового сервера.
+        :param base_url: адрес без завершающего "/" или None для https://api.hh.ru
+        """
+        base_url = (base_url or cls.__DEFAULT_BASE_URL).rstrip("/")
+        cls.__vacancies_url = f"{base_url}/vacancies"
+        cls.__dicts_url = f"{base_url}/dictionaries"
+
+    @classmethod
+    def get_transport(cls) -> AsyncHHTransport:
+        """
+        Возвращает общий транспорт, в том числе для чтения счётчиков запросов
+        """
+        return cls.__transport
+
+    @classmethod
+    async def close_transport(cls) -> None:
+        """
+        Закрывает соединения общего пула
+        """
+        await cls.__transport.close()
+
+    async def search_vacancies(
+        self, keyword: str, pages_count: int = 1, concurrency: int = 4
+    ) -> AsyncIterator[dict]:
+        """
+        Асинхронный генератор страниц результатов поиска по ключевому слову.
+        Первая страница запрашивается всегда, из её поля "pages" берётся общее
+        количество страниц. Остальные страницы запрашиваются одновременно
+        и выдаются по мере получения, поэтому порядок страниц не гарантирован:
+        номер страницы содержится в поле "page" ответа.
+        :param keyword: строка для поиска вакансий
+        :param pages_count: максимальное количество страниц для загрузки
+        :param concurrency: максимальное количество одновременных запросов страниц
+        :return: асинхронный генератор словарей страниц с полем "items"
+        """
+        params = {"text": keyword, "page": 0, "per_page": APIJobHHAsync.__PER_PAGE}
+        self.params = params
+        if pages_count <= 0:
+            return
+
+        first_page = await self.__request_page({**params, "page": 0})
+        yield first_page
+
+        total_pages = min(pages_count, first_page.get("pages", pages_count))
+        if total_pages <= 1:
+            return
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch(page: int) -> dict:
+            async with semaphore:
+                return await self.__request_page({**params, "page": page})
+
+        tasks = [asyncio.ensure_future(fetch(page)) for page in range(1, total_pages)]
+        try:
+            for next_page in asyncio.as_completed(tasks):
+                yield await next_page
+        finally:
+            # Если потребитель прервал перебор или запрос завершился ошибкой,
+            # оставшиеся запросы отменяются
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def collect_vacancies(
+        self, keyword: str, pages_count: int = 1, concurrency: int = 4
+    ) -> list:
+        """
+        Загружает страницы поиска одновременно и возвращает вакансии
+        в порядке страниц выдачи, как APIJobHH.search_vacancies
+        """
+        pages = [
+            page
+            async for page in self.search_vacancies(keyword, pages_count, concurrency)
+        ]
+        pages.sort(key=lambda page: page.get("page", 0))
+        return [vacancy for page in pages for vacancy in page.get("items", [])]
+
+    @classmethod
+    async def __request_page(cls, params: dict) -> dict:
+        return await cls.__transport.get_json(cls.__vacancies_url, params=params)
+
+    @classmethod
+    async def get_vacancy_details(cls, vacancy_id: str) -> dict:
+        """
+        Метод для получения деталей вакансии.
+        :param vacancy_id: id вакансии hh.ru
+        :return: словарь с данными вакансии
+        """
+        return await cls.__transport.get_json(f"{cls.__vacancies_url}/{vacancy_id}")
+
+    @classmethod
+    async def get_vacancy_details_many(
+        cls, vacancy_ids: Iterable[str], concurrency: int = 4
+    ) -> dict:
+        """
+        Метод для получения деталей нескольких вакансий с одновременной загрузкой.
+        :param vacancy_ids: id вакансий hh.ru, повторы запрашиваются один раз
+        :param concurrency: максимальное количество одновременных запросов
+        :return: словарь id -> данные вакансии в порядке переданных id
+        """
+        vacancy_ids = list(dict.fromkeys(vacancy_ids))
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch(vacancy_id: str) -> dict:
+            async with semaphore:
+                return await cls.get_vacancy_details(vacancy_id)
+
+        details = await asyncio.gather(*(fetch(v_id) for v_id in vacancy_ids))
+        return dict(zip(vacancy_ids, details))
+
+    @classmethod
+    async def load_currency_rates(cls) -> dict:
+        """
+        Метод для загрузки курсов валют в атрибут класса.
+        Курсы загружаются при первом обращении, одновременные первые обращения
+        ожидают одну и ту же загрузку. При ошибке курсы остаются незагруженными.
+        :return: словарь код валюты -> курс
+        """
+        if cls.__currency_rates:
+            return cls.__currency_rates
+        task = cls.__currency_task
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = cls.__currency_task = asyncio.ensure_future(
+                cls.__fetch_currency_rates()
+            )
+        try:
+            rates = await asyncio.shield(task)
+        finally:
+            if task.done() and cls.__currency_task is task:
+                cls.__currency_task = None
+        if rates:
+            cls.__currency_rates = rates
+        return cls.__currency_rates
+
+    @classmethod
+    async def refresh_currency_rates(cls) -> None:
+        """
+        Метод для принудительного обновления курсов валют из API.
+        При ошибке загрузки остаются прежние курсы.
+        """
+        rates = await cls.__fetch_currency_rates()
+        if rates:
+            cls.__currency_rates = rates
+
+    @classmethod
+    async def __fetch_currency_rates(cls) -> Optional[dict]:
+        try:
+            dictionaries = await cls.__transport.get_json(cls.__dicts_url)
+        except ConnectionError as error:
+            print(error)
+            return None
+        # Курсы собираются в новый словарь и подменяются целиком
+        return {
+            currency["code"]: currency["rate"] for currency in dictionaries["currency"]
+        }
+
+    @classmethod
+    async def get_currency_rate(cls, currency_code: str) -> Optional[float]:
+        """
+        Возвращает курс валюты по отношению к рублю
+        :return: курс валюты или None, если не найдено
+        """
+        rates = await cls.load_currency_rates()
+        return rates.get(currency_code, None)
+
+    @property
+    def currency_rates(self) -> dict:
+        """
+        Возвращает уже загруженные курсы валют (см. load_currency_rates)
+        """
+        return self.__class__.__currency_rates
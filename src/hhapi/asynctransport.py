@@ -0,0 +1,176 @@
+import asyncio
+import time
+from typing import Optional
+
+import httpx
+from metrics import metrics
+from ratelimit import RateLimiter
+from transport import backoff_delay, endpoint_of, parse_retry_after
+
+
+class AsyncHHTransport:
+    """
+    Асинхронный транспорт для запросов к API hh.ru на основе httpx.AsyncClient.
+    Клиент держит пул постоянных соединений, следует перенаправлениям и берёт
+    настройки прокси из переменных окружения, как requests.
+    Политика повторов, счётчики и ограничитель частоты такие же, как у HHTransport.
+    Клиент привязан к циклу событий: при использовании из другого цикла
+    создаётся новый клиент, а соединения прежнего цикла отбрасываются.
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        pool_size: int = 100,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 30.0,
+        headers: Optional[dict] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        """
+        :param pool_size: максимальное количество одновременных соединений
+        :param timeout: таймаут запроса в секундах
+        :param max_retries: количество повторов после первой неудачной попытки
+        :param backoff_factor: базовая задержка перед повтором в секундах
+        :param backoff_max: максимальная задержка перед повтором в секундах
+        :param headers: заголовки, отправляемые с каждым запросом
+        :param rate_limiter: ограничитель частоты запросов или None
+        """
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.headers = dict(headers or {})
+        self.rate_limiter = rate_limiter
+        self.__stats = {"requests": 0, "retries": 0, "failures": 0}
+        self.__loop = None
+        self.__client = None
+
+    @property
+    def stats(self) -> dict:
+        """
+        Возвращает копию счётчиков: количество запросов, повторов и неудачных запросов
+        """
+        return dict(self.__stats)
+
+    def reset_stats(self) -> None:
+        for key in self.__stats:
+            self.__stats[key] = 0
+
+    async def get(self, url: str, params: Optional[dict] = None) -> httpx.Response:
+        """
+        Выполняет GET-запрос с повторами.
+        Если после всех повторов сервер продолжает возвращать 429 или 5xx,
+        возвращается последний полученный ответ.
+        :raise ConnectionError: если после всех повторов не удалось соединиться
+        с сервером или получить от него корректный ответ
+        """
+        if params:
+            url = str(httpx.URL(url).copy_merge_params(params))
+        endpoint = endpoint_of(url) if metrics.enabled else None
+        client = self.__get_client()
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(url)
+            self.__stats["requests"] += 1
+            start = time.perf_counter()
+            try:
+                response = await client.get(url)
+            except httpx.RequestError as error:
+                # Ошибки соединения, таймауты, некорректные ответы и ошибки
+                # распаковки тела повторяются так же, как ConnectionError в HHTransport
+                if endpoint:
+                    self.__record(endpoint, "error", start)
+                if attempt >= self.max_retries:
+                    self.__stats["failures"] += 1
+                    raise ConnectionError(f"Ошибка соединения: {error!r}") from error
+                delay = backoff_delay(attempt, self.backoff_factor, self.backoff_max)
+            else:
+                if endpoint:
+                    self.__record(endpoint, response.status_code, start)
+                throttled = response.status_code == 429
+                retry_after = parse_retry_after(
+                    response.headers.get("retry-after"), self.backoff_max
+                )
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.on_response_async(
+                        url, response.status_code, retry_after if throttled else None
+                    )
+                if response.status_code not in self.RETRY_STATUSES:
+                    return response
+                if attempt >= self.max_retries:
+                    self.__stats["failures"] += 1
+                    return response
+                if throttled and self.rate_limiter is not None:
+                    delay = 0.0  # Паузу перед повтором выдерживает ограничитель
+                elif retry_after is not None:
+                    delay = retry_after
+                else:
+                    delay = backoff_delay(
+                        attempt, self.backoff_factor, self.backoff_max
+                    )
+
+            attempt += 1
+            self.__stats["retries"] += 1
+            if endpoint:
+                metrics.inc("http_retries_total", endpoint=endpoint)
+            await asyncio.sleep(delay)
+
+    async def get_json(self, url: str, params: Optional[dict] = None):
+        """
+        Выполняет GET-запрос и возвращает разобранный JSON ответа
+        :raise ConnectionError: если сервер не вернул статус 200
+        """
+        response = await self.get(url, params=params)
+        if response.status_code != 200:
+            raise ConnectionError(f"Ошибка получения данных: {response.status_code}")
+        if not metrics.enabled:
+            return response.json()
+        metrics.inc(
+            "http_response_bytes_total",
+            len(response.content),
+            endpoint=endpoint_of(url),
+        )
+        with metrics.timer("json_parse_seconds", source="http"):
+            return response.json()
+
+    async def close(self) -> None:
+        """
+        Закрывает клиент и соединения пула
+        """
+        client, loop = self.__client, self.__loop
+        self.__client = self.__loop = None
+        # Клиент другого (возможно, уже закрытого) цикла закрыть из этого нельзя
+        if client is not None and loop is asyncio.get_running_loop():
+            await client.aclose()
+
+    def __get_client(self) -> httpx.AsyncClient:
+        """
+        Возвращает клиент текущего цикла событий, создавая его при первом запросе
+        """
+        loop = asyncio.get_running_loop()
+        if self.__client is None or loop is not self.__loop:
+            # Соединения клиента принадлежат прежнему циклу и в этом непригодны
+            self.__loop = loop
+            self.__client = httpx.AsyncClient(
+                headers={"Accept": "application/json", **self.headers},
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                ),
+                follow_redirects=True,
+            )
+        return self.__client
+
+    @staticmethod
+    def __record(endpoint: str, status, start: float) -> None:
+        metrics.observe(
+            "http_request_seconds", time.perf_counter() - start, endpoint=endpoint
+        )
+        metrics.inc("http_requests_total", endpoint=endpoint, status=str(status))
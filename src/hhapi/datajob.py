@@ -1,4 +1,109 @@
+import csv
+import gzip
+import heapq
+import re
 from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, Optional
+
+from tokenindex import TokenIndex
+from vacancyhh import VacancyHH
+
+
+@lru_cache(maxsize=256)
+def _compile(pattern: str) -> re.Pattern:
+    """
+    Компилирует регулярное выражение критерия поиска с кэшированием
+    """
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def matches_pattern(pattern: str, value) -> bool:
+    """
+    Проверяет, содержит ли строка значения совпадение с регулярным выражением
+    без учёта регистра. Отсутствующее значение None проверяется как строка "None".
+    """
+    return _compile(pattern).search(str(value)) is not None
+
+
+def matches_criteria(record: dict, criteria: dict) -> bool:
+    """
+    Проверяет словарь вакансии по критериям get_vacancies: значение каждого
+    указанного поля должно содержать совпадение с регулярным выражением
+    критерия без учёта регистра, отсутствующее поле считается пустой строкой
+    """
+    return all(
+        _compile(value).search(str(record.get(key, "")))
+        for key, value in criteria.items()
+    )
+
+
+def select_top_by_salary(
+    items: Iterable, n: int, salary_of: Callable[[object], Optional[float]]
+) -> list:
+    """
+    Выбирает n элементов с наибольшей зарплатой без сортировки всего набора.
+    Порядок результата совпадает с sorted(vacancies, reverse=True)[:n]:
+    по убыванию зарплаты, при равенстве — в порядке следования,
+    элементы без зарплаты идут последними в порядке следования.
+    Используется куча размера n, поэтому память — O(n).
+    :param items: вакансии в любом представлении
+    :param n: количество элементов в результате
+    :param salary_of: функция получения зарплаты элемента или None
+    """
+    if n <= 0:
+        return []
+
+    heap = []  # Элементы (зарплата, -порядковый номер, элемент), минимальный в корне
+    without_salary = []
+    for index, item in enumerate(items):
+        salary = salary_of(item)
+        if salary is None:
+            if len(without_salary) < n:
+                without_salary.append(item)
+            continue
+        entry = (salary, -index, item)
+        if len(heap) < n:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    heap.sort(key=lambda entry: entry[:2], reverse=True)
+    result = [entry[2] for entry in heap]
+    return result + without_salary[: n - len(result)]
+
+
+def merge_records(vacancies: Iterable, get_stored: Callable[[str], Optional[dict]]):
+    """
+    Сопоставляет добавляемые вакансии с сохранёнными и считает изменения.
+    Вакансия считается новой, если её нет в хранилище, обновлённой — если её
+    данные отличаются от сохранённых, пропущенной — если данные совпадают
+    или вакансия с тем же id уже встречалась в пакете (берётся последняя).
+    :param vacancies: добавляемые объекты VacancyHH
+    :param get_stored: функция получения сохранённой вакансии по id или None
+    :return: (словарь id -> данные вакансий для записи, статистика изменений)
+    """
+    new_records = {}
+    total = 0
+    for vacancy in vacancies:
+        if not isinstance(vacancy, VacancyHH):
+            raise ValueError("Ожидается тип VacancyHH")
+        new_records[vacancy.id] = vacancy.to_dict()
+        total += 1
+
+    stats = {"inserted": 0, "updated": 0, "skipped": total - len(new_records)}
+    changed = {}
+    for vacancy_id, record in new_records.items():
+        stored = get_stored(vacancy_id)
+        if stored is None:
+            stats["inserted"] += 1
+        elif stored != record:
+            stats["updated"] += 1
+        else:
+            stats["skipped"] += 1
+            continue
+        changed[vacancy_id] = record
+    return changed, stats
 
 
 class DataJob(ABC):
@@ -13,6 +118,15 @@ class DataJob(ABC):
         """
         pass
 
+    @abstractmethod
+    def add_many(self, vacancies):
+        """
+        Метод для пакетного добавления вакансий в файл за одну запись.
+        Возвращает статистику: сколько вакансий добавлено (inserted),
+        обновлено (updated) и пропущено без изменений (skipped).
+        """
+        pass
+
     @abstractmethod
     def delete(self, vacancy_id: str):
         """
@@ -26,3 +140,67 @@ class DataJob(ABC):
         Метод для получения данных о вакансиях из файла по указанным критериям.
         """
         pass
+
+    def save_to_csv(self, file_name: str, compress: Optional[bool] = None, **criteria):
+        """
+        Метод для выгрузки вакансий в CSV-файл по указанным критериям.
+        Строки пишутся по мере чтения вакансий через iter_vacancies,
+        поэтому память не зависит от количества вакансий.
+        Заголовок пишется всегда, в том числе для пустого хранилища.
+        :param file_name: путь к CSV-файлу
+        :param compress: сжимать ли файл gzip, по умолчанию — если имя оканчивается на .gz
+        :return: количество выгруженных вакансий
+        """
+        if compress is None:
+            compress = file_name.lower().endswith(".gz")
+
+        if compress:
+            file = gzip.open(file_name, mode="wt", newline="", encoding="utf-8")
+        else:
+            file = open(file_name, mode="w", newline="", encoding="utf-8")
+
+        count = 0
+        with file:
+            writer = csv.DictWriter(file, fieldnames=VacancyHH.FIELDS)
+            writer.writeheader()
+            for vacancy in self.iter_vacancies(**criteria):
+                writer.writerow(vacancy.to_dict())
+                count += 1
+        return count
+
+    def iter_vacancies(self, **criteria) -> Iterator:
+        """
+        Метод для последовательного получения вакансий по указанным критериям.
+        Хранилища, умеющие читать данные частями, переопределяют этот метод,
+        чтобы не загружать все вакансии в память.
+        """
+        yield from self.get_vacancies(**criteria)
+
+    def find_vacancies(
+        self,
+        keyword: str,
+        prefix: bool = False,
+        fields: Optional[Iterable[str]] = None,
+        **criteria,
+    ):
+        """
+        Метод для поиска вакансий, содержащих все слова запроса (без учёта регистра)
+        в названии или работодателе. При prefix=True слово запроса может быть
+        началом слова вакансии. Хранилища с индексом слов переопределяют этот метод.
+        """
+        vacancies = self.get_vacancies(**criteria)
+        index = TokenIndex()
+        for vacancy in vacancies:
+            index.add(vacancy.id, vacancy.to_dict())
+        found = index.search(keyword, prefix, fields)
+        return [vacancy for vacancy in vacancies if vacancy.id in found]
+
+    def top_by_salary(self, n: int, **criteria):
+        """
+        Метод для получения n вакансий с наибольшей зарплатой по указанным критериям.
+        Вакансии без зарплаты идут в конце списка.
+        Хранилища с индексом по зарплате переопределяют этот метод.
+        """
+        return select_top_by_salary(
+            self.get_vacancies(**criteria), n, lambda vacancy: vacancy.salary
+        )
@@ -1,9 +1,12 @@
-import csv
 import json
-import re
+import os
 from pathlib import Path
+from typing import Iterable, Iterator, Optional
 
-from datajob import DataJob
+from datajob import DataJob, matches_criteria, merge_records, select_top_by_salary
+from jsonstream import iter_object_items
+from metrics import metrics
+from tokenindex import DEFAULT_FIELDS, TokenIndex, keyword_matcher
 from vacancyhh import VacancyHH
 
 
@@ -16,14 +19,30 @@ class DataJobHHJSON(DataJob):
         self,
         file_path: str = "../../data/vacancies.json",
         delete_existing_data: bool = False,
+        use_cache: bool = False,
     ):
         """
         Инициализация экземпляра класса для работы с вакансиями в файле.
         :param file_path: Путь к файлу с данными
         :param delete_existing_data: Если передан True, то существующий файл удаляется.
+        :param use_cache: Если передан True, то данные файла и объекты VacancyHH
+        хранятся в памяти, а файл перечитывается, только если его время изменения
+        или размер поменялись (например, файл изменён другим процессом).
         """
 
         self.__file_path = Path(file_path)
+        self.__use_cache = use_cache
+        self.__cache = None  # Разобранное содержимое файла
+        self.__cache_signature = None  # Время изменения и размер файла для кэша
+        # Кэш объектов: id -> (словарь из кэша, построенный по нему VacancyHH)
+        self.__cache_objects = {}
+        # Индекс слов по названию и работодателю, при включённом кэше
+        # обновляется при добавлении и удалении вакансий
+        self.__index = None
+        # Порядковые номера вакансий в файле для выдачи результатов поиска
+        # по индексу в порядке хранилища: id -> номер
+        self.__positions = {}
+        self.__next_position = 0
 
         if delete_existing_data and self.__file_path.exists():
             self.__file_path.unlink()
@@ -37,39 +56,150 @@ class DataJobHHJSON(DataJob):
         # Добавляем или перезаписываем вакансию по ключу ID
         vacancies[vacancy.id] = vacancy.to_dict()
         self.__save_data(vacancies)
+        self.__update_index(vacancies, [vacancy.id])
+
+    def add_many(self, vacancies: Iterable[VacancyHH]):
+        """
+        Добавляет или перезаписывает вакансии пакетом:
+        файл читается и записывается один раз независимо от количества вакансий.
+        Если ни одна вакансия не изменилась, файл не перезаписывается.
+        :return: статистика изменений: inserted, updated, skipped
+        """
+        vacancies = list(vacancies)
+        stored_vacancies = self.__load_data() if vacancies else {}
+        changed, stats = merge_records(vacancies, stored_vacancies.get)
+
+        if changed:
+            stored_vacancies.update(changed)
+            self.__save_data(stored_vacancies)
+            self.__update_index(stored_vacancies, changed)
+        return stats
 
     def delete(self, vacancy_id: str):
         vacancies = self.__load_data()
         vacancies.pop(vacancy_id)
+        self.__cache_objects.pop(vacancy_id, None)
         self.__save_data(vacancies)
+        self.__update_index(vacancies, [vacancy_id])
 
     def get_vacancies(self, **criteria):
         vacancies = self.__load_data()
         result = []
 
         for vacancy in vacancies.values():
-            if all(
-                re.search(value, str(vacancy.get(key, "")), re.IGNORECASE)
-                for key, value in criteria.items()
-            ):
-                result.append(VacancyHH(vacancy))
+            if self.__matches(vacancy, criteria):
+                result.append(self.__to_vacancy(vacancy))
 
         return result
 
-    def save_to_csv(self, file_name: str):
-        data = self.get_vacancies()
-        data_dicts = [
-            vacancy.to_dict() for vacancy in data
-        ]  # Конвертация объектов в словари
-        with open(file_name, mode="w", newline="", encoding="utf-8") as file:
-            fieldnames = data_dicts[0].keys()
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(data_dicts)
+    def iter_vacancies(self, **criteria) -> Iterator[VacancyHH]:
+        """
+        Возвращает подходящие под критерии вакансии по одной.
+        Если актуальные данные уже есть в кэше, обходится кэш,
+        иначе файл разбирается по частям и в памяти находится только текущая вакансия.
+        Если файл оказывается некорректным, перебор прекращается.
+        """
+        if self.__use_cache and self.__cache is not None:
+            if self.__file_signature() == self.__cache_signature:
+                for vacancy in list(self.__cache.values()):
+                    if self.__matches(vacancy, criteria):
+                        yield self.__to_vacancy(vacancy)
+                return
+
+        try:
+            with open(self.__file_path, "r", encoding="utf-8") as f:
+                yield from VacancyHH.from_storage_records(
+                    vacancy
+                    for _, vacancy in iter_object_items(f)
+                    if self.__matches(vacancy, criteria)
+                )
+        except FileNotFoundError:
+            return
+        except json.JSONDecodeError:
+            return
+
+    def find_vacancies(
+        self,
+        keyword: str,
+        prefix: bool = False,
+        fields: Optional[Iterable[str]] = None,
+        **criteria,
+    ):
+        """
+        Ищет вакансии, содержащие все слова запроса как слова (без учёта регистра),
+        а не как регулярное выражение.
+        При включённом кэше кандидаты отбираются по индексу слов, и дальше
+        обрабатываются только они. Без кэша индекс пришлось бы строить заново
+        при каждом вызове, поэтому вакансии перебираются с быстрой проверкой
+        слов запроса как подстрок. Дополнительные критерии проверяются
+        регулярными выражениями только для кандидатов.
+        :param keyword: строка со словами для поиска
+        :param prefix: если True, слово запроса может быть началом слова вакансии
+        :param fields: поля для поиска слов, по умолчанию название и работодатель
+        :param criteria: дополнительные критерии, как в get_vacancies
+        """
+        if not self.__use_cache:
+            fields = DEFAULT_FIELDS if fields is None else tuple(fields)
+            unknown = set(fields) - set(DEFAULT_FIELDS)
+            if unknown:
+                raise ValueError(
+                    f"Поля не проиндексированы: {', '.join(sorted(unknown))}"
+                )
+            matches_keyword = keyword_matcher(keyword, prefix, fields)
+            return [
+                self.__to_vacancy(vacancy)
+                for vacancy in self.__read_file().values()
+                if matches_keyword(vacancy) and self.__matches(vacancy, criteria)
+            ]
+
+        vacancies = self.__load_data()
+        candidates = self.__get_index(vacancies).search(keyword, prefix, fields)
+
+        result = []
+        for vacancy_id in sorted(candidates, key=self.__positions.__getitem__):
+            vacancy = vacancies[vacancy_id]
+            if self.__matches(vacancy, criteria):
+                result.append(self.__to_vacancy(vacancy))
+        return result
+
+    def top_by_salary(self, n: int, **criteria):
+        """
+        Возвращает n вакансий с наибольшей зарплатой.
+        Отбор идёт по словарям из файла с помощью кучи размера n,
+        объекты VacancyHH создаются только для попавших в результат вакансий.
+        """
+        vacancies = self.__load_data()
+        matched = (
+            vacancy
+            for vacancy in vacancies.values()
+            if self.__matches(vacancy, criteria)
+        )
+        top = select_top_by_salary(matched, n, lambda vacancy: vacancy.get("salary"))
+        return [self.__to_vacancy(vacancy) for vacancy in top]
+
+    @staticmethod
+    def __matches(vacancy: dict, criteria: dict) -> bool:
+        return matches_criteria(vacancy, criteria)
 
     def __load_data(self):
+        if not self.__use_cache:
+            return self.__read_file()
+
+        # Подпись снимается до чтения: если файл изменится во время чтения,
+        # при следующем обращении подпись не совпадёт и файл будет перечитан
+        signature = self.__file_signature()
+        if self.__cache is None or signature != self.__cache_signature:
+            self.__cache = self.__read_file()
+            self.__cache_signature = signature
+            self.__cache_objects = {}
+            self.__index = None
+        return self.__cache
+
+    def __read_file(self):
         try:
             with open(self.__file_path, "r", encoding="utf-8") as f:
+                if metrics.enabled:
+                    return self.__measured_load(f)
                 return json.load(f) or {}  # Возвращаем пустой словарь, если файл пуст
         except FileNotFoundError:
             return {}
@@ -78,5 +208,103 @@ class DataJobHHJSON(DataJob):
             return {}
 
     def __save_data(self, vacancies):
-        with open(self.__file_path, "w", encoding="utf-8") as f:
+        try:
+            with open(self.__file_path, "w", encoding="utf-8") as f:
+                if metrics.enabled:
+                    self.__measured_dump(vacancies, f)
+                else:
+                    json.dump(vacancies, f, ensure_ascii=False, indent=4)
+        except Exception:
+            # Кэш мог быть уже изменён вызывающим методом, поэтому сбрасываем его
+            self.__cache = None
+            self.__index = None
+            raise
+
+        if self.__use_cache:
+            # Записанные данные становятся кэшем, перечитывать файл не нужно
+            self.__cache = vacancies
+            self.__cache_signature = self.__file_signature()
+
+    @staticmethod
+    def __measured_load(f) -> dict:
+        """
+        json.load с записью в метрики размера файла, времени разбора и количества записей
+        """
+        metrics.inc(
+            "storage_read_bytes_total", os.fstat(f.fileno()).st_size, storage="json"
+        )
+        with metrics.timer("storage_parse_seconds", storage="json"):
+            vacancies = json.load(f) or {}
+        metrics.inc(
+            "storage_records_total", len(vacancies), storage="json", operation="load"
+        )
+        return vacancies
+
+    @staticmethod
+    def __measured_dump(vacancies: dict, f) -> None:
+        """
+        json.dump с записью в метрики времени сериализации, размера файла
+        и количества записей
+        """
+        with metrics.timer("storage_dump_seconds", storage="json"):
             json.dump(vacancies, f, ensure_ascii=False, indent=4)
+            f.flush()
+        metrics.inc(
+            "storage_write_bytes_total", os.fstat(f.fileno()).st_size, storage="json"
+        )
+        metrics.inc(
+            "storage_records_total", len(vacancies), storage="json", operation="save"
+        )
+
+    def __get_index(self, vacancies: dict) -> TokenIndex:
+        """
+        Возвращает индекс слов для данных кэша.
+        Индекс и порядковые номера вакансий строятся один раз после загрузки файла.
+        """
+        if self.__index is not None:
+            return self.__index
+
+        index = TokenIndex()
+        for vacancy_id, vacancy in vacancies.items():
+            index.add(vacancy_id, vacancy)
+        self.__positions = {vacancy_id: i for i, vacancy_id in enumerate(vacancies)}
+        self.__next_position = len(self.__positions)
+        self.__index = index
+        return index
+
+    def __update_index(self, vacancies: dict, vacancy_ids: Iterable[str]) -> None:
+        if self.__index is None:
+            return
+        for vacancy_id in vacancy_ids:
+            if vacancy_id in vacancies:
+                self.__index.add(vacancy_id, vacancies[vacancy_id])
+                # Новая вакансия добавлена в конец словаря, как и в файле
+                if vacancy_id not in self.__positions:
+                    self.__positions[vacancy_id] = self.__next_position
+                    self.__next_position += 1
+            else:
+                self.__index.remove(vacancy_id)
+                self.__positions.pop(vacancy_id, None)
+
+    def __file_signature(self):
+        try:
+            stat = self.__file_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def __to_vacancy(self, vacancy: dict) -> VacancyHH:
+        """
+        Возвращает объект VacancyHH для словаря из хранилища.
+        При включённом кэше объект строится один раз и переиспользуется,
+        пока словарь вакансии в кэше не будет заменён.
+        """
+        if not self.__use_cache:
+            return VacancyHH(vacancy)
+
+        cached = self.__cache_objects.get(vacancy["id"])
+        if cached is not None and cached[0] is vacancy:
+            return cached[1]
+        result = VacancyHH(vacancy)
+        self.__cache_objects[vacancy["id"]] = (vacancy, result)
+        return result
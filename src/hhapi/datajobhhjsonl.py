@@ -0,0 +1,310 @@
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from datajob import DataJob, matches_criteria, merge_records, select_top_by_salary
+from jsonstream import iter_object_items
+from vacancyhh import VacancyHH
+
+
+class DataJobHHJSONL(DataJob):
+    """
+    Класс для управления вакансиями, сохраняемыми в журнал JSON Lines.
+    Каждое добавление или удаление дописывает в конец файла одну строку
+    {"op": "add", "vacancy": {...}} или {"op": "delete", "id": "..."},
+    поэтому стоимость записи не зависит от размера хранилища.
+    При открытии журнал читается один раз и строится индекс id -> смещение
+    последней актуальной записи. Когда доля устаревших строк превышает
+    compaction_threshold, журнал переписывается только с актуальными записями
+    (по умолчанию в фоновом потоке).
+
+    Строка пишется одним вызовом write и завершается переводом строки,
+    поэтому при сбое может пострадать только последняя строка: при открытии
+    недописанный хвост отбрасывается.
+    """
+
+    def __init__(
+        self,
+        file_path: str = "../../data/vacancies.jsonl",
+        delete_existing_data: bool = False,
+        compaction_threshold: float = 0.5,
+        min_compaction_records: int = 1000,
+        background_compaction: bool = True,
+        fsync: bool = False,
+    ):
+        """
+        :param file_path: путь к файлу журнала
+        :param delete_existing_data: если True, существующий журнал удаляется
+        :param compaction_threshold: доля устаревших строк, после которой журнал сжимается
+        :param min_compaction_records: минимальное количество строк для сжатия
+        :param background_compaction: сжимать журнал в фоновом потоке
+        :param fsync: сбрасывать каждую запись на диск (медленнее, но надёжнее)
+        """
+        self.__file_path = Path(file_path)
+        self.compaction_threshold = compaction_threshold
+        self.min_compaction_records = min_compaction_records
+        self.background_compaction = background_compaction
+        self.__fsync = fsync
+        self.__lock = threading.RLock()
+        self.__index = {}  # id -> смещение строки с актуальной записью
+        self.__lines = 0  # Всего строк в журнале, включая устаревшие
+        self.__compaction = None  # Поток фонового сжатия
+        self.__compaction_lock = threading.Lock()  # Сжатия не выполняются одновременно
+
+        if delete_existing_data and self.__file_path.exists():
+            self.__file_path.unlink()
+        self.__file_path.parent.mkdir(parents=True, exist_ok=True)
+        self.__recover()
+        self.__log = open(self.__file_path, "ab")
+
+    def __len__(self):
+        return len(self.__index)
+
+    @property
+    def stale_ratio(self) -> float:
+        """
+        Доля устаревших строк журнала (перезаписанные и удалённые вакансии)
+        """
+        with self.__lock:
+            if not self.__lines:
+                return 0.0
+            return 1 - len(self.__index) / self.__lines
+
+    def add(self, vacancy: VacancyHH):
+        if not isinstance(vacancy, VacancyHH):
+            raise ValueError("Ожидается тип VacancyHH")
+        with self.__lock:
+            self.__append([{"op": "add", "vacancy": vacancy.to_dict()}])
+        self.__maybe_compact()
+
+    def add_many(self, vacancies: Iterable[VacancyHH]):
+        """
+        Дописывает в журнал только новые и изменённые вакансии одной записью.
+        :return: статистика изменений: inserted, updated, skipped
+        """
+        with self.__lock:
+            with open(self.__file_path, "rb") as f:
+                changed, stats = merge_records(
+                    vacancies, lambda vacancy_id: self.__read_at(f, vacancy_id)
+                )
+            if changed:
+                self.__append(
+                    [{"op": "add", "vacancy": record} for record in changed.values()]
+                )
+        self.__maybe_compact()
+        return stats
+
+    def delete(self, vacancy_id: str):
+        with self.__lock:
+            if vacancy_id not in self.__index:
+                raise KeyError(vacancy_id)
+            self.__append([{"op": "delete", "id": vacancy_id}])
+        self.__maybe_compact()
+
+    def get_vacancies(self, **criteria):
+        return list(self.iter_vacancies(**criteria))
+
+    def iter_vacancies(self, **criteria) -> Iterator[VacancyHH]:
+        """
+        Возвращает подходящие под критерии вакансии по одной в порядке записи
+        в журнал, читая только актуальные строки
+        """
+        return VacancyHH.from_storage_records(
+            record
+            for record in self.__iter_records()
+            if matches_criteria(record, criteria)
+        )
+
+    def top_by_salary(self, n: int, **criteria):
+        """
+        Возвращает n вакансий с наибольшей зарплатой, объекты VacancyHH
+        создаются только для попавших в результат вакансий
+        """
+        matched = (
+            record
+            for record in self.__iter_records()
+            if matches_criteria(record, criteria)
+        )
+        top = select_top_by_salary(matched, n, lambda record: record.get("salary"))
+        return list(VacancyHH.from_storage_records(top))
+
+    def load_from_json(self, json_path: str, batch_size: int = 1000) -> dict:
+        """
+        Переносит вакансии из файла DataJobHHJSON (vacancies.json) в журнал.
+        Файл разбирается по частям, поэтому его размер не ограничен памятью.
+        :return: статистика изменений: inserted, updated, skipped
+        """
+        totals = {"inserted": 0, "updated": 0, "skipped": 0}
+        batch = []
+
+        def flush() -> None:
+            stats = self.add_many(VacancyHH.from_storage_records(batch))
+            for key in totals:
+                totals[key] += stats[key]
+            batch.clear()
+
+        with open(json_path, "r", encoding="utf-8") as f:
+            for _, record in iter_object_items(f):
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    flush()
+        if batch:
+            flush()
+        return totals
+
+    def compact(self) -> None:
+        """
+        Переписывает журнал, оставляя только актуальные записи.
+        Записи, добавленные во время сжатия, переносятся в новый журнал.
+        """
+        with self.__compaction_lock:
+            self.__compact()
+
+    def __compact(self) -> None:
+        with self.__lock:
+            snapshot = sorted(self.__index.items(), key=lambda item: item[1])
+            end = self.__log.tell()
+
+        fd, temp_path = tempfile.mkstemp(dir=self.__file_path.parent, suffix=".tmp")
+        try:
+            new_index = {}
+            with os.fdopen(fd, "wb") as out, open(self.__file_path, "rb") as f:
+                # Основная часть копируется без блокировки: строки журнала
+                # только дописываются, поэтому смещения снимка не меняются
+                for vacancy_id, offset in snapshot:
+                    f.seek(offset)
+                    new_index[vacancy_id] = out.tell()
+                    out.write(f.readline())
+                lines = len(snapshot)
+
+                with self.__lock:
+                    # Записи, сделанные после снимка, применяются к новому журналу
+                    f.seek(end)
+                    for line in f:
+                        entry = json.loads(line)
+                        if entry["op"] == "delete":
+                            new_index.pop(entry["id"], None)
+                            continue
+                        new_index[entry["vacancy"]["id"]] = out.tell()
+                        out.write(line)
+                        lines += 1
+                    out.flush()
+                    os.fsync(out.fileno())
+
+                    self.__log.close()
+                    os.replace(temp_path, self.__file_path)
+                    self.__log = open(self.__file_path, "ab")
+                    # Вакансии, добавленные и удалённые после снимка, остаются
+                    # в новом журнале устаревшими строками
+                    self.__index = new_index
+                    self.__lines = lines
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def wait_for_compaction(self) -> None:
+        """
+        Дожидается завершения фонового сжатия, если оно выполняется
+        """
+        thread = self.__compaction
+        if thread is not None:
+            thread.join()
+
+    def close(self) -> None:
+        """
+        Дожидается фонового сжатия и закрывает журнал
+        """
+        self.wait_for_compaction()
+        with self.__lock:
+            self.__log.close()
+
+    def __append(self, entries: list) -> None:
+        """
+        Дописывает записи в журнал одной операцией записи и обновляет индекс.
+        Вызывается под блокировкой.
+        """
+        offset = self.__log.tell()
+        lines = []
+        for entry in entries:
+            line = json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n"
+            lines.append(line)
+        self.__log.write(b"".join(lines))
+        self.__log.flush()
+        if self.__fsync:
+            os.fsync(self.__log.fileno())
+
+        for entry, line in zip(entries, lines):
+            if entry["op"] == "delete":
+                self.__index.pop(entry["id"], None)
+            else:
+                self.__index[entry["vacancy"]["id"]] = offset
+            offset += len(line)
+        self.__lines += len(entries)
+
+    def __iter_records(self) -> Iterator[dict]:
+        """
+        Читает актуальные записи в порядке смещений, то есть последовательно
+        """
+        with self.__lock:
+            offsets = sorted(self.__index.values())
+            f = open(self.__file_path, "rb")
+        with f:
+            for offset in offsets:
+                f.seek(offset)
+                yield json.loads(f.readline())["vacancy"]
+
+    def __read_at(self, f, vacancy_id: str) -> Optional[dict]:
+        offset = self.__index.get(vacancy_id)
+        if offset is None:
+            return None
+        f.seek(offset)
+        return json.loads(f.readline())["vacancy"]
+
+    def __maybe_compact(self) -> None:
+        with self.__lock:
+            if self.__lines < self.min_compaction_records:
+                return
+            if 1 - len(self.__index) / self.__lines <= self.compaction_threshold:
+                return
+            if self.__compaction is not None and self.__compaction.is_alive():
+                return
+            if not self.background_compaction:
+                self.compact()
+                return
+            self.__compaction = threading.Thread(target=self.compact, daemon=True)
+            self.__compaction.start()
+
+    def __recover(self) -> None:
+        """
+        Строит индекс по журналу. Недописанная или повреждённая последняя строка
+        (сбой во время записи) отрезается, чтобы следующие записи начинались
+        с новой строки. Повреждённые строки в середине журнала пропускаются.
+        """
+        try:
+            f = open(self.__file_path, "r+b")
+        except FileNotFoundError:
+            return
+        with f:
+            offset = 0
+            valid_end = 0
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("Недописанная строка")
+                    entry = json.loads(line)
+                    if entry["op"] == "delete":
+                        self.__index.pop(entry["id"], None)
+                    else:
+                        self.__index[entry["vacancy"]["id"]] = offset
+                    valid_end = offset + len(line)
+                except (ValueError, KeyError, TypeError):
+                    pass
+                else:
+                    self.__lines += 1
+                offset += len(line)
+            if valid_end < offset:
+                f.truncate(valid_end)
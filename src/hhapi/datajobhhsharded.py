@@ -0,0 +1,396 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from datajob import DataJob, matches_criteria, select_top_by_salary
+from datajobhhjson import DataJobHHJSON
+from vacancycollection import MISSING_EPOCH, to_epoch
+from vacancyhh import VacancyHH
+
+MANIFEST_NAME = "manifest.json"
+# Журнал разделов вакансий: строка [id, ключ раздела] на каждое изменение,
+# ключ null — вакансия удалена. Расширение не .json, чтобы не считаться разделом
+INDEX_NAME = "ids.log"
+UNDATED = "undated"  # Раздел для вакансий без даты публикации или с некорректной датой
+MONTH_FORMAT = "%Y-%m"
+# Запас при отборе разделов по диапазону дат: месяц вакансии определяется по её
+# собственному часовому поясу, а смещения часовых поясов не превышают суток
+PRUNE_MARGIN = timedelta(days=1)
+
+
+def partition_key(published_at: Optional[str]) -> str:
+    """
+    Возвращает ключ раздела для даты публикации hh.ru: месяц в формате ГГГГ-ММ
+    в часовом поясе вакансии или UNDATED для отсутствующей или некорректной даты
+    """
+    if not published_at:
+        return UNDATED
+    try:
+        return datetime.fromisoformat(published_at).strftime(MONTH_FORMAT)
+    except (TypeError, ValueError):
+        return UNDATED
+
+
+class DataJobHHSharded(DataJob):
+    """
+    Класс для управления вакансиями, разделёнными по месяцу публикации.
+    Каждый месяц хранится в отдельном JSON-файле каталога (например, 2024-12.json),
+    список разделов с количеством вакансий — в небольшом файле manifest.json,
+    а раздел каждой вакансии по её id — в журнале ids.log, который только
+    дописывается. Запись затрагивает только файлы разделов добавляемых вакансий,
+    запросы с диапазоном дат открывают только разделы нужных месяцев, а удаление
+    устаревших данных сводится к удалению файлов разделов (drop_partitions).
+
+    Вакансия, повторно опубликованная в другом месяце, переносится в раздел нового
+    месяца: прежняя копия удаляется из старого раздела, а вакансия считается
+    обновлённой.
+    """
+
+    def __init__(
+        self,
+        directory: str = "../../data/vacancies",
+        delete_existing_data: bool = False,
+        use_cache: bool = False,
+    ):
+        """
+        :param directory: каталог с файлами разделов и manifest.json
+        :param delete_existing_data: если True, существующие разделы удаляются
+        :param use_cache: передаётся хранилищам разделов DataJobHHJSON
+        """
+        self.__directory = Path(directory)
+        self.__manifest_path = self.__directory / MANIFEST_NAME
+        self.__index_path = self.__directory / INDEX_NAME
+        self.__use_cache = use_cache
+        self.__shards = {}  # Ключ раздела -> DataJobHHJSON
+
+        if delete_existing_data and self.__directory.exists():
+            shutil.rmtree(self.__directory)
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        self.__partitions = {}  # Ключ раздела -> количество вакансий
+        self.__locations = {}  # id вакансии -> ключ раздела
+        self.__load_manifest()
+
+    @property
+    def partitions(self) -> dict:
+        """
+        Возвращает разделы и количество вакансий в них по возрастанию месяца,
+        раздел вакансий без даты — последним
+        """
+        return {key: self.__partitions[key] for key in self.__ordered_keys()}
+
+    def add(self, vacancy: VacancyHH):
+        if not isinstance(vacancy, VacancyHH):
+            raise ValueError("Ожидается тип VacancyHH")
+        self.add_many([vacancy])
+
+    def add_many(self, vacancies: Iterable[VacancyHH]):
+        """
+        Раскладывает вакансии по разделам и записывает каждый затронутый раздел
+        одним пакетом. Остальные разделы не читаются и не перезаписываются,
+        кроме разделов, из которых переносятся повторно опубликованные вакансии.
+        :return: статистика изменений: inserted, updated, skipped
+        """
+        groups = {}
+        batch = {}  # id вакансии -> ключ раздела её последней копии в пакете
+        for vacancy in vacancies:
+            if not isinstance(vacancy, VacancyHH):
+                raise ValueError("Ожидается тип VacancyHH")
+            key = partition_key(vacancy.published_at)
+            previous = batch.get(vacancy.id)
+            if previous is not None and previous != key:
+                # Вакансия повторно опубликована в пределах пакета: остаётся последняя копия
+                groups[previous] = [v for v in groups[previous] if v.id != vacancy.id]
+            batch[vacancy.id] = key
+            groups.setdefault(key, []).append(vacancy)
+
+        moved = {}  # Ключ прежнего раздела -> id перенесённых из него вакансий
+        changed = {}  # id вакансии -> новый ключ раздела для журнала
+        for vacancy_id, key in batch.items():
+            previous = self.__locations.get(vacancy_id)
+            if previous == key:
+                continue
+            changed[vacancy_id] = key
+            if previous in self.__partitions:
+                moved.setdefault(previous, []).append(vacancy_id)
+
+        totals = {"inserted": 0, "updated": 0, "skipped": 0}
+        manifest_changed = False
+        for key, group in groups.items():
+            if not group:
+                continue
+            stats = self.__shard(key).add_many(group)
+            for name in totals:
+                totals[name] += stats[name]
+            if stats["inserted"] or key not in self.__partitions:
+                self.__partitions[key] = (
+                    self.__partitions.get(key, 0) + stats["inserted"]
+                )
+                manifest_changed = True
+
+        # Журнал дописывается до удаления прежних копий: при сбое между ними
+        # прежняя копия остаётся в файле, но при чтении пропускается
+        if changed:
+            self.__append_index(changed)
+            self.__locations.update(changed)
+
+        # Прежние копии удаляются после записи новых, чтобы при сбое вакансия
+        # не пропала; в новом разделе она была добавлена, но это обновление
+        for key, vacancy_ids in moved.items():
+            shard = self.__shard(key)
+            for vacancy_id in vacancy_ids:
+                shard.delete(vacancy_id)
+            self.__partitions[key] -= len(vacancy_ids)
+            totals["inserted"] -= len(vacancy_ids)
+            totals["updated"] += len(vacancy_ids)
+            manifest_changed = True
+
+        if manifest_changed:
+            self.__save_manifest()
+        return totals
+
+    def delete(self, vacancy_id: str):
+        """
+        Удаляет вакансию из её раздела, найденного по id в журнале ids.log
+        :raise KeyError: если вакансия не найдена
+        """
+        key = self.__locations[vacancy_id]
+        self.__shard(key).delete(vacancy_id)
+        self.__partitions[key] -= 1
+        del self.__locations[vacancy_id]
+        self.__append_index({vacancy_id: None})
+        self.__save_manifest()
+
+    def get_vacancies(
+        self,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        **criteria,
+    ):
+        return list(self.iter_vacancies(date_from, date_to, **criteria))
+
+    def iter_vacancies(
+        self,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        **criteria,
+    ) -> Iterator[VacancyHH]:
+        """
+        Возвращает подходящие под критерии вакансии по одной, от новых разделов
+        к старым. Если задан диапазон дат публикации, читаются только разделы
+        месяцев этого диапазона, а вакансии без даты не возвращаются.
+        :param date_from: начало периода публикации включительно
+        :param date_to: конец периода публикации включительно
+        :param criteria: критерии, как в get_vacancies остальных хранилищ
+        """
+        ranged = date_from is not None or date_to is not None
+        start = MISSING_EPOCH + 1 if date_from is None else int(date_from.timestamp())
+        end = 2**63 - 1 if date_to is None else int(date_to.timestamp())
+
+        for key in self.__pruned_keys(date_from, date_to):
+            for vacancy in self.__shard(key).iter_vacancies():
+                # Копия, оставшаяся в прежнем разделе после сбоя при переносе,
+                # не выдаётся: актуальный раздел вакансии записан в журнале ids.log
+                if self.__locations.get(vacancy.id, key) != key:
+                    continue
+                if ranged and not start <= to_epoch(vacancy.published_at) <= end:
+                    continue
+                if matches_criteria(vacancy.to_dict(), criteria):
+                    yield vacancy
+
+    def top_by_salary(
+        self,
+        n: int,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        **criteria,
+    ):
+        """
+        Возвращает n вакансий с наибольшей зарплатой по указанным критериям
+        и периоду публикации. Читаются только разделы месяцев периода.
+        """
+        return select_top_by_salary(
+            self.iter_vacancies(date_from, date_to, **criteria),
+            n,
+            lambda vacancy: vacancy.salary,
+        )
+
+    def drop_partitions(self, before: datetime) -> int:
+        """
+        Удаляет разделы месяцев, целиком предшествующих месяцу даты before.
+        Раздел вакансий без даты не удаляется.
+        :return: количество удалённых вакансий
+        """
+        threshold = before.strftime(MONTH_FORMAT)
+        expired = [
+            key for key in self.__ordered_keys() if key != UNDATED and key < threshold
+        ]
+        if not expired:
+            return 0
+
+        removed = 0
+        for key in expired:
+            removed += self.__partitions.pop(key)
+            self.__shards.pop(key, None)
+        expired = set(expired)
+        self.__locations = {
+            vacancy_id: key
+            for vacancy_id, key in self.__locations.items()
+            if key not in expired
+        }
+        # Сначала сохраняются список разделов и сжатый журнал, затем удаляются
+        # файлы: при сбое остаются лишние файлы, но не ссылки на отсутствующие разделы
+        self.__save_manifest()
+        self.__save_index()
+        for key in expired:
+            self.__shard_path(key).unlink(missing_ok=True)
+        return removed
+
+    def __shard(self, key: str) -> DataJobHHJSON:
+        shard = self.__shards.get(key)
+        if shard is None:
+            shard = DataJobHHJSON(
+                str(self.__shard_path(key)), use_cache=self.__use_cache
+            )
+            self.__shards[key] = shard
+        return shard
+
+    def __shard_path(self, key: str) -> Path:
+        return self.__directory / f"{key}.json"
+
+    def __ordered_keys(self, newest_first: bool = False) -> list:
+        months = sorted(
+            (key for key in self.__partitions if key != UNDATED), reverse=newest_first
+        )
+        if UNDATED in self.__partitions:
+            months.append(UNDATED)
+        return months
+
+    def __pruned_keys(
+        self, date_from: Optional[datetime], date_to: Optional[datetime]
+    ) -> list:
+        """
+        Возвращает ключи разделов, которые могут содержать вакансии периода,
+        от новых к старым
+        """
+        keys = self.__ordered_keys(newest_first=True)
+        if date_from is None and date_to is None:
+            return keys
+
+        low = (date_from - PRUNE_MARGIN).strftime(MONTH_FORMAT) if date_from else ""
+        high = (date_to + PRUNE_MARGIN).strftime(MONTH_FORMAT) if date_to else "9999-99"
+        return [key for key in keys if key != UNDATED and low <= key <= high]
+
+    def __load_manifest(self) -> None:
+        """
+        Читает список разделов и журнал разделов вакансий. Если manifest.json
+        или ids.log нет или manifest.json повреждён, они восстанавливаются
+        по файлам разделов в каталоге. Копии вакансии в разделах старше
+        самого нового, где она есть, при этом удаляются.
+        """
+        locations = self.__load_index()
+        try:
+            with open(self.__manifest_path, "r", encoding="utf-8") as f:
+                partitions = json.load(f)["partitions"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+            partitions = None
+        if partitions is not None and locations is not None:
+            self.__partitions, self.__locations = partitions, locations
+            return
+
+        self.__partitions, self.__locations = {}, {}
+        for path in self.__directory.glob("*.json"):
+            key = path.stem
+            if path.name == MANIFEST_NAME:
+                continue
+            if key != UNDATED and partition_key(f"{key}-01") != key:
+                continue
+            self.__partitions[key] = 0
+
+        for key in self.__ordered_keys(newest_first=True):
+            shard = self.__shard(key)
+            stale = []
+            for vacancy in shard.iter_vacancies():
+                if vacancy.id in self.__locations:
+                    stale.append(vacancy.id)
+                else:
+                    self.__locations[vacancy.id] = key
+                    self.__partitions[key] += 1
+            for vacancy_id in stale:
+                shard.delete(vacancy_id)
+        if self.__partitions:
+            self.__save_index()
+            self.__save_manifest()
+
+    def __load_index(self) -> Optional[dict]:
+        """
+        Читает журнал ids.log: более поздние строки заменяют более ранние
+        :return: id вакансии -> ключ раздела или None, если журнала нет
+        """
+        locations = {}
+        try:
+            with open(self.__index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        vacancy_id, key = json.loads(line)
+                    except (json.JSONDecodeError, TypeError, ValueError):
+                        continue  # Строка, недописанная при сбое
+                    if key is None:
+                        locations.pop(vacancy_id, None)
+                    else:
+                        locations[vacancy_id] = key
+        except FileNotFoundError:
+            return None
+        return locations
+
+    def __append_index(self, locations: dict) -> None:
+        """
+        Дописывает в журнал ids.log новые разделы вакансий
+        :param locations: id вакансии -> ключ раздела или None для удалённой
+        """
+        with open(self.__index_path, "a", encoding="utf-8") as f:
+            f.writelines(
+                json.dumps([vacancy_id, key], ensure_ascii=False) + "\n"
+                for vacancy_id, key in locations.items()
+            )
+
+    def __save_index(self) -> None:
+        """
+        Перезаписывает журнал ids.log одной строкой на вакансию
+        """
+        self.__replace_file(
+            self.__index_path,
+            lambda f: f.writelines(
+                json.dumps([vacancy_id, key], ensure_ascii=False) + "\n"
+                for vacancy_id, key in self.__locations.items()
+            ),
+        )
+
+    def __save_manifest(self) -> None:
+        """
+        Записывает manifest.json
+        """
+        manifest = {"version": 1, "partitions": self.partitions}
+        self.__replace_file(
+            self.__manifest_path,
+            lambda f: json.dump(manifest, f, ensure_ascii=False, indent=4),
+        )
+
+    def __replace_file(self, path: Path, write) -> None:
+        """
+        Записывает файл во временный и подменяет им прежний,
+        чтобы при сбое не оставить его недописанным
+        :param write: функция, записывающая содержимое в открытый файл
+        """
+        fd, temp_path = tempfile.mkstemp(dir=self.__directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                write(f)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
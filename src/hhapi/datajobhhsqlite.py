@@ -0,0 +1,259 @@
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from datajob import DataJob, matches_pattern, merge_records
+from tokenindex import tokenize
+from vacancyhh import VacancyHH
+
+# Поля, по которым find_vacancies ищет слова через полнотекстовый индекс FTS5
+FTS_FIELDS = ("name", "employer")
+# Столбцы таблицы вакансий, по которым get_vacancies проверяет регулярные выражения
+COLUMNS = ("id", "url", "name", "employer", "published_at", "salary")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vacancies (
+    id TEXT PRIMARY KEY,
+    url TEXT,
+    name TEXT,
+    employer TEXT,
+    published_at TEXT,
+    -- Без объявленного типа: целые и дробные зарплаты сохраняются как есть,
+    -- поэтому критерии по зарплате видят то же значение, что и в DataJobHHJSON
+    salary
+);
+CREATE INDEX IF NOT EXISTS idx_vacancies_salary ON vacancies (salary);
+CREATE INDEX IF NOT EXISTS idx_vacancies_published_at ON vacancies (published_at);
+
+-- Диакритика не удаляется: "cafe" не находит "Café", как и в TokenIndex
+CREATE VIRTUAL TABLE IF NOT EXISTS vacancies_fts USING fts5(
+    name, employer, content='vacancies', content_rowid='rowid',
+    tokenize="unicode61 remove_diacritics 0"
+);
+CREATE TRIGGER IF NOT EXISTS vacancies_ai AFTER INSERT ON vacancies BEGIN
+    INSERT INTO vacancies_fts (rowid, name, employer)
+    VALUES (new.rowid, new.name, new.employer);
+END;
+CREATE TRIGGER IF NOT EXISTS vacancies_ad AFTER DELETE ON vacancies BEGIN
+    INSERT INTO vacancies_fts (vacancies_fts, rowid, name, employer)
+    VALUES ('delete', old.rowid, old.name, old.employer);
+END;
+CREATE TRIGGER IF NOT EXISTS vacancies_au AFTER UPDATE ON vacancies BEGIN
+    INSERT INTO vacancies_fts (vacancies_fts, rowid, name, employer)
+    VALUES ('delete', old.rowid, old.name, old.employer);
+    INSERT INTO vacancies_fts (rowid, name, employer)
+    VALUES (new.rowid, new.name, new.employer);
+END;
+"""
+
+UPSERT = """
+INSERT INTO vacancies (id, url, name, employer, published_at, salary)
+VALUES (:id, :url, :name, :employer, :published_at, :salary)
+ON CONFLICT (id) DO UPDATE SET
+    url = excluded.url,
+    name = excluded.name,
+    employer = excluded.employer,
+    published_at = excluded.published_at,
+    salary = excluded.salary
+"""
+
+
+class DataJobHHSQLite(DataJob):
+    """
+    Класс для управления вакансиями, сохраняемыми в базу SQLite.
+    Зарплата и дата публикации индексируются B-деревом,
+    название и работодатель — полнотекстовым индексом FTS5 для find_vacancies.
+    Критерии get_vacancies проверяются регулярными выражениями так же,
+    как в DataJobHHJSON, поэтому хранилища взаимозаменяемы.
+    """
+
+    def __init__(
+        self,
+        file_path: str = "../../data/vacancies.db",
+        delete_existing_data: bool = False,
+    ):
+        """
+        Инициализация экземпляра класса для работы с вакансиями в базе SQLite.
+        :param file_path: Путь к файлу базы данных
+        :param delete_existing_data: Если передан True, то существующий файл удаляется.
+        """
+
+        self.__file_path = Path(file_path)
+
+        if delete_existing_data and self.__file_path.exists():
+            self.__file_path.unlink()
+
+        self.__connection = sqlite3.connect(self.__file_path, check_same_thread=False)
+        self.__connection.row_factory = sqlite3.Row
+        self.__connection.create_function(
+            "REGEXP", 2, matches_pattern, deterministic=True
+        )
+        with self.__connection:
+            self.__connection.executescript(SCHEMA)
+            self.__migrate_fts()
+
+    def add(self, vacancy: VacancyHH):
+        if not isinstance(vacancy, VacancyHH):
+            raise ValueError("Ожидается тип VacancyHH")
+
+        with self.__connection:
+            self.__connection.execute(UPSERT, vacancy.to_dict())
+
+    def add_many(self, vacancies: Iterable[VacancyHH]):
+        """
+        Добавляет или перезаписывает вакансии пакетом в одной транзакции.
+        Вакансии, данные которых не изменились, не перезаписываются.
+        :return: статистика изменений: inserted, updated, skipped
+        """
+        vacancies = list(vacancies)
+        stored = self.__get_records(
+            {vacancy.id for vacancy in vacancies if isinstance(vacancy, VacancyHH)}
+        )
+        changed, stats = merge_records(vacancies, stored.get)
+
+        with self.__connection:
+            self.__connection.executemany(UPSERT, changed.values())
+        return stats
+
+    def delete(self, vacancy_id: str):
+        with self.__connection:
+            cursor = self.__connection.execute(
+                "DELETE FROM vacancies WHERE id = ?", (vacancy_id,)
+            )
+        if cursor.rowcount == 0:
+            raise KeyError(vacancy_id)
+
+    def get_vacancies(self, **criteria):
+        """
+        Возвращает вакансии, удовлетворяющие всем критериям: значение каждого
+        указанного поля должно содержать совпадение с регулярным выражением
+        без учёта регистра, как в DataJobHHJSON. Для поиска слов по названию
+        и работодателю через индекс FTS5 используйте find_vacancies.
+        """
+        conditions, params = self.__build_conditions(criteria)
+        return self.__select(conditions, params, "rowid")
+
+    def iter_vacancies(self, **criteria) -> Iterator[VacancyHH]:
+        """
+        Возвращает подходящие под критерии вакансии по одной, читая курсор постепенно.
+        """
+        conditions, params = self.__build_conditions(criteria)
+        cursor = self.__connection.execute(
+            self.__select_sql(conditions, "rowid"), params
+        )
+        yield from VacancyHH.from_storage_records(dict(row) for row in cursor)
+
+    def find_vacancies(
+        self,
+        keyword: str,
+        prefix: bool = False,
+        fields: Optional[Iterable[str]] = None,
+        **criteria,
+    ):
+        """
+        Ищет вакансии, содержащие все слова запроса, через индекс FTS5.
+        """
+        fields = FTS_FIELDS if fields is None else tuple(fields)
+        unknown = set(fields) - set(FTS_FIELDS)
+        if unknown:
+            raise ValueError(f"Поля не проиндексированы: {', '.join(sorted(unknown))}")
+
+        conditions, params = self.__build_conditions(criteria)
+        words = tokenize(keyword)
+        if words:
+            suffix = "*" if prefix else ""
+            match = " ".join(f'"{word}"{suffix}' for word in words)
+            conditions.append(
+                "rowid IN (SELECT rowid FROM vacancies_fts WHERE vacancies_fts MATCH ?)"
+            )
+            params.append(f"{{{' '.join(fields)}}} : ({match})")
+        return self.__select(conditions, params, "rowid")
+
+    def top_by_salary(self, n: int, **criteria):
+        """
+        Возвращает n вакансий с наибольшей зарплатой.
+        Вакансии с зарплатой читаются по индексу зарплаты, пока не наберётся n,
+        вакансии без зарплаты добираются в конец списка отдельным запросом.
+        """
+        if n <= 0:
+            return []
+        conditions, params = self.__build_conditions(criteria)
+        result = self.__select(
+            conditions + ["salary IS NOT NULL"], params, "salary DESC, rowid", n
+        )
+        if len(result) < n:
+            result += self.__select(
+                conditions + ["salary IS NULL"], params, "rowid", n - len(result)
+            )
+        return result
+
+    def close(self):
+        """
+        Закрывает соединение с базой данных.
+        """
+        self.__connection.close()
+
+    def __migrate_fts(self) -> None:
+        """
+        Пересоздаёт индекс FTS5 базы, созданной с токенизатором по умолчанию,
+        который удаляет диакритику
+        """
+        (sql,) = self.__connection.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'vacancies_fts'"
+        ).fetchone()
+        if "remove_diacritics 0" in sql:
+            return
+        self.__connection.execute("DROP TABLE vacancies_fts")
+        self.__connection.executescript(SCHEMA)
+        self.__connection.execute(
+            "INSERT INTO vacancies_fts (vacancies_fts) VALUES ('rebuild')"
+        )
+
+    def __get_records(self, vacancy_ids: set) -> dict:
+        """
+        Возвращает сохранённые вакансии с указанными id в формате to_dict
+        """
+        ids = list(vacancy_ids)
+        records = {}
+        # Запрос частями, чтобы не превысить ограничение SQLite на число параметров
+        for start in range(0, len(ids), 500):
+            end = start + 500
+            chunk = ids[start:end]
+            placeholders = ", ".join("?" * len(chunk))
+            cursor = self.__connection.execute(
+                "SELECT id, url, name, employer, published_at, salary FROM vacancies "
+                f"WHERE id IN ({placeholders})",
+                chunk,
+            )
+            for row in cursor:
+                records[row["id"]] = dict(row)
+        return records
+
+    def __select(self, conditions: list, params: list, order_by: str, limit=None):
+        sql = self.__select_sql(conditions, order_by)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = params + [limit]
+        cursor = self.__connection.execute(sql, params)
+        return list(VacancyHH.from_storage_records(dict(row) for row in cursor))
+
+    @staticmethod
+    def __select_sql(conditions: list, order_by: str) -> str:
+        sql = "SELECT id, url, name, employer, published_at, salary FROM vacancies"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        return sql + f" ORDER BY {order_by}"
+
+    @staticmethod
+    def __build_conditions(criteria: dict):
+        conditions = []
+        params = []
+        for key, value in criteria.items():
+            if key in COLUMNS:
+                conditions.append(f"{key} REGEXP ?")
+                params.append(str(value))
+            elif not matches_pattern(str(value), ""):
+                # Поля нет в хранилище: как и в DataJobHHJSON, его значение
+                # считается пустой строкой, и критерий проверяется один раз
+                conditions.append("0")
+        return conditions, params
@@ -0,0 +1,64 @@
+import json
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+
+class VacancyDetailsCache:
+    """
+    Дисковый кэш подробной информации о вакансиях hh.ru.
+    Каждая вакансия хранится в отдельном JSON-файле с именем по её id,
+    запись считается устаревшей по истечении ttl секунд с момента сохранения.
+    """
+
+    def __init__(
+        self, directory: str = "../../data/details", ttl: float = 24 * 60 * 60
+    ):
+        """
+        :param directory: каталог для файлов кэша, создаётся при необходимости
+        :param ttl: время жизни записи в секундах
+        """
+        self.__directory = Path(directory)
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+
+    def get(self, vacancy_id: str) -> Optional[dict]:
+        """
+        Возвращает сохранённые данные вакансии или None,
+        если записи нет, она устарела или повреждена.
+        """
+        path = self.__path(vacancy_id)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError:
+            return None
+
+    def set(self, vacancy_id: str, details: dict) -> None:
+        """
+        Сохраняет данные вакансии. Запись атомарна: файл сначала пишется
+        во временный файл и затем переименовывается, поэтому параллельные
+        читатели никогда не видят частично записанный файл.
+        """
+        path = self.__path(vacancy_id)
+        fd, temp_path = tempfile.mkstemp(dir=self.__directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(details, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def __path(self, vacancy_id: str) -> Path:
+        vacancy_id = str(vacancy_id)
+        if not re.fullmatch(r"[\w-]+", vacancy_id):
+            raise ValueError(f"Некорректный id вакансии: {vacancy_id}")
+        return self.__directory / f"{vacancy_id}.json"
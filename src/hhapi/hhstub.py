@@ -0,0 +1,292 @@
+import json
+import math
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+# Момент публикации самой новой вакансии тестового сервера
+DEFAULT_NEWEST = datetime(2024, 12, 1, 12, 0, tzinfo=timezone(timedelta(hours=3)))
+
+CURRENCIES = [
+    {"code": "RUR", "abbr": "₽", "name": "Рубли", "default": True, "rate": 1.0},
+    {"code": "USD", "abbr": "$", "name": "Доллары", "default": False, "rate": 0.011},
+    {"code": "EUR", "abbr": "€", "name": "Евро", "default": False, "rate": 0.0095},
+]
+
+# Период проверки запроса на остановку сервера в секундах: при значении
+# по умолчанию (0.5) остановка сервера в каждом тесте ждёт до полусекунды
+POLL_INTERVAL = 0.05
+
+
+class HHStubServer:
+    """
+    Локальный HTTP-сервер, имитирующий API hh.ru для нагрузочного
+    и сквозного тестирования клиента без доступа к сети.
+    Обслуживает /vacancies, /vacancies/{id} и /dictionaries.
+    Вакансии генерируются детерминированно: вакансия с номером i опубликована
+    на i * interval секунд раньше newest, поэтому фильтры date_from/date_to
+    работают как у hh.ru. Задержка ответа, доля ошибок 503, ограничение частоты
+    запросов (ответ 429 с Retry-After) и глубина выдачи настраиваются.
+
+    Пример:
+        with HHStubServer(found=5000, latency=0.01) as server:
+            APIJobHH.configure_base_url(server.url)
+            ...
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        found: int = 2000,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: Optional[float] = None,
+        retry_after: float = 1.0,
+        max_depth: int = 2000,
+        interval: int = 60,
+        newest: datetime = DEFAULT_NEWEST,
+        seed: Optional[int] = None,
+    ):
+        """
+        :param host: адрес для прослушивания
+        :param port: порт, 0 — выбрать свободный
+        :param found: общее количество вакансий в выдаче
+        :param latency: задержка каждого ответа в секундах
+        :param error_rate: доля запросов (от 0 до 1), на которые возвращается 503
+        :param rate_limit: допустимое количество запросов в секунду,
+        сверх него возвращается 429; None — без ограничения
+        :param retry_after: значение заголовка Retry-After в ответах 429
+        :param max_depth: максимальная глубина выдачи, запрос страницы за её
+        пределами завершается ошибкой 400, как у hh.ru
+        :param interval: интервал между датами публикации соседних вакансий в секундах
+        :param newest: дата публикации самой новой вакансии
+        :param seed: начальное значение генератора ошибок для воспроизводимости
+        """
+        self.found = found
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.max_depth = max_depth
+        self.interval = interval
+        self.newest = newest
+        self.__random = random.Random(seed)
+        self.__lock = threading.Lock()
+        self.__tokens = None  # Ведро заполняется при первом запросе
+        self.__tokens_at = time.monotonic()
+        self.__stats = {"requests": 0, "errors": 0, "throttled": 0, "depth_errors": 0}
+
+        self.__server = ThreadingHTTPServer((host, port), self.__handler_class())
+        self.__server.daemon_threads = True
+        self.__thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        Базовый адрес сервера для APIJobHH.configure_base_url
+        """
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self) -> dict:
+        """
+        Возвращает копию счётчиков: всего запросов, ответов 503, ответов 429
+        и запросов за пределами глубины выдачи
+        """
+        with self.__lock:
+            return dict(self.__stats)
+
+    def start(self) -> "HHStubServer":
+        """
+        Запускает сервер в фоновом потоке
+        """
+        self.__thread = threading.Thread(
+            target=self.__server.serve_forever,
+            kwargs={"poll_interval": POLL_INTERVAL},
+            name="hh-stub",
+            daemon=True,
+        )
+        self.__thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Останавливает сервер и освобождает порт
+        """
+        if self.__thread is not None:
+            self.__server.shutdown()
+            self.__thread.join()
+            self.__thread = None
+        self.__server.server_close()
+
+    def __enter__(self) -> "HHStubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def vacancy(self, index: int) -> dict:
+        """
+        Возвращает вакансию с номером index в формате выдачи /vacancies
+        """
+        vacancy_id = str(1_000_000 + index)
+        published_at = self.newest - timedelta(seconds=index * self.interval)
+        salary = None
+        if index % 4:
+            currency = CURRENCIES[index % len(CURRENCIES)]
+            low = (30 + index % 370) * 1000 * currency["rate"]
+            salary = {
+                "from": low,
+                "to": low * 1.5 if index % 3 else None,
+                "currency": currency["code"],
+                "gross": True,
+            }
+        return {
+            "id": vacancy_id,
+            "name": f"Python разработчик {index}",
+            "url": f"{self.url}/vacancies/{vacancy_id}",
+            "alternate_url": f"https://hh.ru/vacancy/{vacancy_id}",
+            "published_at": published_at.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "employer": {"id": str(index % 100), "name": f"Компания {index % 100}"},
+            "salary": salary,
+            "area": {"id": "1", "name": "Москва"},
+        }
+
+    def handle(self, path: str, query: dict) -> tuple:
+        """
+        Формирует ответ на запрос.
+        :return: (статус, заголовки, JSON-совместимое тело)
+        """
+        with self.__lock:
+            self.__stats["requests"] += 1
+            throttled = not self.__take_token()
+            failed = not throttled and self.__random.random() < self.error_rate
+            if throttled:
+                self.__stats["throttled"] += 1
+            elif failed:
+                self.__stats["errors"] += 1
+
+        if self.latency > 0:
+            time.sleep(self.latency)
+        if throttled:
+            return 429, {"Retry-After": f"{self.retry_after:g}"}, _error("too_many")
+        if failed:
+            return 503, {}, _error("service_unavailable")
+
+        parts = path.strip("/").split("/")
+        if parts == ["dictionaries"]:
+            return 200, {}, {"currency": CURRENCIES}
+        if parts == ["vacancies"]:
+            return self.__search(query)
+        if len(parts) == 2 and parts[0] == "vacancies":
+            index = _vacancy_index(parts[1])
+            if index is None or not 0 <= index < self.found:
+                return 404, {}, _error("not_found")
+            details = self.vacancy(index)
+            details["description"] = f"<p>Описание вакансии {details['id']}</p>"
+            return 200, {}, details
+        return 404, {}, _error("not_found")
+
+    def __search(self, query: dict) -> tuple:
+        try:
+            page = int(query.get("page", 0))
+            per_page = min(int(query.get("per_page", 20)), 100)
+            first, last = self.__window(query.get("date_from"), query.get("date_to"))
+        except ValueError:
+            return 400, {}, _error("bad_argument")
+        if page < 0 or per_page <= 0:
+            return 400, {}, _error("bad_argument")
+        if (page + 1) * per_page > self.max_depth:
+            with self.__lock:
+                self.__stats["depth_errors"] += 1
+            return 400, {}, _error("bad_argument")
+
+        found = max(0, last - first)
+        start = first + page * per_page
+        end = min(start + per_page, last)
+        return (
+            200,
+            {},
+            {
+                "items": [self.vacancy(index) for index in range(start, end)],
+                "found": found,
+                "pages": math.ceil(min(found, self.max_depth) / per_page),
+                "page": page,
+                "per_page": per_page,
+            },
+        )
+
+    def __window(self, date_from: Optional[str], date_to: Optional[str]) -> tuple:
+        """
+        Диапазон номеров вакансий [first, last), опубликованных в [date_from, date_to]
+        """
+        first, last = 0, self.found
+        if date_to:
+            offset = (self.newest - datetime.fromisoformat(date_to)).total_seconds()
+            first = max(first, math.ceil(offset / self.interval))
+        if date_from:
+            offset = (self.newest - datetime.fromisoformat(date_from)).total_seconds()
+            last = min(last, math.floor(offset / self.interval) + 1)
+        return first, max(first, last)
+
+    def __take_token(self) -> bool:
+        """
+        Ограничение частоты запросов ведром токенов ёмкостью rate_limit.
+        Вызывается под блокировкой.
+        """
+        if not self.rate_limit:
+            return True
+        now = time.monotonic()
+        if self.__tokens is None:
+            self.__tokens = self.rate_limit
+        self.__tokens = min(
+            self.rate_limit,
+            self.__tokens + (now - self.__tokens_at) * self.rate_limit,
+        )
+        self.__tokens_at = now
+        if self.__tokens < 1:
+            return False
+        self.__tokens -= 1
+        return True
+
+    def __handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                status, headers, body = server.handle(url.path, query)
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                # Журнал запросов отключён, чтобы не засорять вывод нагрузочных тестов
+                pass
+
+        return Handler
+
+
+def _error(value: str) -> dict:
+    return {"errors": [{"type": value}]}
+
+
+def _vacancy_index(vacancy_id: str) -> Optional[int]:
+    try:
+        return int(vacancy_id) - 1_000_000
+    except ValueError:
+        return None
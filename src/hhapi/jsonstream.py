@@ -0,0 +1,97 @@
+import json
+import re
+from typing import IO, Iterator, Tuple
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def iter_object_items(
+    file: IO[str], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Tuple[str, object]]:
+    """
+    Последовательно разбирает JSON-объект верхнего уровня из текстового файла
+    и возвращает его пары (ключ, значение) по одной.
+    В памяти одновременно находится не больше одного блока файла
+    и одного значения, поэтому объём памяти не зависит от размера файла.
+    Пустой файл считается пустым объектом.
+    :param file: файл, открытый в текстовом режиме
+    :param chunk_size: размер блока чтения в символах
+    :raise json.JSONDecodeError: если содержимое файла не является JSON-объектом
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        """
+        Дочитывает блок файла, отбрасывая уже разобранную часть буфера
+        """
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = file.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def next_char() -> str:
+        """
+        Пропускает пробельные символы и возвращает следующий символ или "" в конце файла
+        """
+        nonlocal pos
+        while True:
+            pos = WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                return ""
+
+    def decode():
+        """
+        Разбирает одно значение JSON, дочитывая файл, пока значение не станет полным.
+        Значение, заканчивающееся ровно на конце буфера (например, число),
+        может продолжаться в следующем блоке, поэтому в этом случае файл дочитывается.
+        """
+        nonlocal pos
+        next_char()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if fill():
+                    continue
+                raise
+            if end == len(buffer) and fill():
+                continue
+            pos = end
+            return value
+
+    def expect(chars: str) -> str:
+        nonlocal pos
+        char = next_char()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(
+                f"Ожидается один из символов {chars!r}", buffer, pos
+            )
+        pos += 1
+        return char
+
+    if next_char() == "":
+        return
+    expect("{")
+    if next_char() == "}":
+        return
+
+    while True:
+        key = decode()
+        if not isinstance(key, str):
+            raise json.JSONDecodeError("Ожидается строковый ключ", buffer, pos)
+        expect(":")
+        yield key, decode()
+        if expect(",}") == "}":
+            return
@@ -1,18 +1,65 @@
+import os
+from pathlib import Path
+
 from apijobhh import APIJobHH
+from datajob import DataJob
 from datajobhhjson import DataJobHHJSON
-from vacancyhh import VacancyHH
+from datajobhhjsonl import DataJobHHJSONL
+from datajobhhsharded import DataJobHHSharded
+from datajobhhsqlite import DataJobHHSQLite
+from pipeline import IngestPipeline
+from ratelimit import RateLimiter
+from responsecache import TieredResponseCache
+from sync import SyncState, sync_vacancies
+
+PAGES_WORKERS = 4  # Количество потоков для параллельной загрузки страниц поиска
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")  # Расширения файлов базы SQLite
+JSONL_SUFFIX = ".jsonl"  # Расширение журнала JSON Lines
+
+
+def create_data_job(file_path: str) -> DataJob:
+    """
+    Выбирает хранилище вакансий по расширению файла:
+    для .db, .sqlite и .sqlite3 используется SQLite, для .jsonl — журнал JSON Lines,
+    для остальных — JSON. Новый журнал заполняется из одноимённого файла .json,
+    если он есть. Для каталога (путь оканчивается на "/" или каталог уже существует)
+    вакансии хранятся в разделах по месяцам публикации.
+    """
+    if file_path.endswith(("/", os.sep)) or Path(file_path).is_dir():
+        return DataJobHHSharded(file_path)
+    if file_path.lower().endswith(SQLITE_SUFFIXES):
+        return DataJobHHSQLite(file_path, delete_existing_data=False)
+    if file_path.lower().endswith(JSONL_SUFFIX):
+        json_path = Path(file_path).with_suffix(".json")
+        is_new = not Path(file_path).exists()
+        data_job = DataJobHHJSONL(file_path)
+        if is_new and json_path.exists():
+            data_job.load_from_json(str(json_path))
+        return data_job
+    return DataJobHHJSON(file_path, delete_existing_data=False, use_cache=True)
 
 
 def main():
     print("Добро пожаловать в систему поиска вакансий!")
 
+    # Поиск, подробности и курсы валют делят общий бюджет запросов к hh.ru
+    APIJobHH.configure_rate_limiter(
+        RateLimiter(rate=10, budgets={"/vacancies": 8, "/dictionaries": 1})
+    )
+    # Повторные поиски и справочники берутся из кэша или перепроверяются запросом 304
+    APIJobHH.configure_transport(cache=TieredResponseCache())
+    # Курсы валют загружаются при первом использовании и хранятся между запусками
+    APIJobHH.configure_currency_rates("../../data/currency_rates.json")
     api_job_hh = APIJobHH()
     file_path = input(
-        "Введите путь к файлу для сохранения вакансий (по-умолчанию '../../data/vacancies.json'): "
+        "Введите путь к файлу для сохранения вакансий "
+        "(по-умолчанию '../../data/vacancies.json', для SQLite укажите файл .db, "
+        "для журнала JSON Lines — .jsonl, для разделов по месяцам — каталог с '/' на конце): "
     )
     if not file_path:
         file_path = "../../data/vacancies.json"
-    data_job = DataJobHHJSON(file_path, delete_existing_data=False)
+    data_job = create_data_job(file_path)
+    sync_state = SyncState()
 
     while True:
         print("\nВыберите действие:")
@@ -31,12 +78,38 @@ def main():
             ).strip()
             pages_count = int(pages_count) if pages_count.isdigit() else 1
 
-            vacancies = api_job_hh.search_vacancies(keyword, pages_count)
-            for vacancy_data in vacancies:
-                vacancy = VacancyHH(vacancy_data, api_job_hh.currency_rates)
-                data_job.add(vacancy)
-
-            print(f"Найдено и сохранено {len(vacancies)} вакансий.")
+            incremental = input(
+                "Загрузить только вакансии, опубликованные после прошлой загрузки "
+                "по этому запросу? (д/н, по-умолчанию н): "
+            ).strip().lower() in ("д", "y")
+
+            if incremental:
+                stats = sync_vacancies(
+                    api_job_hh,
+                    data_job,
+                    keyword,
+                    sync_state,
+                    pages_count,
+                    max_workers=PAGES_WORKERS,
+                )
+                print(
+                    f"Найдено {stats['fetched']} вакансий: добавлено {stats['inserted']}, "
+                    f"обновлено {stats['updated']}, без изменений {stats['skipped']}."
+                )
+                if stats["truncated"]:
+                    print(
+                        "Выдача загружена не полностью даже по окнам дат публикации, "
+                        "отметка синхронизации не сдвинута."
+                    )
+            else:
+                # Загрузка страниц, преобразование и запись идут одновременно
+                stats = IngestPipeline(
+                    api_job_hh, data_job, fetch_workers=PAGES_WORKERS
+                ).run(keyword, pages_count)
+                print(
+                    f"Найдено {stats['fetched']} вакансий: добавлено {stats['inserted']}, "
+                    f"обновлено {stats['updated']}, без изменений {stats['skipped']}."
+                )
 
         elif choice == "2":
             top_n_input = input("Введите количество вакансий для отображения: ").strip()
@@ -44,17 +117,15 @@ def main():
                 print("Ошибка: введите корректное положительное число.")
             else:
                 top_n = int(top_n_input)
-                vacancies = data_job.get_vacancies()
-
-                sorted_vacancies = sorted(vacancies, reverse=True)
+                top_vacancies = data_job.top_by_salary(top_n)
 
                 print("Топ вакансий по зарплате:")
-                for vacancy in sorted_vacancies[:top_n]:
+                for vacancy in top_vacancies:
                     print(vacancy, "\n")
 
         elif choice == "3":
             keyword = input("Введите ключевое слово для поиска в названии: ")
-            vacancies = data_job.get_vacancies(name=keyword)
+            vacancies = data_job.find_vacancies(keyword, prefix=True, fields=["name"])
 
             print(f'Найдено {len(vacancies)} вакансий с ключевым словом "{keyword}":')
             for vacancy in vacancies:
@@ -62,14 +133,15 @@ def main():
 
         elif choice == "4":
             csv_file_path = input(
-                "Введите путь для сохранения CSV-файла (по-умолчанию '../../data/vacancies.csv'): "
+                "Введите путь для сохранения CSV-файла (по-умолчанию '../../data/vacancies.csv', "
+                "для сжатия gzip укажите файл .csv.gz): "
             ).strip()
             if not csv_file_path:
                 csv_file_path = "../../data/vacancies.csv"
 
             try:
-                data_job.save_to_csv(csv_file_path)
-                print(f"Вакансии успешно сохранены в файл '{csv_file_path}'.")
+                count = data_job.save_to_csv(csv_file_path)
+                print(f"{count} вакансий успешно сохранены в файл '{csv_file_path}'.")
             except Exception as e:
                 print(f"Ошибка при сохранении файла: {e}")
 
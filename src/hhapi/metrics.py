@@ -0,0 +1,291 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable, Iterator, Optional
+
+# Границы интервалов гистограмм задержек по умолчанию в секундах
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Histogram:
+    """
+    Гистограмма с фиксированными границами интервалов, как в Prometheus:
+    значение попадает в первый интервал, верхняя граница которого не меньше его.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # Последний — выше всех границ
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list:
+        """
+        Накопленные количества по границам, последний элемент — для +Inf
+        """
+        total, result = 0, []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+    def to_dict(self) -> dict:
+        return {
+            "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.cumulative())),
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+class _Timer:
+    """
+    Контекстный менеджер, записывающий длительность блока в гистограмму
+    """
+
+    __slots__ = ("metrics", "name", "labels", "start")
+
+    def __init__(self, metrics: "Metrics", name: str, labels: dict):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, **self.labels)
+
+
+class _NullTimer:
+    """
+    Пустой таймер для отключённых метрик
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """
+    Реестр метрик: счётчики и гистограммы с метками, обработчики событий
+    для трассировки и экспорт в текстовом формате Prometheus или JSON.
+    По умолчанию метрики отключены: инструментированный код проверяет
+    атрибут enabled до любых измерений, поэтому в отключённом состоянии
+    стоимость сводится к одной проверке.
+
+    Обработчик события вызывается как hook(kind, name, value, labels),
+    где kind — "counter" или "histogram".
+    """
+
+    def __init__(
+        self, prefix: str = "hhapi", buckets: Iterable[float] = DEFAULT_BUCKETS
+    ):
+        """
+        :param prefix: префикс имён метрик при экспорте
+        :param buckets: границы интервалов гистограмм в секундах
+        """
+        self.prefix = prefix
+        self.buckets = tuple(buckets)
+        self.enabled = False
+        self.__lock = threading.Lock()
+        self.__counters = {}  # (имя, метки) -> значение
+        self.__histograms = {}  # (имя, метки) -> Histogram
+        self.__hooks = []
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        """
+        Удаляет накопленные значения всех метрик
+        """
+        with self.__lock:
+            self.__counters.clear()
+            self.__histograms.clear()
+
+    def add_hook(self, hook: Callable[[str, str, float, dict], None]) -> None:
+        """
+        Добавляет обработчик, вызываемый при каждом изменении метрики
+        """
+        self.__hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[str, str, float, dict], None]) -> None:
+        self.__hooks.remove(hook)
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """
+        Увеличивает счётчик name с метками labels на value
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self.__lock:
+            self.__counters[key] = self.__counters.get(key, 0) + value
+        for hook in self.__hooks:
+            hook("counter", name, value, labels)
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """
+        Записывает значение value в гистограмму name с метками labels
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self.__lock:
+            histogram = self.__histograms.get(key)
+            if histogram is None:
+                histogram = self.__histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+        for hook in self.__hooks:
+            hook("histogram", name, value, labels)
+
+    def timer(self, name: str, **labels):
+        """
+        Контекстный менеджер для измерения длительности блока:
+            with metrics.timer("storage_parse_seconds", storage="json"):
+                ...
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+
+    def measure_iter(
+        self, iterable: Iterable, name: str, counter: Optional[str] = None, **labels
+    ) -> Iterator:
+        """
+        Оборачивает итератор: суммарное время получения элементов записывается
+        в гистограмму name, количество элементов — в счётчик counter.
+        Время обработки элементов потребителем не учитывается.
+        """
+        iterator = iter(iterable)
+        elapsed, count = 0.0, 0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    elapsed += time.perf_counter() - start
+                    break
+                elapsed += time.perf_counter() - start
+                count += 1
+                yield item
+        finally:
+            self.observe(name, elapsed, **labels)
+            if counter:
+                self.inc(counter, count, **labels)
+
+    def counter_value(self, name: str, **labels) -> float:
+        """
+        Текущее значение счётчика или 0
+        """
+        with self.__lock:
+            return self.__counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def histogram(self, name: str, **labels) -> Optional[Histogram]:
+        """
+        Гистограмма с указанными метками или None
+        """
+        with self.__lock:
+            return self.__histograms.get((name, tuple(sorted(labels.items()))))
+
+    def snapshot(self) -> dict:
+        """
+        Снимок всех метрик в виде JSON-совместимого словаря
+        """
+        with self.__lock:
+            return {
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self.__counters.items())
+                ],
+                "histograms": [
+                    {"name": name, "labels": dict(labels), **histogram.to_dict()}
+                    for (name, labels), histogram in sorted(
+                        self.__histograms.items(), key=lambda item: item[0]
+                    )
+                ],
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=4)
+
+    def to_prometheus(self) -> str:
+        """
+        Снимок всех метрик в текстовом формате Prometheus (exposition format 0.0.4)
+        """
+        lines = []
+        with self.__lock:
+            counters = sorted(self.__counters.items())
+            histograms = sorted(self.__histograms.items(), key=lambda item: item[0])
+
+        declared = set()
+        for (name, labels), value in counters:
+            full_name = f"{self.prefix}_{name}"
+            if full_name not in declared:
+                declared.add(full_name)
+                lines.append(f"# TYPE {full_name} counter")
+            lines.append(f"{full_name}{_format_labels(labels)} {_format_value(value)}")
+
+        for (name, labels), histogram in histograms:
+            full_name = f"{self.prefix}_{name}"
+            if full_name not in declared:
+                declared.add(full_name)
+                lines.append(f"# TYPE {full_name} histogram")
+            bounds = [*map(_format_bound, histogram.buckets), "+Inf"]
+            for bound, count in zip(bounds, histogram.cumulative()):
+                bucket_labels = _format_labels(labels + (("le", bound),))
+                lines.append(f"{full_name}_bucket{bucket_labels} {count}")
+            lines.append(
+                f"{full_name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}"
+            )
+            lines.append(f"{full_name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _format_value(value) -> str:
+    """
+    Точное представление значения: целые числа без экспоненты,
+    дробные — кратчайшей записью, однозначно восстанавливающей число
+    """
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _format_bound(bound: float) -> str:
+    return f"{bound:g}"
+
+
+# Общий реестр, используемый транспортом, хранилищами и VacancyHH
+metrics = Metrics()
@@ -0,0 +1,296 @@
+import queue
+import threading
+import time
+from typing import Iterable, Optional, Union
+
+from apijobhh import APIJobHH
+from datajob import DataJob
+from vacancyhh import VacancyHH
+
+# Маркер завершения работы для потоков стадии
+_DONE = object()
+
+
+class StageStats:
+    """
+    Статистика стадии конвейера: количество обработанных элементов и время,
+    которое потоки стадии провели за работой (busy), в ожидании места
+    в очереди следующей стадии (blocked) и в ожидании входных данных (idle).
+    """
+
+    __slots__ = ("name", "workers", "items", "busy", "blocked", "idle")
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.busy = 0.0
+        self.blocked = 0.0
+        self.idle = 0.0
+
+    def to_dict(self, elapsed: float) -> dict:
+        """
+        :param elapsed: длительность работы конвейера в секундах
+        :return: счётчики, пропускная способность стадии (элементов в секунду
+        чистой работы одного потока, умноженная на количество потоков)
+        и загрузка (доля времени, которую потоки стадии были заняты работой)
+        """
+        capacity = self.items / self.busy * self.workers if self.busy else 0.0
+        utilization = self.busy / (elapsed * self.workers) if elapsed else 0.0
+        return {
+            "workers": self.workers,
+            "items": self.items,
+            "busy_seconds": self.busy,
+            "blocked_seconds": self.blocked,
+            "idle_seconds": self.idle,
+            "items_per_second": capacity,
+            "utilization": utilization,
+        }
+
+
+class IngestPipeline:
+    """
+    Конвейер загрузки вакансий: загрузка страниц из API, преобразование
+    в VacancyHH и запись в хранилище выполняются одновременно в отдельных потоках.
+    Стадии связаны ограниченными очередями: если следующая стадия не успевает,
+    предыдущая ждёт (backpressure), и память не растёт.
+    Запись выполняется пакетами через DataJob.add_many в одном потоке,
+    поэтому хранилище не обязано быть потокобезопасным.
+
+    Пример:
+        stats = IngestPipeline(APIJobHH(), data_job).run("python", pages_count=20)
+        print(stats["bottleneck"], stats["stages"])
+    """
+
+    def __init__(
+        self,
+        api: APIJobHH,
+        data_job: DataJob,
+        fetch_workers: int = 4,
+        normalize_workers: int = 1,
+        queue_size: int = 16,
+        batch_size: int = 1000,
+        currency_rates: Optional[dict] = None,
+    ):
+        """
+        :param api: источник страниц поиска (get_vacancies_page и currency_rates)
+        :param data_job: хранилище для записи вакансий
+        :param fetch_workers: количество потоков загрузки страниц
+        :param normalize_workers: количество потоков преобразования в VacancyHH
+        :param queue_size: ёмкость очередей между стадиями (в страницах)
+        :param batch_size: количество вакансий в одной записи в хранилище
+        :param currency_rates: курсы валют, по умолчанию — курсы hh.ru из api
+        """
+        self.api = api
+        self.data_job = data_job
+        self.fetch_workers = max(1, fetch_workers)
+        self.normalize_workers = max(1, normalize_workers)
+        self.queue_size = max(1, queue_size)
+        self.batch_size = max(1, batch_size)
+        self.currency_rates = currency_rates
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__error = None
+
+    def run(self, keywords: Union[str, Iterable[str]], pages_count: int = 1) -> dict:
+        """
+        Загружает вакансии по одному или нескольким поисковым запросам и записывает
+        их в хранилище. Если какая-либо стадия завершилась ошибкой, остальные
+        прекращают работу, а ошибка выбрасывается; уже записанные пакеты
+        остаются в хранилище.
+        :param keywords: поисковый запрос или несколько запросов
+        :param pages_count: максимальное количество страниц на запрос
+        :return: количество загруженных вакансий (fetched), итог записи
+        (inserted, updated, skipped), длительность (elapsed), статистика стадий
+        (stages) и название самой загруженной стадии (bottleneck)
+        """
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        self.__stop.clear()
+        self.__error = None
+        rates = (
+            self.currency_rates
+            if self.currency_rates is not None
+            else self.api.currency_rates
+        )
+
+        tasks = queue.Queue()
+        pages = queue.Queue(maxsize=self.queue_size)
+        records = queue.Queue(maxsize=self.queue_size)
+        stages = {
+            "fetch": StageStats("fetch", self.fetch_workers),
+            "normalize": StageStats("normalize", self.normalize_workers),
+            "store": StageStats("store", 1),
+        }
+        totals = {"fetched": 0, "inserted": 0, "updated": 0, "skipped": 0}
+
+        if pages_count > 0:
+            for keyword in keywords:
+                tasks.put((keyword, 0))
+
+        start = time.perf_counter()
+        fetchers = self.__start(
+            self.__fetch, self.fetch_workers, tasks, pages, pages_count, stages["fetch"]
+        )
+        normalizers = self.__start(
+            self.__normalize,
+            self.normalize_workers,
+            pages,
+            records,
+            rates,
+            stages["normalize"],
+        )
+        (sink,) = self.__start(self.__store, 1, records, totals, stages["store"])
+
+        # Задачи загрузки порождают новые (страницы после первой), поэтому
+        # окончание загрузки определяется по опустевшей очереди задач
+        tasks.join()
+        self.__finish(tasks, fetchers)
+        self.__finish(pages, normalizers)
+        self.__finish(records, [sink])
+        elapsed = time.perf_counter() - start
+
+        if self.__error is not None:
+            raise self.__error
+
+        stage_stats = {name: stage.to_dict(elapsed) for name, stage in stages.items()}
+        return {
+            **totals,
+            "elapsed": elapsed,
+            "stages": stage_stats,
+            "bottleneck": max(
+                stage_stats, key=lambda name: stage_stats[name]["utilization"]
+            ),
+        }
+
+    def __fetch(self, tasks, pages, pages_count, stats: StageStats) -> None:
+        busy = blocked = idle = 0.0
+        count = 0
+        try:
+            while True:
+                started = time.perf_counter()
+                task = tasks.get()
+                idle += time.perf_counter() - started
+                try:
+                    if task is _DONE:
+                        return
+                    if self.__stop.is_set():
+                        continue  # После ошибки оставшиеся задачи только вычитываются
+                    keyword, page = task
+                    started = time.perf_counter()
+                    data = self.api.get_vacancies_page(keyword, page)
+                    if page == 0:
+                        total = min(pages_count, data.get("pages", pages_count))
+                        for next_page in range(1, total):
+                            tasks.put((keyword, next_page))
+                    busy += time.perf_counter() - started
+                    count += 1
+
+                    started = time.perf_counter()
+                    pages.put(data.get("items", []))
+                    blocked += time.perf_counter() - started
+                except Exception as error:
+                    self.__fail(error)
+                finally:
+                    tasks.task_done()
+        finally:
+            self.__add_stats(stats, count, busy, blocked, idle)
+
+    def __normalize(self, pages, records, rates, stats: StageStats) -> None:
+        busy = blocked = idle = 0.0
+        count = 0
+        try:
+            while True:
+                started = time.perf_counter()
+                items = pages.get()
+                idle += time.perf_counter() - started
+                if items is _DONE:
+                    return
+                if self.__stop.is_set():
+                    continue
+                try:
+                    started = time.perf_counter()
+                    vacancies = list(VacancyHH.from_api_items(items, rates))
+                    busy += time.perf_counter() - started
+                    count += len(vacancies)
+                except Exception as error:
+                    self.__fail(error)
+                    continue
+
+                started = time.perf_counter()
+                records.put(vacancies)
+                blocked += time.perf_counter() - started
+        finally:
+            self.__add_stats(stats, count, busy, blocked, idle)
+
+    def __store(self, records, totals: dict, stats: StageStats) -> None:
+        busy = idle = 0.0
+        batch = []
+
+        def commit(size: int) -> None:
+            chunk = batch[:size]
+            result = self.data_job.add_many(chunk)
+            totals["fetched"] += len(chunk)
+            for key in ("inserted", "updated", "skipped"):
+                totals[key] += result[key]
+            del batch[:size]
+
+        try:
+            while True:
+                started = time.perf_counter()
+                vacancies = records.get()
+                idle += time.perf_counter() - started
+                if vacancies is _DONE:
+                    break
+                if self.__stop.is_set():
+                    continue
+                batch.extend(vacancies)
+                started = time.perf_counter()
+                try:
+                    while len(batch) >= self.batch_size:
+                        commit(self.batch_size)
+                except Exception as error:
+                    self.__fail(error)
+                busy += time.perf_counter() - started
+
+            if batch and not self.__stop.is_set():
+                started = time.perf_counter()
+                try:
+                    commit(len(batch))
+                except Exception as error:
+                    self.__fail(error)
+                busy += time.perf_counter() - started
+        finally:
+            self.__add_stats(stats, totals["fetched"], busy, 0.0, idle)
+
+    def __start(self, target, workers: int, *args) -> list:
+        threads = [
+            threading.Thread(target=target, args=args, daemon=True)
+            for _ in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    @staticmethod
+    def __finish(inbox: queue.Queue, threads: list) -> None:
+        """
+        Передаёт каждому потоку стадии маркер завершения и дожидается их
+        """
+        for _ in threads:
+            inbox.put(_DONE)
+        for thread in threads:
+            thread.join()
+
+    def __fail(self, error: Exception) -> None:
+        with self.__lock:
+            if self.__error is None:
+                self.__error = error
+        self.__stop.set()
+
+    def __add_stats(self, stats: StageStats, items, busy, blocked, idle) -> None:
+        with self.__lock:
+            stats.items += items
+            stats.busy += busy
+            stats.blocked += blocked
+            stats.idle += idle
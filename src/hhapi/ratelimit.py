@@ -0,0 +1,233 @@
+import asyncio
+import json
+import threading
+import time
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+from metrics import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: общий бюджет между процессами недоступен
+    fcntl = None
+
+# Ключ общего бюджета, действующего на все запросы
+GLOBAL = "*"
+
+
+class RateLimiter:
+    """
+    Ограничитель частоты запросов к API по алгоритму ведра токенов (token bucket).
+    Действует общий бюджет rate запросов в секунду и, при необходимости,
+    отдельные бюджеты по префиксам пути (например, "/vacancies").
+    Запрос занимает токен из общего ведра и из ведра самого длинного
+    подходящего префикса; если токенов нет, вызывающий ждёт их пополнения.
+
+    Скорость подстраивается под ответы сервера (AIMD): после ответа 429 бюджет
+    уменьшается в decrease раз, а каждый успешный ответ увеличивает его
+    на increase запросов в секунду, но не выше заданного значения.
+
+    Ограничитель потокобезопасен, методы acquire_async и on_response_async
+    не блокируют цикл событий.
+    Если задан lock_file, состояние ведер хранится в файле под блокировкой fcntl,
+    и бюджет делят все процессы на одном хосте, использующие этот файл.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: Optional[float] = None,
+        budgets: Optional[dict] = None,
+        min_rate: float = 0.5,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        lock_file: Optional[str] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        :param rate: общий бюджет в запросах в секунду
+        :param burst: ёмкость общего ведра (допустимый всплеск), по умолчанию равна rate
+        :param budgets: бюджеты в запросах в секунду по префиксу пути
+        :param min_rate: нижняя граница бюджета при уменьшении после 429
+        :param increase: прибавка к бюджету после успешного ответа
+        :param decrease: множитель бюджета после ответа 429
+        :param lock_file: файл для общего между процессами состояния
+        :param sleep: функция ожидания, подменяется в тестах
+        """
+        if rate <= 0:
+            raise ValueError("Бюджет запросов должен быть положительным")
+        if lock_file is not None and fcntl is None:
+            raise RuntimeError("Общий между процессами бюджет требует модуль fcntl")
+
+        self.__limits = {GLOBAL: rate, **(budgets or {})}
+        self.__burst = burst
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.__lock_file = lock_file
+        self.__sleep = sleep
+        self.__lock = threading.Lock()
+        # Ключ бюджета -> {"rate", "tokens", "updated"}; время — time.time(),
+        # чтобы состояние в файле было сопоставимо между процессами
+        self.__buckets = {}
+
+    def rate(self, key: str = GLOBAL) -> float:
+        """
+        Текущий бюджет с учётом подстройки под ответы 429
+        """
+        return self.__update(lambda buckets, now: buckets[key]["rate"], [key])
+
+    def acquire(self, url: str = "") -> float:
+        """
+        Занимает токен для запроса url, при необходимости ожидая его появления.
+        :return: время ожидания в секундах
+        """
+        delay = self.__reserve(url)
+        if delay > 0:
+            self.__sleep(delay)
+        return delay
+
+    async def acquire_async(self, url: str = "") -> float:
+        """
+        Асинхронный вариант acquire: ожидание не блокирует цикл событий.
+        :return: время ожидания в секундах
+        """
+        if self.__lock_file is None:
+            delay = self.__reserve(url)
+        else:
+            # Блокировка файла может ждать другие процессы, поэтому берётся в потоке
+            loop = asyncio.get_running_loop()
+            delay = await loop.run_in_executor(None, self.__reserve, url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def on_response(
+        self, url: str, status: int, retry_after: Optional[float] = None
+    ) -> None:
+        """
+        Подстраивает бюджет под ответ сервера: после 429 уменьшает бюджет
+        и, если указан retry_after, приостанавливает запросы на это время,
+        после успешного ответа понемногу увеличивает бюджет.
+        """
+        keys = self.__keys(url)
+        if status == 429:
+            self.__update(
+                lambda buckets, now: self.__throttle(buckets, keys, retry_after),
+                keys,
+            )
+            metrics.inc("rate_limit_throttled_total", endpoint=keys[-1])
+        elif status < 400:
+            self.__update(lambda buckets, now: self.__recover(buckets, keys), keys)
+
+    async def on_response_async(
+        self, url: str, status: int, retry_after: Optional[float] = None
+    ) -> None:
+        """
+        Асинхронный вариант on_response: блокировка файла не блокирует цикл событий
+        """
+        if self.__lock_file is None:
+            self.on_response(url, status, retry_after)
+        else:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.on_response, url, status, retry_after)
+
+    def __reserve(self, url: str) -> float:
+        keys = self.__keys(url)
+        delay = self.__update(lambda buckets, now: self.__take(buckets, keys), keys)
+        if delay > 0:
+            metrics.observe("rate_limit_wait_seconds", delay, endpoint=keys[-1])
+        return delay
+
+    def __keys(self, url: str) -> list:
+        """
+        Ключи бюджетов для запроса: общий и самый длинный подходящий префикс пути
+        """
+        path = urlsplit(url).path
+        prefixes = [
+            key for key in self.__limits if key != GLOBAL and path.startswith(key)
+        ]
+        if not prefixes:
+            return [GLOBAL]
+        return [GLOBAL, max(prefixes, key=len)]
+
+    @staticmethod
+    def __take(buckets: dict, keys: list) -> float:
+        """
+        Резервирует по токену в каждом ведре. Количество токенов может стать
+        отрицательным: это очередь уже выданных резерваций, и ожидание равно
+        времени, за которое самое загруженное ведро вернётся к нулю.
+        """
+        delay = 0.0
+        for key in keys:
+            bucket = buckets[key]
+            bucket["tokens"] -= 1
+            if bucket["tokens"] < 0:
+                delay = max(delay, -bucket["tokens"] / bucket["rate"])
+        return delay
+
+    def __throttle(self, buckets, keys, retry_after) -> None:
+        for key in keys:
+            bucket = buckets[key]
+            bucket["rate"] = max(self.min_rate, bucket["rate"] * self.decrease)
+            # Запас токенов сгорает, а Retry-After откладывает следующие запросы
+            pause = -(retry_after or 0) * bucket["rate"]
+            bucket["tokens"] = min(bucket["tokens"], pause)
+
+    def __recover(self, buckets, keys) -> None:
+        for key in keys:
+            bucket = buckets[key]
+            bucket["rate"] = min(self.__limits[key], bucket["rate"] + self.increase)
+
+    def __update(self, action, keys: list):
+        """
+        Пополняет ведра keys по прошедшему времени и выполняет action(buckets, now)
+        под блокировкой потока и, если задан файл, под блокировкой файла
+        """
+        with self.__lock:
+            if self.__lock_file is None:
+                return self.__apply(self.__buckets, action, keys)
+            with open(self.__lock_file, "a+", encoding="utf-8") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    try:
+                        buckets = json.loads(f.read() or "{}")
+                    except json.JSONDecodeError:
+                        buckets = {}  # Повреждённое состояние начинается заново
+                    result = self.__apply(buckets, action, keys)
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(buckets))
+                    f.flush()
+                    return result
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def __capacity(self, key: str) -> float:
+        """
+        Ёмкость ведра: burst для общего бюджета, бюджет в секунду для префиксов
+        """
+        if key == GLOBAL and self.__burst is not None:
+            return self.__burst
+        return self.__limits[key]
+
+    def __apply(self, buckets: dict, action, keys: list):
+        now = time.time()
+        for key in keys:
+            limit = self.__limits[key]
+            capacity = max(1.0, self.__capacity(key))
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = {
+                    "rate": limit,
+                    "tokens": capacity,
+                    "updated": now,
+                }
+            elapsed = max(0.0, now - bucket["updated"])
+            bucket["tokens"] = min(
+                capacity, bucket["tokens"] + elapsed * bucket["rate"]
+            )
+            bucket["updated"] = now
+        return action(buckets, now)
@@ -0,0 +1,276 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+# Время жизни ответов по умолчанию в секундах по префиксу пути запроса.
+# В течение этого времени ответ отдаётся из кэша без обращения к API,
+# после — перепроверяется условным запросом (ETag / If-Modified-Since).
+DEFAULT_TTLS = {
+    "/dictionaries": 24 * 60 * 60,
+    "/vacancies": 60,
+}
+
+
+class CachedResponse:
+    """
+    Сохранённый ответ API: тело, заголовки для перепроверки и время последней проверки.
+    Разобранный JSON хранится вместе с телом, чтобы ответ 304 не требовал разбора.
+    """
+
+    __slots__ = ("body", "etag", "last_modified", "stored_at", "__data")
+
+    def __init__(
+        self,
+        body: bytes,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        stored_at: float,
+        data=None,
+    ):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+        self.__data = data
+
+    @property
+    def data(self):
+        """
+        Разобранный JSON ответа. Для записей, прочитанных с диска, разбирается
+        при первом обращении. Объект общий для всех получателей, изменять его нельзя.
+        """
+        if self.__data is None:
+            self.__data = json.loads(self.body)
+        return self.__data
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+    def validation_headers(self) -> dict:
+        """
+        Заголовки условного запроса для перепроверки ответа
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache(ABC):
+    """
+    Абстрактный кэш ответов API с временем жизни по префиксу пути запроса.
+    """
+
+    def __init__(self, ttls: Optional[dict] = None, default_ttl: float = 0):
+        """
+        :param ttls: время жизни в секундах по префиксу пути, по умолчанию DEFAULT_TTLS
+        :param default_ttl: время жизни для путей, не попавших ни под один префикс
+        """
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "evictions": 0}
+        self._lock = threading.Lock()
+
+    def ttl_for(self, url: str) -> float:
+        """
+        Возвращает время жизни ответа по самому длинному подходящему префиксу пути
+        """
+        path = urlsplit(url).path
+        matches = [prefix for prefix in self.ttls if path.startswith(prefix)]
+        if not matches:
+            return self.default_ttl
+        return self.ttls[max(matches, key=len)]
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Возвращает сохранённый ответ по ключу (полному URL запроса) или None
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, entry: CachedResponse) -> None:
+        """
+        Сохраняет ответ по ключу, вытесняя давно не использованные записи при переполнении
+        """
+        pass
+
+
+class MemoryResponseCache(ResponseCache):
+    """
+    Кэш ответов в памяти с вытеснением давно не использованных записей (LRU)
+    по количеству записей и суммарному размеру тел ответов.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttls: Optional[dict] = None,
+        default_ttl: float = 0,
+    ):
+        super().__init__(ttls, default_ttl)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.__entries = OrderedDict()
+        self.__size = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                self.__entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            previous = self.__entries.pop(key, None)
+            if previous is not None:
+                self.__size -= previous.size
+            if entry.size > self.max_bytes:
+                return
+            self.__entries[key] = entry
+            self.__size += entry.size
+            while (
+                len(self.__entries) > self.max_entries or self.__size > self.max_bytes
+            ):
+                _, evicted = self.__entries.popitem(last=False)
+                self.__size -= evicted.size
+                self.stats["evictions"] += 1
+
+
+class DiskResponseCache(ResponseCache):
+    """
+    Кэш ответов на диске: каждая запись — отдельный файл, в первой строке которого
+    хранятся метаданные, а дальше — тело ответа как есть.
+    Время последнего использования записи отражается во времени изменения файла,
+    при превышении max_bytes удаляются давно не использованные файлы.
+    """
+
+    def __init__(
+        self,
+        directory: str = "../../data/http_cache",
+        max_bytes: int = 256 * 1024 * 1024,
+        ttls: Optional[dict] = None,
+        default_ttl: float = 0,
+    ):
+        super().__init__(ttls, default_ttl)
+        self.__directory = Path(directory)
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.__size = sum(path.stat().st_size for path in self.__files())
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        path = self.__path(key)
+        try:
+            with open(path, "rb") as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+            if meta["key"] != key:
+                return None
+            os.utime(path)  # Отмечаем использование записи для LRU
+            return CachedResponse(
+                body, meta["etag"], meta["last_modified"], meta["stored_at"]
+            )
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError):
+            # Повреждённая запись считается отсутствующей
+            return None
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        meta = {
+            "key": key,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "stored_at": entry.stored_at,
+        }
+        header = json.dumps(meta, ensure_ascii=False).encode("utf-8") + b"\n"
+        path = self.__path(key)
+
+        fd, temp_path = tempfile.mkstemp(dir=self.__directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                f.write(entry.body)
+            with self._lock:
+                self.__size -= self.__file_size(path)
+                os.replace(temp_path, path)
+                self.__size += len(header) + entry.size
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+        if self.__size > self.max_bytes:
+            self.__evict()
+
+    def __evict(self) -> None:
+        with self._lock:
+            files = sorted(self.__files(), key=lambda path: path.stat().st_mtime)
+            for path in files:
+                if self.__size <= self.max_bytes:
+                    break
+                self.__size -= self.__file_size(path)
+                path.unlink(missing_ok=True)
+                self.stats["evictions"] += 1
+
+    def __files(self):
+        return self.__directory.glob("*.cache")
+
+    def __path(self, key: str) -> Path:
+        return self.__directory / f"{hashlib.sha256(key.encode()).hexdigest()}.cache"
+
+    @staticmethod
+    def __file_size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+
+class TieredResponseCache(ResponseCache):
+    """
+    Двухуровневый кэш: быстрый кэш в памяти перед кэшем на диске.
+    Записи, найденные на диске, поднимаются в память.
+    """
+
+    def __init__(
+        self,
+        memory: Optional[MemoryResponseCache] = None,
+        disk: Optional[DiskResponseCache] = None,
+        ttls: Optional[dict] = None,
+        default_ttl: float = 0,
+    ):
+        super().__init__(ttls, default_ttl)
+        self.memory = memory or MemoryResponseCache()
+        self.disk = disk or DiskResponseCache()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self.memory.get(key)
+        if entry is None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self.memory.set(key, entry)
+        return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        self.memory.set(key, entry)
+        self.disk.set(key, entry)
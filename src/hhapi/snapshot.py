@@ -0,0 +1,279 @@
+import math
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from typing import Callable, Iterable, Iterator, Optional
+
+from datajob import matches_criteria
+from vacancycollection import MISSING_EPOCH, to_epoch
+from vacancyhh import VacancyHH
+
+MAGIC = b"HHSNAP\x00\x01"
+VERSION = 1
+
+# Заголовок: сигнатура, версия, количество вакансий, количество вакансий с зарплатой
+HEADER = struct.Struct("<8sIII")
+# Запись вакансии фиксированной длины: зарплата (NaN — не указана), дата публикации
+# в секундах epoch, флаги и (смещение, длина) строк id, url, name, employer,
+# published_at в области строк
+RECORD = struct.Struct("<dqI" + "QI" * 5)
+RECORD_PREFIX = struct.Struct("<dq")  # Зарплата и дата публикации в начале записи
+STRING_REF = struct.Struct("<QI")  # Ссылка на строку id сразу после флагов
+ID_REF_OFFSET = struct.calcsize("<dqI")
+POSITION = struct.Struct("<I")
+
+STRING_FIELDS = ("id", "url", "name", "employer", "published_at")
+NULL_LENGTH = 0xFFFFFFFF  # Длина строки None
+SALARY_INT = 1  # Зарплата сохранена целым числом
+
+
+class VacancySnapshot:
+    """
+    Неизменяемый снимок хранилища вакансий в двоичном формате для отчётов.
+    Файл состоит из заголовка, записей фиксированной длины в порядке хранилища,
+    индекса номеров записей, упорядоченного по id, перестановки записей по убыванию
+    зарплаты (вакансии без зарплаты — в конце в порядке хранилища) и области строк.
+    Файл отображается в память (mmap), поэтому открытие не читает данные,
+    а поиск по id, выборка по диапазону зарплат и топ по зарплате читают
+    только нужные страницы файла.
+
+    Пример:
+        VacancySnapshot.write(data_job.iter_vacancies(), "../../data/vacancies.snap")
+        with VacancySnapshot("../../data/vacancies.snap") as snapshot:
+            print(snapshot.get("123"), snapshot.top_by_salary(10))
+    """
+
+    def __init__(self, file_path: str):
+        """
+        :param file_path: путь к файлу снимка, созданному VacancySnapshot.write
+        :raise ValueError: если файл не является снимком поддерживаемой версии
+        """
+        with open(file_path, "rb") as f:
+            self.__mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, count, salaried = HEADER.unpack_from(self.__mm, 0)
+        except struct.error:
+            magic, version = None, None
+        if magic != MAGIC or version != VERSION:
+            self.__mm.close()
+            raise ValueError(f"Файл не является снимком вакансий: {file_path}")
+
+        self.__count = count
+        self.__salaried = salaried
+        self.__records = HEADER.size
+        self.__id_index = self.__records + count * RECORD.size
+        self.__salary_order = self.__id_index + count * POSITION.size
+        self.__strings = self.__salary_order + count * POSITION.size
+
+    @classmethod
+    def write(cls, vacancies: Iterable[VacancyHH], file_path: str) -> int:
+        """
+        Записывает вакансии в файл снимка. Строки пишутся во временный файл
+        по мере чтения вакансий, в памяти остаются только записи фиксированной
+        длины, id и зарплаты. Готовый снимок подменяет прежний файл целиком.
+        :param vacancies: вакансии, например DataJob.iter_vacancies()
+        :param file_path: путь к файлу снимка
+        :return: количество записанных вакансий
+        """
+        records = bytearray()
+        ids = []
+        salaries = []
+        directory = os.path.dirname(os.path.abspath(file_path))
+
+        with tempfile.TemporaryFile(dir=directory) as strings:
+            offset = 0
+            for vacancy in vacancies:
+                refs = []
+                for field in STRING_FIELDS:
+                    value = getattr(vacancy, field)
+                    if value is None:
+                        refs += (0, NULL_LENGTH)
+                        continue
+                    data = str(value).encode("utf-8")
+                    strings.write(data)
+                    refs += (offset, len(data))
+                    offset += len(data)
+
+                salary = vacancy.salary
+                flags = SALARY_INT if isinstance(salary, int) else 0
+                records += RECORD.pack(
+                    math.nan if salary is None else float(salary),
+                    to_epoch(vacancy.published_at),
+                    flags,
+                    *refs,
+                )
+                ids.append(str(vacancy.id))
+                salaries.append(salary)
+
+            count = len(ids)
+            id_index = sorted(range(count), key=ids.__getitem__)
+            # Устойчивая сортировка сохраняет порядок хранилища при равных зарплатах
+            salaried = [i for i in range(count) if salaries[i] is not None]
+            salary_order = sorted(salaried, key=lambda i: -salaries[i])
+            salary_order += [i for i in range(count) if salaries[i] is None]
+
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as out:
+                    out.write(HEADER.pack(MAGIC, VERSION, count, len(salaried)))
+                    out.write(records)
+                    out.write(struct.pack(f"<{count}I", *id_index))
+                    out.write(struct.pack(f"<{count}I", *salary_order))
+                    strings.seek(0)
+                    shutil.copyfileobj(strings, out)
+                os.replace(temp_path, file_path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
+                raise
+        return count
+
+    def __len__(self):
+        return self.__count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        self.__mm.close()
+
+    def get(self, vacancy_id: str) -> Optional[VacancyHH]:
+        """
+        Находит вакансию по id двоичным поиском по индексу id
+        :return: вакансия или None, если не найдена
+        """
+        vacancy_id = str(vacancy_id)
+        position = self.__bisect(
+            0, self.__count, lambda pos: self.__id_at(pos) >= vacancy_id
+        )
+        if position == self.__count or self.__id_at(position) != vacancy_id:
+            return None
+        return self.__vacancy(self.__index_at(self.__id_index, position))
+
+    def salary_range(
+        self, min_salary: Optional[float] = None, max_salary: Optional[float] = None
+    ) -> Iterator[VacancyHH]:
+        """
+        Возвращает вакансии с зарплатой в диапазоне [min_salary, max_salary]
+        по убыванию зарплаты. Вакансии без зарплаты в результат не попадают.
+        """
+        start = 0
+        if max_salary is not None:
+            start = self.__bisect(
+                0, self.__salaried, lambda pos: self.__salary_at(pos) <= max_salary
+            )
+        end = self.__salaried
+        if min_salary is not None:
+            end = self.__bisect(
+                start, self.__salaried, lambda pos: self.__salary_at(pos) < min_salary
+            )
+        for position in range(start, end):
+            yield self.__vacancy(self.__index_at(self.__salary_order, position))
+
+    def top_by_salary(self, n: int, **criteria) -> list:
+        """
+        Возвращает n вакансий с наибольшей зарплатой по указанным критериям.
+        Вакансии без зарплаты идут в конце списка. Записи читаются в порядке
+        перестановки по зарплате до набора n подходящих вакансий.
+        """
+        result = []
+        for position in range(self.__count):
+            if len(result) >= n:
+                break
+            record = self.__record(self.__index_at(self.__salary_order, position))
+            if matches_criteria(record, criteria):
+                result.append(record)
+        return list(VacancyHH.from_storage_records(result))
+
+    def published_between(
+        self, start: Optional[int] = None, end: Optional[int] = None
+    ) -> Iterator[VacancyHH]:
+        """
+        Возвращает вакансии, опубликованные в диапазоне [start, end] секунд epoch,
+        в порядке хранилища. Проверяются только записи фиксированной длины,
+        строки читаются для подходящих вакансий.
+        """
+        start = MISSING_EPOCH + 1 if start is None else start
+        end = 2**63 - 1 if end is None else end
+        for index in range(self.__count):
+            _, epoch = RECORD_PREFIX.unpack_from(
+                self.__mm, self.__records + index * RECORD.size
+            )
+            if start <= epoch <= end:
+                yield self.__vacancy(index)
+
+    def get_vacancies(self, **criteria):
+        return list(self.iter_vacancies(**criteria))
+
+    def iter_vacancies(self, **criteria) -> Iterator[VacancyHH]:
+        """
+        Возвращает подходящие под критерии вакансии по одной в порядке хранилища
+        """
+        return VacancyHH.from_storage_records(
+            record
+            for record in map(self.__record, range(self.__count))
+            if matches_criteria(record, criteria)
+        )
+
+    def __record(self, index: int) -> dict:
+        """
+        Читает запись с номером index в словарь внутреннего формата (to_dict)
+        """
+        salary, _, flags, *refs = RECORD.unpack_from(
+            self.__mm, self.__records + index * RECORD.size
+        )
+        record = {
+            field: self.__string(refs[2 * i], refs[2 * i + 1])
+            for i, field in enumerate(STRING_FIELDS)
+        }
+        if salary != salary:
+            record["salary"] = None
+        else:
+            record["salary"] = int(salary) if flags & SALARY_INT else salary
+        return record
+
+    def __vacancy(self, index: int) -> VacancyHH:
+        return next(VacancyHH.from_storage_records([self.__record(index)]))
+
+    def __string(self, offset: int, length: int) -> Optional[str]:
+        if length == NULL_LENGTH:
+            return None
+        start = self.__strings + offset
+        end = start + length
+        return self.__mm[start:end].decode("utf-8")
+
+    def __index_at(self, area: int, position: int) -> int:
+        return POSITION.unpack_from(self.__mm, area + position * POSITION.size)[0]
+
+    def __id_at(self, position: int) -> str:
+        index = self.__index_at(self.__id_index, position)
+        offset, length = STRING_REF.unpack_from(
+            self.__mm, self.__records + index * RECORD.size + ID_REF_OFFSET
+        )
+        return self.__string(offset, length)
+
+    def __salary_at(self, position: int) -> float:
+        index = self.__index_at(self.__salary_order, position)
+        salary, _ = RECORD_PREFIX.unpack_from(
+            self.__mm, self.__records + index * RECORD.size
+        )
+        return salary
+
+    @staticmethod
+    def __bisect(lo: int, hi: int, predicate: Callable[[int], bool]) -> int:
+        """
+        Возвращает первую позицию в [lo, hi), для которой predicate истинен,
+        если predicate монотонен (ложен, затем истинен), иначе hi
+        """
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if predicate(mid):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
@@ -0,0 +1,131 @@
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+from apijobhh import APIJobHH
+from datajob import DataJob
+from vacancycollection import MISSING_EPOCH, to_epoch
+from vacancyhh import VacancyHH
+
+# Окно дат первой синхронизации, если выдача не помещается в pages_count страниц
+# или в ограничение hh.ru на глубину выдачи
+FIRST_SYNC_WINDOW = timedelta(days=30)
+
+
+class SyncState:
+    """
+    Хранит для каждого поискового запроса отметку синхронизации (watermark) —
+    дату публикации самой новой загруженной вакансии.
+    """
+
+    def __init__(self, file_path: str = "../../data/sync_state.json"):
+        """
+        :param file_path: путь к JSON-файлу с отметками синхронизации
+        """
+        self.__file_path = Path(file_path)
+
+    @staticmethod
+    def query_key(keyword: str) -> str:
+        """
+        Нормализует поисковый запрос, чтобы "Python" и " python " считались одним запросом
+        """
+        return " ".join(keyword.casefold().split())
+
+    def get_watermark(self, keyword: str) -> Optional[str]:
+        """
+        Возвращает дату публикации самой новой загруженной вакансии по запросу или None
+        """
+        return self.__load().get(self.query_key(keyword))
+
+    def set_watermark(self, keyword: str, published_at: str) -> None:
+        state = self.__load()
+        state[self.query_key(keyword)] = published_at
+        self.__file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.__file_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=4)
+
+    def __load(self) -> dict:
+        try:
+            with open(self.__file_path, "r", encoding="utf-8") as f:
+                return json.load(f) or {}
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError:
+            return {}
+
+
+def newest_published_at(vacancies) -> Optional[str]:
+    """
+    Возвращает самую позднюю дату публикации среди вакансий VacancyHH или None
+    """
+    newest, newest_epoch = None, MISSING_EPOCH
+    for vacancy in vacancies:
+        epoch = to_epoch(vacancy.published_at)
+        if epoch > newest_epoch:
+            newest, newest_epoch = vacancy.published_at, epoch
+    return newest
+
+
+def sync_vacancies(
+    api: APIJobHH,
+    data_job: DataJob,
+    keyword: str,
+    state: SyncState,
+    pages_count: int = 20,
+    max_workers: int = 1,
+    first_window: timedelta = FIRST_SYNC_WINDOW,
+) -> dict:
+    """
+    Инкрементально синхронизирует хранилище с hh.ru по поисковому запросу.
+    Если для запроса есть отметка синхронизации, запрашиваются только вакансии,
+    опубликованные начиная с неё (параметр date_from), иначе — вся выдача.
+    Если выдача не поместилась в pages_count страниц или в ограничение глубины
+    выдачи, через harvest_vacancies целиком выгружается окно дат до текущего
+    момента: от отметки или, при первой синхронизации, за последние first_window.
+    Загруженные вакансии объединяются с хранилищем по id. Отметка сдвигается
+    на самую новую дату публикации, только если выдача загружена полностью:
+    иначе пропущенные вакансии оказались бы старше отметки и больше не загружались.
+    :param api: клиент API hh.ru
+    :param data_job: хранилище вакансий
+    :param keyword: поисковый запрос
+    :param state: хранилище отметок синхронизации
+    :param pages_count: максимальное количество страниц выдачи
+    :param max_workers: количество потоков для загрузки страниц
+    :param first_window: окно дат первой синхронизации, не поместившейся в выдачу
+    :return: статистика: fetched, inserted, updated, skipped, новая отметка watermark
+    и truncated — выдача загружена не полностью, отметка не сдвинута
+    """
+    watermark = state.get_watermark(keyword)
+    items = api.search_vacancies(
+        keyword, pages_count, max_workers=max_workers, date_from=watermark
+    )
+    truncated = api.search_stats["truncated"]
+    if truncated:
+        if watermark is not None:
+            date_from = datetime.fromisoformat(watermark)
+        else:
+            date_from = datetime.now(timezone.utc) - first_window
+        items = api.harvest_vacancies(
+            keyword, date_from=date_from, max_workers=max_workers
+        )
+        truncated = api.harvest_stats["truncated"] > 0
+
+    vacancies = list(VacancyHH.from_api_items(items, api.currency_rates))
+    stats = data_job.add_many(vacancies)
+
+    newest = newest_published_at(vacancies)
+    if (
+        not truncated
+        and newest is not None
+        and (watermark is None or to_epoch(newest) > to_epoch(watermark))
+    ):
+        state.set_watermark(keyword, newest)
+        watermark = newest
+
+    return {
+        "fetched": len(items),
+        **stats,
+        "watermark": watermark,
+        "truncated": truncated,
+    }
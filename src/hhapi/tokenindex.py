@@ -0,0 +1,149 @@
+import re
+from bisect import bisect_left
+from typing import Callable, Iterable, Optional
+
+TOKEN_PATTERN = re.compile(r"\w+")
+DEFAULT_FIELDS = ("name", "employer")  # Поля, по которым по умолчанию ищутся слова
+
+
+def tokenize(text) -> list:
+    """
+    Разбивает текст на слова в нижнем регистре (casefold) для поиска без учёта регистра
+    """
+    if text is None:
+        return []
+    return TOKEN_PATTERN.findall(str(text).casefold())
+
+
+def keyword_matcher(
+    keyword: str, prefix: bool = False, fields: Iterable[str] = DEFAULT_FIELDS
+) -> Callable[[dict], bool]:
+    """
+    Возвращает проверку словаря вакансии на те же условия, что и TokenIndex.search,
+    для поиска перебором без построения индекса. Поле сначала проверяется
+    на вхождение слова запроса как подстроки, и только при вхождении —
+    регулярным выражением с границами слова.
+    :param keyword: строка запроса, регистр не учитывается
+    :param prefix: если True, слово запроса может быть началом слова вакансии
+    :param fields: поля для поиска
+    """
+    end = "" if prefix else r"(?!\w)"
+    patterns = [
+        (word, re.compile(r"(?<!\w)" + re.escape(word) + end).search)
+        for word in set(tokenize(keyword))
+    ]
+    fields = tuple(fields)
+
+    if len(patterns) == 1:
+        # Запрос из одного слова: каждое поле приводится к нижнему регистру
+        # только до первого совпадения
+        ((word, search),) = patterns
+
+        def matches(vacancy: dict) -> bool:
+            for field in fields:
+                value = vacancy.get(field)
+                if value is not None:
+                    text = str(value).casefold()
+                    if word in text and search(text):
+                        return True
+            return False
+
+        return matches
+
+    def matches(vacancy: dict) -> bool:
+        texts = [
+            str(value).casefold()
+            for value in map(vacancy.get, fields)
+            if value is not None
+        ]
+        for word, search in patterns:
+            if not any(word in text and search(text) for text in texts):
+                return False
+        return True
+
+    return matches
+
+
+class TokenIndex:
+    """
+    Инвертированный индекс слов по полям вакансий: поле -> слово -> множество id.
+    Поддерживает поиск по точному совпадению слов и по префиксам слов.
+    """
+
+    def __init__(self, fields: Iterable[str] = DEFAULT_FIELDS):
+        self.fields = tuple(fields)
+        self.__postings = {field: {} for field in self.fields}
+        # Отсортированные слова поля для поиска по префиксу, строятся при первом поиске
+        self.__sorted_tokens = {field: None for field in self.fields}
+        self.__tokens_of = {}  # id -> [(поле, слово), ...] для удаления из индекса
+
+    def __len__(self):
+        return len(self.__tokens_of)
+
+    def add(self, vacancy_id: str, vacancy: dict) -> None:
+        """
+        Добавляет вакансию в индекс, заменяя ранее проиндексированные данные с тем же id
+        """
+        self.remove(vacancy_id)
+        entries = []
+        for field in self.fields:
+            postings = self.__postings[field]
+            for token in set(tokenize(vacancy.get(field))):
+                ids = postings.get(token)
+                if ids is None:
+                    postings[token] = ids = set()
+                    self.__sorted_tokens[field] = None
+                ids.add(vacancy_id)
+                entries.append((field, token))
+        self.__tokens_of[vacancy_id] = entries
+
+    def remove(self, vacancy_id: str) -> None:
+        """
+        Удаляет вакансию из индекса, если она была проиндексирована
+        """
+        for field, token in self.__tokens_of.pop(vacancy_id, ()):
+            ids = self.__postings[field][token]
+            ids.discard(vacancy_id)
+            if not ids:
+                del self.__postings[field][token]
+                self.__sorted_tokens[field] = None
+
+    def search(
+        self, keyword: str, prefix: bool = False, fields: Optional[Iterable[str]] = None
+    ) -> set:
+        """
+        Возвращает id вакансий, содержащих все слова запроса хотя бы в одном из полей.
+        :param keyword: строка запроса, регистр не учитывается
+        :param prefix: если True, слово запроса может быть началом слова вакансии
+        :param fields: поля для поиска, по умолчанию все проиндексированные поля
+        """
+        fields = self.fields if fields is None else tuple(fields)
+        unknown = set(fields) - set(self.fields)
+        if unknown:
+            raise ValueError(f"Поля не проиндексированы: {', '.join(sorted(unknown))}")
+
+        result = None
+        for word in set(tokenize(keyword)):
+            ids = set()
+            for field in fields:
+                ids |= self.__lookup(field, word, prefix)
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+        return set(self.__tokens_of) if result is None else result
+
+    def __lookup(self, field: str, word: str, prefix: bool) -> set:
+        postings = self.__postings[field]
+        if not prefix:
+            return postings.get(word, set())
+
+        tokens = self.__sorted_tokens[field]
+        if tokens is None:
+            tokens = self.__sorted_tokens[field] = sorted(postings)
+
+        ids = set()
+        position = bisect_left(tokens, word)
+        while position < len(tokens) and tokens[position].startswith(word):
+            ids |= postings[tokens[position]]
+            position += 1
+        return ids
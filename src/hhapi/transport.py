@@ -0,0 +1,269 @@
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+import requests
+from metrics import metrics
+from ratelimit import RateLimiter
+from requests.adapters import HTTPAdapter
+from responsecache import CachedResponse, ResponseCache
+
+
+def endpoint_of(url: str) -> str:
+    """
+    Путь запроса для меток метрик: числовые идентификаторы заменяются на {id},
+    чтобы запросы отдельных вакансий попадали в одну серию
+    """
+    return re.sub(r"/\d+(?=/|$)", "/{id}", urlsplit(url).path) or "/"
+
+
+def backoff_delay(attempt: int, backoff_factor: float, backoff_max: float) -> float:
+    """
+    Экспоненциальная задержка перед повтором с полным разбросом (full jitter)
+    """
+    delay = min(backoff_max, backoff_factor * 2**attempt)
+    return random.uniform(0, delay)
+
+
+def parse_retry_after(value: Optional[str], backoff_max: float) -> Optional[float]:
+    """
+    Разбирает заголовок Retry-After, заданный в секундах или в виде HTTP-даты
+    """
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(backoff_max, max(0.0, delay))
+
+
+class HHTransport:
+    """
+    Транспортный слой для запросов к API hh.ru.
+    Использует общую сессию requests с пулом соединений (keep-alive),
+    повторяет запросы при ошибках сети, ответах 429 и 5xx
+    с экспоненциальной задержкой и случайным разбросом (jitter),
+    учитывает заголовок Retry-After и ведёт счётчики запросов, повторов и ошибок.
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 30.0,
+        headers: Optional[dict] = None,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        :param pool_size: максимальное количество соединений в пуле на один хост
+        :param timeout: таймаут запроса в секундах
+        :param max_retries: количество повторов после первой неудачной попытки
+        :param backoff_factor: базовая задержка перед повтором в секундах,
+        перед n-м повтором ожидание составляет backoff_factor * 2 ** (n - 1) с разбросом
+        :param backoff_max: максимальная задержка перед повтором в секундах
+        :param headers: заголовки, отправляемые с каждым запросом
+        :param cache: кэш ответов для get_json или None, чтобы не кэшировать
+        :param rate_limiter: ограничитель частоты запросов или None, чтобы не ограничивать
+        :param sleep: функция ожидания, подменяется в тестах
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.__sleep = sleep
+        self.__lock = threading.Lock()
+        self.__stats = {"requests": 0, "retries": 0, "failures": 0}
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+    @property
+    def stats(self) -> dict:
+        """
+        Возвращает копию счётчиков: количество запросов, повторов и неудачных запросов
+        """
+        with self.__lock:
+            return dict(self.__stats)
+
+    def reset_stats(self) -> None:
+        """
+        Обнуляет счётчики запросов, повторов и ошибок
+        """
+        with self.__lock:
+            for key in self.__stats:
+                self.__stats[key] = 0
+
+    def get(
+        self, url: str, params: Optional[dict] = None, headers: Optional[dict] = None
+    ) -> requests.Response:
+        """
+        Выполняет GET-запрос с повторами.
+        Если после всех повторов сервер продолжает возвращать 429 или 5xx,
+        возвращается последний полученный ответ.
+        :raise ConnectionError: если после всех повторов не удалось соединиться с сервером
+        """
+        endpoint = endpoint_of(url) if metrics.enabled else None
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(url)
+            self.__count("requests")
+            start = time.perf_counter()
+            try:
+                response = self.session.get(
+                    url, params=params, headers=headers, timeout=self.timeout
+                )
+            except (requests.ConnectionError, requests.Timeout) as error:
+                if endpoint:
+                    self.__record(endpoint, "error", start)
+                if attempt >= self.max_retries:
+                    self.__count("failures")
+                    if endpoint:
+                        metrics.inc("http_failures_total", endpoint=endpoint)
+                    raise ConnectionError(f"Ошибка соединения: {error}") from error
+                delay = self.__backoff(attempt)
+            else:
+                if endpoint:
+                    self.__record(endpoint, response.status_code, start)
+                throttled = response.status_code == 429
+                retry_after = self.__retry_after(response) if throttled else None
+                if self.rate_limiter is not None:
+                    self.rate_limiter.on_response(
+                        url, response.status_code, retry_after
+                    )
+                if response.status_code not in self.RETRY_STATUSES:
+                    return response
+                if attempt >= self.max_retries:
+                    self.__count("failures")
+                    if endpoint:
+                        metrics.inc("http_failures_total", endpoint=endpoint)
+                    return response
+                if throttled and self.rate_limiter is not None:
+                    # Паузу перед повтором выдерживает ограничитель в acquire
+                    delay = 0.0
+                else:
+                    delay = self.__retry_after(response)
+                    if delay is None:
+                        delay = self.__backoff(attempt)
+                response.close()
+
+            attempt += 1
+            self.__count("retries")
+            if endpoint:
+                metrics.inc("http_retries_total", endpoint=endpoint)
+            self.__sleep(delay)
+
+    def get_json(self, url: str, params: Optional[dict] = None):
+        """
+        Выполняет GET-запрос и возвращает разобранный JSON ответа.
+        Если задан кэш, свежий ответ возвращается без запроса, а устаревший
+        перепроверяется условным запросом: при ответе 304 используется
+        уже разобранный JSON из кэша. Возвращаемый из кэша объект общий,
+        изменять его нельзя.
+        :raise ConnectionError: если сервер не вернул статус 200
+        """
+        if self.cache is None:
+            response = self.get(url, params=params)
+            if response.status_code != 200:
+                raise ConnectionError(
+                    f"Ошибка получения данных: {response.status_code}"
+                )
+            return self.__parse(url, response)
+
+        key = requests.Request("GET", url, params=params).prepare().url
+        ttl = self.cache.ttl_for(url)
+        entry = self.cache.get(key)
+        now = time.time()
+        if entry is not None and now - entry.stored_at < ttl:
+            self.cache.count("hits")
+            metrics.inc("http_cache_total", result="hit")
+            return entry.data
+
+        headers = entry.validation_headers() if entry is not None else None
+        response = self.get(url, params=params, headers=headers)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.count("revalidated")
+            metrics.inc("http_cache_total", result="revalidated")
+            entry.stored_at = now
+            self.cache.set(key, entry)
+            return entry.data
+
+        if response.status_code != 200:
+            raise ConnectionError(f"Ошибка получения данных: {response.status_code}")
+
+        self.cache.count("misses")
+        metrics.inc("http_cache_total", result="miss")
+        data = self.__parse(url, response)
+        self.cache.set(
+            key,
+            CachedResponse(
+                response.content,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                now,
+                data,
+            ),
+        )
+        return data
+
+    def close(self) -> None:
+        """
+        Закрывает соединения пула
+        """
+        self.session.close()
+
+    def __count(self, key: str) -> None:
+        with self.__lock:
+            self.__stats[key] += 1
+
+    @staticmethod
+    def __record(endpoint: str, status, start: float) -> None:
+        """
+        Записывает в метрики попытку запроса и её длительность
+        """
+        metrics.observe(
+            "http_request_seconds", time.perf_counter() - start, endpoint=endpoint
+        )
+        metrics.inc("http_requests_total", endpoint=endpoint, status=str(status))
+
+    @staticmethod
+    def __parse(url: str, response: requests.Response):
+        """
+        Разбирает JSON ответа, при включённых метриках записывая размер тела
+        и время разбора
+        """
+        if not metrics.enabled:
+            return response.json()
+        endpoint = endpoint_of(url)
+        metrics.inc(
+            "http_response_bytes_total", len(response.content), endpoint=endpoint
+        )
+        with metrics.timer("json_parse_seconds", source="http"):
+            return response.json()
+
+    def __backoff(self, attempt: int) -> float:
+        return backoff_delay(attempt, self.backoff_factor, self.backoff_max)
+
+    def __retry_after(self, response: requests.Response) -> Optional[float]:
+        return parse_retry_after(response.headers.get("Retry-After"), self.backoff_max)
@@ -0,0 +1,220 @@
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Iterable, Optional, Sequence
+
+from vacancyhh import VacancyHH
+
+# Значение epoch для вакансий без даты публикации (минимальное int64)
+MISSING_EPOCH = -(2**63)
+
+
+def to_epoch(published_at) -> int:
+    """
+    Преобразует дату публикации hh.ru (ISO 8601, например 2024-12-01T10:00:00+0300)
+    в секунды epoch. Для отсутствующей или некорректной даты возвращает MISSING_EPOCH.
+    """
+    if not published_at:
+        return MISSING_EPOCH
+    try:
+        return int(datetime.fromisoformat(published_at).timestamp())
+    except (TypeError, ValueError):
+        return MISSING_EPOCH
+
+
+class VacancyCollection:
+    """
+    Колоночное представление набора вакансий для анализа зарплат.
+    Зарплаты хранятся в непрерывном массиве array("d") (NaN — зарплата не указана),
+    даты публикации — в массиве array("q") секунд epoch, id и названия — в
+    параллельных списках. Для фильтрации по диапазону, сортировки и перцентилей
+    один раз строится упорядоченный по зарплате индекс, после чего запросы
+    выполняются двоичным поиском без сравнения объектов VacancyHH.
+    """
+
+    def __init__(
+        self,
+        ids: Sequence[str],
+        names: Sequence[Optional[str]],
+        salaries: Iterable[float],
+        published_at: Iterable[int],
+    ):
+        self.ids = list(ids)
+        self.names = list(names)
+        self.salaries = array("d", salaries)
+        self.published_at = array("q", published_at)
+        lengths = {len(self.ids), len(self.names), len(self.salaries)}
+        if len(lengths | {len(self.published_at)}) > 1:
+            raise ValueError("Колонки коллекции должны быть одинаковой длины")
+        self.__order = None  # Позиции вакансий с зарплатой по возрастанию зарплаты
+        self.__sorted_salaries = None  # Зарплаты в порядке __order
+
+    @classmethod
+    def from_vacancies(cls, vacancies: Iterable[VacancyHH]) -> "VacancyCollection":
+        """
+        Строит коллекцию из объектов VacancyHH, например из DataJob.get_vacancies
+        или DataJob.iter_vacancies.
+        """
+        ids, names, salaries, published_at = [], [], array("d"), array("q")
+        for vacancy in vacancies:
+            ids.append(vacancy.id)
+            names.append(vacancy.name)
+            salaries.append(math.nan if vacancy.salary is None else vacancy.salary)
+            published_at.append(to_epoch(vacancy.published_at))
+        return cls(ids, names, salaries, published_at)
+
+    @classmethod
+    def from_api_items(
+        cls, items: Iterable[dict], currency_rates: Optional[dict] = None
+    ) -> "VacancyCollection":
+        """
+        Строит коллекцию из сырых вакансий hh.ru, например из результата
+        APIJobHH.search_vacancies. Зарплаты пересчитываются в рубли по currency_rates.
+        """
+        return cls.from_vacancies(VacancyHH.from_api_items(items, currency_rates))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def take(self, positions: Iterable[int]) -> "VacancyCollection":
+        """
+        Возвращает новую коллекцию из вакансий на указанных позициях в указанном порядке
+        """
+        positions = list(positions)
+        return VacancyCollection(
+            [self.ids[i] for i in positions],
+            [self.names[i] for i in positions],
+            array("d", [self.salaries[i] for i in positions]),
+            array("q", [self.published_at[i] for i in positions]),
+        )
+
+    @property
+    def salary_count(self) -> int:
+        """
+        Количество вакансий с указанной зарплатой
+        """
+        return len(self.__salary_index()[0])
+
+    def filter_salary(
+        self, min_salary: Optional[float] = None, max_salary: Optional[float] = None
+    ) -> "VacancyCollection":
+        """
+        Возвращает вакансии с зарплатой в диапазоне [min_salary, max_salary]
+        в исходном порядке. Вакансии без зарплаты в результат не попадают.
+        """
+        return self.take(sorted(self.__salary_range(min_salary, max_salary)))
+
+    def filter_published(
+        self, start: Optional[int] = None, end: Optional[int] = None
+    ) -> "VacancyCollection":
+        """
+        Возвращает вакансии, опубликованные в диапазоне [start, end] секунд epoch,
+        в исходном порядке. Вакансии без даты в результат не попадают.
+        """
+        start = MISSING_EPOCH + 1 if start is None else start
+        end = 2**63 - 1 if end is None else end
+        return self.take(
+            i for i, epoch in enumerate(self.published_at) if start <= epoch <= end
+        )
+
+    def sort_by_salary(self, descending: bool = True) -> "VacancyCollection":
+        """
+        Возвращает коллекцию, отсортированную по зарплате.
+        Вакансии без зарплаты идут в конце в исходном порядке.
+        """
+        order, _ = self.__salary_index()
+        if descending:
+            # Устойчивая сортировка сохраняет исходный порядок при равных зарплатах
+            order = sorted(order, key=lambda i: -self.salaries[i])
+        without_salary = [
+            i for i, salary in enumerate(self.salaries) if salary != salary
+        ]
+        return self.take(list(order) + without_salary)
+
+    def top_by_salary(self, n: int) -> "VacancyCollection":
+        """
+        Возвращает n вакансий с наибольшей зарплатой
+        """
+        order, values = self.__salary_index()
+        if n <= 0 or not values:
+            return self.take([])
+        n = min(n, len(values))
+
+        # Все вакансии с зарплатой выше пороговой попадают в результат,
+        # из вакансий с пороговой зарплатой берутся первые по порядку
+        threshold = values[len(values) - n]
+        first_tie = bisect_left(values, threshold)
+        above = bisect_right(values, threshold)
+        ties = order[first_tie:above]
+        selected = list(order[above:]) + list(ties[: n - (len(values) - above)])
+        return self.take(sorted(selected, key=lambda i: (-self.salaries[i], i)))
+
+    def mean_salary(self) -> float:
+        """
+        Средняя зарплата по вакансиям с указанной зарплатой или NaN
+        """
+        _, values = self.__salary_index()
+        return math.fsum(values) / len(values) if values else math.nan
+
+    def percentile(self, q: float) -> float:
+        """
+        Перцентиль зарплаты с линейной интерполяцией между соседними значениями
+        (как numpy.percentile по умолчанию). Вакансии без зарплаты не учитываются.
+        :param q: перцентиль от 0 до 100
+        :return: значение перцентиля или NaN, если зарплат нет
+        """
+        if not 0 <= q <= 100:
+            raise ValueError("Перцентиль должен быть в диапазоне от 0 до 100")
+        _, values = self.__salary_index()
+        if not values:
+            return math.nan
+        position = (len(values) - 1) * q / 100
+        lower = math.floor(position)
+        upper = min(lower + 1, len(values) - 1)
+        return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+    def histogram(self, bins: int = 10, salary_range: Optional[tuple] = None) -> tuple:
+        """
+        Гистограмма зарплат с равными интервалами.
+        Последний интервал включает правую границу, как в numpy.histogram.
+        :param bins: количество интервалов
+        :param salary_range: (минимум, максимум), по умолчанию — диапазон зарплат
+        :return: (количества по интервалам, границы интервалов)
+        """
+        if bins <= 0:
+            raise ValueError("Количество интервалов должно быть положительным")
+        _, values = self.__salary_index()
+        if salary_range is None:
+            salary_range = (values[0], values[-1]) if values else (0.0, 1.0)
+        low, high = salary_range
+        if low == high:
+            low, high = low - 0.5, high + 0.5
+        step = (high - low) / bins
+        edges = [low + step * i for i in range(bins)] + [high]
+
+        # Количество в интервале — разность позиций границ в отсортированных зарплатах
+        positions = [bisect_left(values, edge) for edge in edges[:-1]]
+        positions.append(bisect_right(values, edges[-1]))
+        counts = [positions[i + 1] - positions[i] for i in range(bins)]
+        return counts, edges
+
+    def __salary_range(self, min_salary, max_salary):
+        order, values = self.__salary_index()
+        start = 0 if min_salary is None else bisect_left(values, min_salary)
+        end = len(values) if max_salary is None else bisect_right(values, max_salary)
+        return order[start:end]
+
+    def __salary_index(self):
+        """
+        Строит при первом обращении позиции вакансий с зарплатой,
+        упорядоченные по зарплате (при равенстве — по позиции), и сами зарплаты.
+        """
+        if self.__order is None:
+            salaries = self.salaries
+            # NaN не равен сам себе, так отбрасываются вакансии без зарплаты
+            positions = [i for i, salary in enumerate(salaries) if salary == salary]
+            positions.sort(key=salaries.__getitem__)
+            self.__order = array("q", positions)
+            self.__sorted_salaries = array("d", [salaries[i] for i in positions])
+        return self.__order, self.__sorted_salaries
@@ -1,4 +1,7 @@
 from functools import total_ordering
+from typing import Iterable, Iterator
+
+from metrics import metrics
 
 
 @total_ordering
@@ -18,6 +21,9 @@ class VacancyHH:
         "salary",
     )
 
+    # Поля, сохраняемые в хранилище, в порядке to_dict
+    FIELDS = ("id", "url", "name", "employer", "published_at", "salary")
+
     def __init__(self, vacancy: dict, currency_rates_from_hh: dict = None):
 
         if not isinstance(vacancy, dict):
@@ -34,6 +40,100 @@ class VacancyHH:
         self.employer = self.__prepare_employer(vacancy)
         self.salary = self.__prepare_salary(vacancy, currency_rates_from_hh)
 
+    @classmethod
+    def from_api_items(
+        cls, items: Iterable[dict], currency_rates_from_hh: dict = None
+    ) -> Iterator["VacancyHH"]:
+        """
+        Пакетно создаёт объекты VacancyHH из вакансий в формате hh.ru.
+        Курсы валют связываются один раз на весь пакет. Как и конструктор,
+        принимает также работодателя строкой и зарплату числом (внутренний формат).
+        :param items: вакансии hh.ru, например результат APIJobHH.search_vacancies
+        :param currency_rates_from_hh: курсы валют hh.ru
+        :return: генератор объектов VacancyHH
+        """
+        vacancies = cls.__iter_api_items(items, currency_rates_from_hh)
+        if metrics.enabled:
+            return metrics.measure_iter(
+                vacancies,
+                "vacancy_build_seconds",
+                "vacancy_records_total",
+                source="api",
+            )
+        return vacancies
+
+    @classmethod
+    def __iter_api_items(
+        cls, items: Iterable[dict], currency_rates_from_hh: dict = None
+    ) -> Iterator["VacancyHH"]:
+        new = cls.__new__
+        rates_get = currency_rates_from_hh.get if currency_rates_from_hh else None
+
+        for item in items:
+            if not isinstance(item, dict):
+                raise ValueError("Ожидается словарь с данными вакансии.")
+            vacancy_id = item.get("id")
+            if not vacancy_id:
+                raise ValueError("Ожидается наличие id вакансии.")
+
+            vacancy = new(cls)
+            vacancy.id = vacancy_id
+            vacancy.url = item.get("url")
+            vacancy.name = item.get("name")
+            vacancy.published_at = item.get("published_at")
+            employer = item.get("employer")
+            if isinstance(employer, dict):
+                employer = employer.get("name")
+            vacancy.employer = employer
+
+            salary_data = item.get("salary")
+            if isinstance(salary_data, (int, float)):
+                vacancy.salary = salary_data
+            elif isinstance(salary_data, dict) and salary_data:
+                salary_from = salary_data.get("from") or 0
+                salary_to = salary_data.get("to") or 0
+                currency_code = salary_data.get("currency")
+                if currency_code and rates_get is not None:
+                    rate = rates_get(currency_code)
+                    if rate:
+                        salary_from /= rate
+                        salary_to /= rate
+                salary = max(salary_from, salary_to)
+                vacancy.salary = salary if salary > 0 else None
+            else:
+                vacancy.salary = None
+            yield vacancy
+
+    @classmethod
+    def from_storage_records(cls, records: Iterable[dict]) -> Iterator["VacancyHH"]:
+        """
+        Пакетно создаёт объекты VacancyHH из словарей внутреннего формата (to_dict),
+        сохранённых в хранилище. Данные считаются уже нормализованными и не проверяются.
+        :return: генератор объектов VacancyHH
+        """
+        vacancies = cls.__iter_storage_records(records)
+        if metrics.enabled:
+            return metrics.measure_iter(
+                vacancies,
+                "vacancy_build_seconds",
+                "vacancy_records_total",
+                source="storage",
+            )
+        return vacancies
+
+    @classmethod
+    def __iter_storage_records(cls, records: Iterable[dict]) -> Iterator["VacancyHH"]:
+        new = cls.__new__
+        for record in records:
+            vacancy = new(cls)
+            vacancy.id = record["id"]
+            vacancy.url = record.get("url")
+            vacancy.name = record.get("name")
+            vacancy.published_at = record.get("published_at")
+            vacancy.employer = record.get("employer")
+            vacancy.salary = record.get("salary")
+            yield vacancy
+
     @staticmethod
     def __prepare_employer(vacancy: dict):
         """
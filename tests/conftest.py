@@ -1,6 +1,9 @@
 import json
 
 import pytest
+from apijobhh import APIJobHH
+from apijobhhasync import APIJobHHAsync
+from hhstub import HHStubServer
 from vacancyhh import VacancyHH
 
 
@@ -67,3 +70,30 @@ def mock_vacancies_data():
             "url": "http://example.com",
         },
     }
+
+
+@pytest.fixture
+def stub_server():
+    """
+    Запускает сервер-имитацию hh.ru и направляет на него APIJobHH и APIJobHHAsync.
+    Возвращает функцию, принимающую параметры HHStubServer (found, interval и т. д.),
+    повторы запросов отключены
+    """
+    clients = (APIJobHH, APIJobHHAsync)
+    servers = []
+
+    def start(**options):
+        server = HHStubServer(**options).start()
+        servers.append(server)
+        for client in clients:
+            client.configure_base_url(server.url)
+        return server
+
+    for client in clients:
+        client.configure_transport(max_retries=0)
+    yield start
+    for client in clients:
+        client.configure_base_url(None)
+        client.configure_transport()
+    for server in servers:
+        server.stop()
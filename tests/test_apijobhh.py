@@ -1,7 +1,14 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch
+from urllib.parse import parse_qsl, urlsplit
 
+import pytest
 import responses
 from apijobhh import APIJobHH
+from detailcache import VacancyDetailsCache
+from responses import matchers
 
 
 @responses.activate
@@ -44,6 +51,41 @@ def test_search_vacancies(mock_vacancies):
     assert vacancies[1]["name"] == "Java Developer"
 
 
+def _add_pages(total_pages, registered_pages):
+    """
+    Регистрирует страницы выдачи, на каждой из которых одна вакансия с id, равным номеру страницы.
+    """
+    for page in range(registered_pages):
+        responses.add(
+            responses.GET,
+            "https://api.hh.ru/vacancies",
+            json={"items": [{"id": str(page)}], "pages": total_pages},
+            status=200,
+            match=[
+                matchers.query_param_matcher({"page": str(page)}, strict_match=False)
+            ],
+        )
+
+
+@responses.activate
+def test_search_vacancies_concurrent_keeps_page_order():
+    _add_pages(total_pages=5, registered_pages=5)
+
+    api_job_hh = APIJobHH()
+    vacancies = api_job_hh.search_vacancies("developer", pages_count=5, max_workers=4)
+    assert [vacancy["id"] for vacancy in vacancies] == ["0", "1", "2", "3", "4"]
+
+
+@responses.activate
+def test_search_vacancies_stops_at_total_pages():
+    _add_pages(total_pages=2, registered_pages=2)
+
+    api_job_hh = APIJobHH()
+    vacancies = api_job_hh.search_vacancies("developer", pages_count=10, max_workers=4)
+    assert [vacancy["id"] for vacancy in vacancies] == ["0", "1"]
+    assert len(responses.calls) == 2
+
+
 @responses.activate
 def test_get_vacancy_details(mock_vacancy_details):
     responses.add(
@@ -63,3 +105,114 @@ def test_currency_rates_property(mock_currency_rates):
     with patch.object(APIJobHH, "_APIJobHH__currency_rates", mock_currency_rates):
         api_job_hh = APIJobHH()
         assert api_job_hh.currency_rates == mock_currency_rates
+
+
+@responses.activate
+def test_search_vacancies_raises_on_failed_page():
+    responses.add(responses.GET, "https://api.hh.ru/vacancies", status=503)
+    APIJobHH.configure_transport(max_retries=0)
+    try:
+        api_job_hh = APIJobHH()
+        with pytest.raises(ConnectionError, match="503"):
+            api_job_hh.search_vacancies("developer")
+        assert APIJobHH.get_transport().stats["failures"] == 1
+    finally:
+        APIJobHH.configure_transport()
+
+
+@responses.activate
+def test_get_vacancy_details_many_uses_disk_cache(tmp_path):
+    for vacancy_id in ("1", "2", "3"):
+        responses.add(
+            responses.GET,
+            f"https://api.hh.ru/vacancies/{vacancy_id}",
+            json={"id": vacancy_id, "description": f"Описание {vacancy_id}"},
+            status=200,
+        )
+    cache = VacancyDetailsCache(str(tmp_path / "details"), ttl=60)
+    cache.set("2", {"id": "2", "description": "Из кэша"})
+
+    details = APIJobHH.get_vacancy_details_many(
+        ["3", "1", "2", "1"], max_workers=3, cache=cache
+    )
+    assert list(details) == ["3", "1", "2"]
+    assert details["2"]["description"] == "Из кэша"
+    assert len(responses.calls) == 2
+
+    # Повторное обогащение тех же вакансий не требует запросов к API
+    again = APIJobHH.get_vacancy_details_many(["1", "2", "3"], cache=cache)
+    assert again["1"]["description"] == "Описание 1"
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_currency_rates_are_lazy_and_persisted(tmp_path):
+    responses.add(
+        responses.GET,
+        "https://api.hh.ru/dictionaries",
+        json={"currency": [{"code": "USD", "rate": 0.011}]},
+        status=200,
+    )
+    rates_file = tmp_path / "currency_rates.json"
+    APIJobHH.configure_currency_rates(str(rates_file), ttl=60)
+    # patch.object восстанавливает курсы класса, даже если тест их заменил
+    with patch.object(APIJobHH, "_APIJobHH__currency_rates", {}):
+        try:
+            api_job_hh = APIJobHH()
+            assert len(responses.calls) == 0  # Создание экземпляра не обращается к API
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(
+                    executor.map(lambda _: api_job_hh.currency_rates, range(8))
+                )
+            assert all(rates == {"USD": 0.011} for rates in results)
+            assert len(responses.calls) == 1
+
+            # Тёплый старт: курсы берутся из файла без запроса к API
+            APIJobHH._APIJobHH__currency_rates = {}
+            assert APIJobHH.get_currency_rate("USD") == 0.011
+            assert len(responses.calls) == 1
+
+            APIJobHH.refresh_currency_rates()
+            assert len(responses.calls) == 2
+        finally:
+            APIJobHH.configure_currency_rates()
+
+
+@responses.activate
+def test_harvest_vacancies_partitions_by_date():
+    start = datetime(2024, 12, 1, tzinfo=timezone.utc)
+    published = [start + timedelta(hours=i) for i in range(240)]
+
+    def search(request):
+        params = dict(parse_qsl(urlsplit(request.url).query))
+        date_from = datetime.fromisoformat(params["date_from"])
+        date_to = datetime.fromisoformat(params["date_to"])
+        found = [
+            {"id": str(i), "published_at": moment.isoformat()}
+            for i, moment in enumerate(published)
+            if date_from <= moment <= date_to
+        ]
+        per_page = int(params["per_page"])
+        offset = int(params["page"]) * per_page
+        end = offset + per_page
+        body = {
+            "items": found[offset:end],
+            "found": len(found),
+            "pages": (len(found) + per_page - 1) // per_page,
+        }
+        return 200, {}, json.dumps(body)
+
+    responses.add_callback(responses.GET, "https://api.hh.ru/vacancies", search)
+
+    api_job_hh = APIJobHH()
+    vacancies = api_job_hh.harvest_vacancies(
+        "python",
+        date_from=start,
+        date_to=start + timedelta(days=10),
+        max_workers=4,
+        max_depth=200,
+    )
+    assert sorted(int(vacancy["id"]) for vacancy in vacancies) == list(range(240))
+    assert api_job_hh.harvest_stats["partitions"] == 2
+    assert api_job_hh.harvest_stats["truncated"] == 0
@@ -0,0 +1,160 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+from apijobhhasync import APIJobHHAsync
+from asynctransport import AsyncHHTransport
+
+
+def test_search_vacancies_yields_pages(stub_server):
+    stub_server(found=250)
+
+    async def run():
+        api = APIJobHHAsync()
+        pages = [page async for page in api.search_vacancies("python", 10)]
+        vacancies = await api.collect_vacancies("python", 10)
+        await APIJobHHAsync.close_transport()
+        return pages, vacancies
+
+    pages, vacancies = asyncio.run(run())
+    assert pages[0]["page"] == 0
+    assert sorted(page["page"] for page in pages) == [0, 1, 2]
+    assert len(vacancies) == 250
+    assert vacancies[0]["id"] == "1000000"
+    assert vacancies[-1]["id"] == "1000249"
+
+
+def test_concurrent_searches_share_pool(stub_server):
+    server = stub_server(found=300, latency=0.01)
+
+    async def run():
+        api = APIJobHHAsync()
+        results = await asyncio.gather(
+            *(api.collect_vacancies(f"python {i}", 3) for i in range(50))
+        )
+        await APIJobHHAsync.close_transport()
+        return results
+
+    results = asyncio.run(run())
+    assert all(len(vacancies) == 300 for vacancies in results)
+    assert server.stats["requests"] == 150
+    assert APIJobHHAsync.get_transport().stats["requests"] == 150
+
+
+def test_details_and_currency_rates(stub_server):
+    server = stub_server(found=10)
+
+    async def run():
+        details = await APIJobHHAsync.get_vacancy_details_many(
+            ["1000001", "1000002", "1000001"]
+        )
+        rates = await asyncio.gather(
+            *(APIJobHHAsync.get_currency_rate("USD") for _ in range(5))
+        )
+        await APIJobHHAsync.close_transport()
+        return details, rates
+
+    details, rates = asyncio.run(run())
+    assert list(details) == ["1000001", "1000002"]
+    assert "description" in details["1000002"]
+    assert rates == [0.011] * 5
+    # 2 запроса деталей и одна общая загрузка курсов
+    assert server.stats["requests"] == 3
+
+
+def test_failed_page_raises_connection_error(stub_server):
+    stub_server(found=10, error_rate=1.0)
+
+    async def run():
+        return [page async for page in APIJobHHAsync().search_vacancies("python")]
+
+    with pytest.raises(ConnectionError, match="503"):
+        asyncio.run(run())
+    assert APIJobHHAsync.get_transport().stats["failures"] == 1
+
+
+def test_transport_reads_chunked_gzip_response():
+    body = gzip.compress(json.dumps({"items": [{"id": "1"}]}).encode())
+    chunks = [body[:10], body[10:]]
+
+    async def handle(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Encoding: gzip\r\n"
+            b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n"
+        )
+        for chunk in chunks:
+            writer.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        writer.close()
+
+    async def run():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        transport = AsyncHHTransport(max_retries=0)
+        try:
+            return await transport.get_json(
+                f"http://127.0.0.1:{port}/vacancies", params={"text": "python"}
+            )
+        finally:
+            await transport.close()
+            server.close()
+            await server.wait_closed()
+
+    assert asyncio.run(run()) == {"items": [{"id": "1"}]}
+
+
+def test_transport_retries_malformed_response():
+    requests_seen = []
+
+    async def handle(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        requests_seen.append(1)
+        writer.write(b"garbage\r\n\r\n")
+        await writer.drain()
+        writer.close()
+
+    async def run():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        transport = AsyncHHTransport(max_retries=2, backoff_factor=0)
+        try:
+            with pytest.raises(ConnectionError):
+                await transport.get_json(f"http://127.0.0.1:{port}/vacancies")
+            return transport.stats
+        finally:
+            await transport.close()
+            server.close()
+            await server.wait_closed()
+
+    stats = asyncio.run(run())
+    assert len(requests_seen) == 3
+    assert stats == {"requests": 3, "retries": 2, "failures": 1}
+
+
+def test_transport_follows_redirects(stub_server):
+    server = stub_server(found=1)
+
+    async def handle(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(
+            f"HTTP/1.1 301 Moved Permanently\r\nLocation: {server.url}/dictionaries\r\n"
+            "Content-Length: 0\r\nConnection: close\r\n\r\n".encode()
+        )
+        await writer.drain()
+        writer.close()
+
+    async def run():
+        redirect = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = redirect.sockets[0].getsockname()[1]
+        transport = AsyncHHTransport(max_retries=0)
+        try:
+            return await transport.get_json(f"http://127.0.0.1:{port}/dictionaries")
+        finally:
+            await transport.close()
+            redirect.close()
+            await redirect.wait_closed()
+
+    assert "currency" in asyncio.run(run())
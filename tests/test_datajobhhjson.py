@@ -1,4 +1,5 @@
 import csv
+import gzip
 import json
 
 import pytest
@@ -118,3 +119,178 @@ def test_load_data_invalid_json(tmp_path):
     # Подавляем предупреждение о приватном методе
     data = job._DataJobHHJSON__load_data()  # type: ignore
     assert data == {}
+
+
+def test_add_many(temp_json_file, mock_vacancies_data):
+    with open(temp_json_file, "w", encoding="utf-8") as f:
+        json.dump({"1": mock_vacancies_data["1"]}, f)
+    job = DataJobHHJSON(file_path=str(temp_json_file))
+    job.add_many(
+        [
+            VacancyHH({"id": "1", "name": "Senior Python Developer"}),
+            VacancyHH(mock_vacancies_data["2"]),
+        ]
+    )
+    with open(temp_json_file, encoding="utf-8") as f:
+        data = json.load(f)
+    assert list(data) == ["1", "2"]
+    assert data["1"]["name"] == "Senior Python Developer"
+    assert data["2"]["salary"] == 120000
+
+
+def test_add_many_invalid_type(temp_json_file, mock_vacancy):
+    job = DataJobHHJSON(file_path=str(temp_json_file))
+    with pytest.raises(ValueError, match="Ожидается тип VacancyHH"):
+        job.add_many([mock_vacancy, {"id": "3"}])  # type: ignore
+    assert job.get_vacancies() == []
+
+
+def test_cache_skips_reread_until_file_changes(
+    temp_json_file, mock_vacancies_data, mocker
+):
+    with open(temp_json_file, "w", encoding="utf-8") as f:
+        json.dump(mock_vacancies_data, f)
+    job = DataJobHHJSON(file_path=str(temp_json_file), use_cache=True)
+    read_file = mocker.spy(job, "_DataJobHHJSON__read_file")
+
+    first = job.get_vacancies()
+    second = job.get_vacancies()
+    assert read_file.call_count == 1
+    assert first[0] is second[0]  # Объекты VacancyHH переиспользуются
+
+    # Запись через кэш не требует повторного чтения файла
+    job.add(VacancyHH({"id": "3", "name": "Go Developer"}))
+    assert [vacancy.id for vacancy in job.get_vacancies()] == ["1", "2", "3"]
+    assert read_file.call_count == 1
+
+    # Изменение файла другим процессом приводит к перечитыванию
+    with open(temp_json_file, "w", encoding="utf-8") as f:
+        json.dump({"4": {"id": "4", "name": "Rust Developer"}}, f)
+    assert [vacancy.id for vacancy in job.get_vacancies()] == ["4"]
+    assert read_file.call_count == 2
+
+
+def test_top_by_salary_matches_full_sort(temp_json_file):
+    salaries = [50000, None, 120000, 80000, None, 120000, 30000]
+    job = DataJobHHJSON(file_path=str(temp_json_file))
+    job.add_many(
+        VacancyHH({"id": str(index), "name": "Developer", "salary": salary})
+        for index, salary in enumerate(salaries)
+    )
+    expected = sorted(job.get_vacancies(), reverse=True)
+
+    for n in (0, 1, 3, 6, 10):
+        top = job.top_by_salary(n)
+        assert [vacancy.id for vacancy in top] == [
+            vacancy.id for vacancy in expected[:n]
+        ]
+
+
+def test_top_by_salary_with_criteria(temp_json_file, mock_vacancies_data):
+    with open(temp_json_file, "w", encoding="utf-8") as f:
+        json.dump(mock_vacancies_data, f)
+    job = DataJobHHJSON(file_path=str(temp_json_file))
+    assert [vacancy.id for vacancy in job.top_by_salary(5, name="Developer")] == [
+        "2",
+        "1",
+    ]
+    assert [vacancy.id for vacancy in job.top_by_salary(5, name="Python")] == ["1"]
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_find_vacancies(temp_json_file, mock_vacancies_data, use_cache):
+    with open(temp_json_file, "w", encoding="utf-8") as f:
+        json.dump(mock_vacancies_data, f)
+    job = DataJobHHJSON(file_path=str(temp_json_file), use_cache=use_cache)
+
+    assert [vacancy.id for vacancy in job.find_vacancies("developer")] == ["1", "2"]
+    assert job.find_vacancies("pyth") == []
+    assert [vacancy.id for vacancy in job.find_vacancies("pyth", prefix=True)] == ["1"]
+    assert job.find_vacancies("developer", salary="^12")[0].id == "2"
+
+    # Индекс обновляется при добавлении и удалении вакансий
+    job.add(VacancyHH({"id": "3", "name": "C++ Developer", "employer": "Яндекс"}))
+    assert [vacancy.id for vacancy in job.find_vacancies("c")] == ["3"]
+    assert job.find_vacancies("яндекс", fields=["name"]) == []
+    job.delete("1")
+    assert [vacancy.id for vacancy in job.find_vacancies("developer")] == ["2", "3"]
+    # Результаты идут в порядке хранилища, обновление не меняет позицию вакансии
+    job.add(VacancyHH({"id": "0", "name": "Go Developer"}))
+    job.add(VacancyHH({"id": "2", "name": "Java Developer", "salary": 1}))
+    assert [vacancy.id for vacancy in job.find_vacancies("developer")] == [
+        "2",
+        "3",
+        "0",
+    ]
+    with pytest.raises(ValueError):
+        job.find_vacancies("developer", fields=["url"])
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_iter_vacancies(temp_json_file, mock_vacancies_data, use_cache):
+    with open(temp_json_file, "w", encoding="utf-8") as f:
+        json.dump(mock_vacancies_data, f)
+    job = DataJobHHJSON(file_path=str(temp_json_file), use_cache=use_cache)
+    job.get_vacancies()  # Заполняет кэш, если он включён
+
+    vacancies = job.iter_vacancies(name="developer")
+    assert next(vacancies).id == "1"
+    assert [vacancy.id for vacancy in vacancies] == ["2"]
+    assert [vacancy.id for vacancy in job.iter_vacancies(name="java")] == ["2"]
+
+
+def test_iter_vacancies_missing_or_invalid_file(tmp_path):
+    assert list(DataJobHHJSON(str(tmp_path / "missing.json")).iter_vacancies()) == []
+    invalid_json_file = tmp_path / "invalid.json"
+    invalid_json_file.write_text("{invalid_json:}", encoding="utf-8")
+    assert list(DataJobHHJSON(str(invalid_json_file)).iter_vacancies()) == []
+
+
+def test_save_to_csv_empty_store(temp_json_file, tmp_path):
+    csv_file = tmp_path / "vacancies.csv"
+    job = DataJobHHJSON(file_path=str(temp_json_file))
+    assert job.save_to_csv(str(csv_file)) == 0
+    with open(csv_file, encoding="utf-8") as f:
+        assert f.read().strip() == "id,url,name,employer,published_at,salary"
+
+
+def test_save_to_csv_gzip_with_criteria(temp_json_file, mock_vacancies_data, tmp_path):
+    with open(temp_json_file, "w", encoding="utf-8") as f:
+        json.dump(mock_vacancies_data, f)
+    csv_file = tmp_path / "vacancies.csv.gz"
+    job = DataJobHHJSON(file_path=str(temp_json_file))
+    assert job.save_to_csv(str(csv_file), name="java") == 1
+    with gzip.open(csv_file, "rt", encoding="utf-8") as f:
+        reader = list(csv.DictReader(f))
+    assert reader == [
+        {
+            "id": "2",
+            "url": "http://example.com",
+            "name": "Java Developer",
+            "employer": "",
+            "published_at": "",
+            "salary": "120000",
+        }
+    ]
+
+
+def test_add_many_reports_changes(temp_json_file, mock_vacancies_data, mocker):
+    job = DataJobHHJSON(file_path=str(temp_json_file))
+    job.add_many(VacancyHH(data) for data in mock_vacancies_data.values())
+    stats = job.add_many(
+        [
+            VacancyHH(mock_vacancies_data["1"]),
+            VacancyHH({**mock_vacancies_data["2"], "salary": 130000}),
+            VacancyHH({"id": "3", "name": "Go Developer"}),
+        ]
+    )
+    assert stats == {"inserted": 1, "updated": 1, "skipped": 1}
+
+    # Без изменений файл не перезаписывается
+    save_data = mocker.spy(job, "_DataJobHHJSON__save_data")
+    assert job.add_many([VacancyHH(mock_vacancies_data["1"])]) == {
+        "inserted": 0,
+        "updated": 0,
+        "skipped": 1,
+    }
+    assert save_data.call_count == 0
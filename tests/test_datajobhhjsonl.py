@@ -0,0 +1,135 @@
+import json
+
+import pytest
+from datajobhhjson import DataJobHHJSON
+from datajobhhjsonl import DataJobHHJSONL
+from vacancyhh import VacancyHH
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return tmp_path / "vacancies.jsonl"
+
+
+def make_vacancy(vacancy_id: str, salary: float = 100000, name: str = "Python"):
+    return VacancyHH({"id": vacancy_id, "name": name, "salary": salary})
+
+
+def test_add_appends_and_reopens(log_path):
+    data_job = DataJobHHJSONL(str(log_path))
+    data_job.add(make_vacancy("1"))
+    data_job.add(make_vacancy("2", name="Java"))
+    data_job.add(make_vacancy("1", salary=150000))
+    data_job.close()
+
+    assert len(log_path.read_text(encoding="utf-8").splitlines()) == 3
+
+    reopened = DataJobHHJSONL(str(log_path))
+    vacancies = {v.id: v for v in reopened.get_vacancies()}
+    assert vacancies["1"].salary == 150000
+    assert len(reopened) == 2
+    assert reopened.stale_ratio == pytest.approx(1 / 3)
+    assert [v.id for v in reopened.get_vacancies(name="java")] == ["2"]
+    reopened.close()
+
+
+def test_add_many_appends_only_changes(log_path):
+    data_job = DataJobHHJSONL(str(log_path))
+    assert data_job.add_many([make_vacancy("1"), make_vacancy("2")]) == {
+        "inserted": 2,
+        "updated": 0,
+        "skipped": 0,
+    }
+    stats = data_job.add_many([make_vacancy("1"), make_vacancy("2", salary=1)])
+    assert stats == {"inserted": 0, "updated": 1, "skipped": 1}
+    assert len(log_path.read_text(encoding="utf-8").splitlines()) == 3
+    data_job.close()
+
+
+def test_delete(log_path):
+    data_job = DataJobHHJSONL(str(log_path))
+    data_job.add(make_vacancy("1"))
+    data_job.delete("1")
+    with pytest.raises(KeyError):
+        data_job.delete("1")
+    data_job.close()
+
+    assert DataJobHHJSONL(str(log_path)).get_vacancies() == []
+
+
+def test_torn_last_line_is_truncated(log_path):
+    data_job = DataJobHHJSONL(str(log_path))
+    data_job.add(make_vacancy("1"))
+    data_job.close()
+    with open(log_path, "ab") as f:
+        f.write(b'{"op": "add", "vacancy": {"id": "2", "na')
+
+    recovered = DataJobHHJSONL(str(log_path))
+    assert [v.id for v in recovered.get_vacancies()] == ["1"]
+    recovered.add(make_vacancy("3"))
+    recovered.close()
+
+    lines = log_path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["vacancy"]["id"] for line in lines] == ["1", "3"]
+
+
+def test_compaction_drops_stale_records(log_path):
+    data_job = DataJobHHJSONL(
+        str(log_path),
+        compaction_threshold=0.5,
+        min_compaction_records=10,
+        background_compaction=False,
+    )
+    for salary in range(5):
+        data_job.add_many([make_vacancy(str(i), salary=salary) for i in range(4)])
+
+    assert data_job.stale_ratio <= 0.5
+    data_job.compact()
+    assert data_job.stale_ratio == 0
+    assert len(log_path.read_text(encoding="utf-8").splitlines()) == 4
+    assert {v.salary for v in data_job.get_vacancies()} == {4}
+    data_job.add(make_vacancy("9"))
+    data_job.close()
+
+    assert len(DataJobHHJSONL(str(log_path))) == 5
+
+
+def test_background_compaction_keeps_concurrent_writes(log_path):
+    data_job = DataJobHHJSONL(
+        str(log_path), compaction_threshold=0.3, min_compaction_records=50
+    )
+    for round_number in range(20):
+        data_job.add_many(
+            [make_vacancy(str(i), salary=round_number) for i in range(10)]
+        )
+        data_job.add(make_vacancy(f"extra-{round_number}"))
+    data_job.wait_for_compaction()
+
+    vacancies = data_job.get_vacancies()
+    assert len(vacancies) == 30
+    assert {v.salary for v in vacancies if not v.id.startswith("extra")} == {19}
+    data_job.close()
+    assert len(DataJobHHJSONL(str(log_path))) == 30
+
+
+def test_load_from_json_and_top_by_salary(tmp_path, log_path):
+    json_job = DataJobHHJSON(str(tmp_path / "vacancies.json"))
+    json_job.add_many(
+        [make_vacancy(str(i), salary=i * 1000) for i in range(1, 6)]
+        + [VacancyHH({"id": "0"})]
+    )
+
+    data_job = DataJobHHJSONL(str(log_path))
+    stats = data_job.load_from_json(str(tmp_path / "vacancies.json"), batch_size=2)
+
+    assert stats == {"inserted": 6, "updated": 0, "skipped": 0}
+    assert [v.id for v in data_job.top_by_salary(2)] == ["5", "4"]
+    assert sorted(v.id for v in data_job.iter_vacancies()) == [
+        "0",
+        "1",
+        "2",
+        "3",
+        "4",
+        "5",
+    ]
+    data_job.close()
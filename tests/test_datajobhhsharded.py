@@ -0,0 +1,160 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+from datajobhhsharded import DataJobHHSharded, partition_key
+from vacancyhh import VacancyHH
+
+
+def make_vacancy(vacancy_id: str, published_at=None, salary=None, name="Python"):
+    return VacancyHH(
+        {
+            "id": vacancy_id,
+            "name": name,
+            "salary": salary,
+            "published_at": published_at,
+        }
+    )
+
+
+@pytest.fixture
+def data_job(tmp_path):
+    data_job = DataJobHHSharded(str(tmp_path / "vacancies"))
+    data_job.add_many(
+        [
+            make_vacancy("1", "2024-10-15T10:00:00+0300", 100000),
+            make_vacancy("2", "2024-11-01T00:30:00+0300", 150000, name="Java"),
+            make_vacancy("3", "2024-11-20T10:00:00+0300", 200000),
+            make_vacancy("4", "2024-12-05T10:00:00+0300", 50000),
+            make_vacancy("5", None, 300000),
+        ]
+    )
+    return data_job
+
+
+def test_partition_key():
+    assert partition_key("2024-11-01T00:30:00+0300") == "2024-11"
+    assert partition_key(None) == "undated"
+    assert partition_key("не дата") == "undated"
+
+
+def test_add_many_writes_partitions_and_manifest(tmp_path, data_job):
+    directory = tmp_path / "vacancies"
+    assert data_job.partitions == {
+        "2024-10": 1,
+        "2024-11": 2,
+        "2024-12": 1,
+        "undated": 1,
+    }
+    assert sorted(path.name for path in directory.iterdir()) == [
+        "2024-10.json",
+        "2024-11.json",
+        "2024-12.json",
+        "ids.log",
+        "manifest.json",
+        "undated.json",
+    ]
+    manifest = json.loads((directory / "manifest.json").read_text(encoding="utf-8"))
+    assert manifest == {"version": 1, "partitions": data_job.partitions}
+
+    reopened = DataJobHHSharded(str(directory))
+    assert reopened.partitions == data_job.partitions
+    assert len(reopened.get_vacancies()) == 5
+
+
+def test_write_touches_only_affected_partition(tmp_path, data_job):
+    directory = tmp_path / "vacancies"
+    before = {path.name: path.read_bytes() for path in directory.iterdir()}
+
+    stats = data_job.add_many(
+        [
+            make_vacancy("4", "2024-12-05T10:00:00+0300", 60000),
+            make_vacancy("6", "2024-12-06T10:00:00+0300"),
+        ]
+    )
+
+    assert stats == {"inserted": 1, "updated": 1, "skipped": 0}
+    after = {path.name: path.read_bytes() for path in directory.iterdir()}
+    changed = {name for name in after if after[name] != before.get(name)}
+    assert changed == {"2024-12.json", "manifest.json", "ids.log"}
+    # В журнал разделов дописывается только новая вакансия
+    assert after["ids.log"] == before["ids.log"] + b'["6", "2024-12"]\n'
+    assert data_job.partitions["2024-12"] == 2
+
+
+def test_date_range_reads_only_relevant_partitions(tmp_path, data_job):
+    (tmp_path / "vacancies" / "2024-10.json").write_text("не JSON", encoding="utf-8")
+    date_from = datetime(2024, 11, 1, tzinfo=timezone.utc)
+    date_to = datetime(2024, 11, 30, tzinfo=timezone.utc)
+
+    # Вакансия 2 опубликована 31 октября по UTC, хотя лежит в разделе ноября
+    assert [v.id for v in data_job.get_vacancies(date_from, date_to)] == ["3"]
+    assert [v.id for v in data_job.top_by_salary(5, date_from=date_from)] == [
+        "3",
+        "4",
+    ]
+    assert [v.id for v in data_job.get_vacancies(name="java")] == ["2"]
+
+
+def test_republished_vacancy_moves_to_new_partition(tmp_path, data_job):
+    stats = data_job.add_many(
+        [make_vacancy("3", "2024-12-10T10:00:00+0300", 120000, name="Go")]
+    )
+
+    assert stats == {"inserted": 0, "updated": 1, "skipped": 0}
+    assert data_job.partitions == {
+        "2024-10": 1,
+        "2024-11": 1,
+        "2024-12": 2,
+        "undated": 1,
+    }
+    date_to = datetime(2024, 11, 25, tzinfo=timezone.utc)
+    assert [v.id for v in data_job.get_vacancies(date_to=date_to)] == ["2", "1"]
+    assert [v.salary for v in data_job.get_vacancies(id="^3$")] == [120000]
+    assert data_job.get_vacancies(name="Python", salary="^200000$") == []
+
+    reopened = DataJobHHSharded(str(tmp_path / "vacancies"))
+    assert reopened.partitions == data_job.partitions
+    reopened.delete("3")
+    assert reopened.get_vacancies(id="^3$") == []
+    assert reopened.partitions["2024-12"] == 1
+    with pytest.raises(KeyError):
+        reopened.delete("3")
+
+
+def test_stale_copies_are_removed_on_manifest_rebuild(tmp_path, data_job):
+    directory = tmp_path / "vacancies"
+    # Прежняя версия хранилища оставляла копию в старом разделе и не вела журнал
+    (directory / "ids.log").unlink()
+    stale = json.loads((directory / "2024-11.json").read_text(encoding="utf-8"))
+    stale["4"] = dict(stale["3"], id="4")
+    (directory / "2024-11.json").write_text(json.dumps(stale), encoding="utf-8")
+    manifest = {"version": 1, "partitions": {"2024-11": 3, "2024-12": 1}}
+    (directory / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+    reopened = DataJobHHSharded(str(directory))
+    assert reopened.partitions == data_job.partitions
+    assert [v.published_at for v in reopened.get_vacancies(id="^4$")] == [
+        "2024-12-05T10:00:00+0300"
+    ]
+
+
+def test_drop_partitions(tmp_path, data_job):
+    removed = data_job.drop_partitions(datetime(2024, 12, 1))
+
+    assert removed == 3
+    assert data_job.partitions == {"2024-12": 1, "undated": 1}
+    assert not (tmp_path / "vacancies" / "2024-11.json").exists()
+    assert sorted(v.id for v in data_job.get_vacancies()) == ["4", "5"]
+    assert data_job.drop_partitions(datetime(2024, 12, 1)) == 0
+
+    # Журнал разделов сжат до оставшихся вакансий
+    index = (tmp_path / "vacancies" / "ids.log").read_text(encoding="utf-8")
+    assert index.splitlines() == ['["4", "2024-12"]', '["5", "undated"]']
+
+
+def test_manifest_is_rebuilt_from_partition_files(tmp_path, data_job):
+    (tmp_path / "vacancies" / "manifest.json").unlink()
+
+    reopened = DataJobHHSharded(str(tmp_path / "vacancies"))
+    assert reopened.partitions == data_job.partitions
@@ -0,0 +1,188 @@
+import csv
+import sqlite3
+
+import pytest
+from datajobhhjson import DataJobHHJSON
+from datajobhhsqlite import DataJobHHSQLite
+from vacancyhh import VacancyHH
+
+
+@pytest.fixture
+def sqlite_job(tmp_path):
+    job = DataJobHHSQLite(file_path=str(tmp_path / "vacancies.db"))
+    yield job
+    job.close()
+
+
+@pytest.fixture
+def filled_sqlite_job(sqlite_job, mock_vacancies_data):
+    sqlite_job.add_many(VacancyHH(data) for data in mock_vacancies_data.values())
+    sqlite_job.add(
+        VacancyHH(
+            {
+                "id": "3",
+                "name": "Python Team Lead",
+                "employer": "Яндекс",
+                "published_at": "2024-12-01T10:00:00+0300",
+                "salary": 300000,
+            }
+        )
+    )
+    return sqlite_job
+
+
+def test_add_and_get_all(filled_sqlite_job):
+    result = filled_sqlite_job.get_vacancies()
+    assert [vacancy.id for vacancy in result] == ["1", "2", "3"]
+    assert result[1].salary == 120000
+
+
+def test_add_overwrites_existing(filled_sqlite_job):
+    filled_sqlite_job.add(VacancyHH({"id": "1", "name": "Go Developer"}))
+    assert filled_sqlite_job.get_vacancies(name="Python")[0].id == "3"
+    assert filled_sqlite_job.get_vacancies(name="go")[0].id == "1"
+
+
+@pytest.mark.parametrize(
+    "criteria",
+    [
+        {"name": "python"},
+        {"name": "Python|Java"},
+        {"name": "velop"},
+        {"name": "^Java$"},
+        {"employer": "яндекс"},
+        {"salary": "^120000$"},
+        {"salary": "None"},
+        {"published_at": "^2024-12", "name": "python"},
+        {"area": "1"},
+        {"area": ""},
+    ],
+)
+def test_criteria_match_json_storage(filled_sqlite_job, tmp_path, criteria):
+    json_job = DataJobHHJSON(str(tmp_path / "vacancies.json"))
+    json_job.add_many(filled_sqlite_job.get_vacancies())
+
+    expected = [v.to_dict() for v in json_job.get_vacancies(**criteria)]
+    assert [v.to_dict() for v in filled_sqlite_job.get_vacancies(**criteria)] == (
+        expected
+    )
+    assert [v.id for v in filled_sqlite_job.iter_vacancies(**criteria)] == [
+        record["id"] for record in expected
+    ]
+
+
+def test_regexp_criteria(filled_sqlite_job):
+    result = filled_sqlite_job.get_vacancies(published_at="^2024-12", name="python")
+    assert [vacancy.id for vacancy in result] == ["3"]
+    assert [v.id for v in filled_sqlite_job.get_vacancies(name="Python|Java")] == [
+        "1",
+        "2",
+        "3",
+    ]
+    assert filled_sqlite_job.get_vacancies(name="pyth lead") == []
+    assert filled_sqlite_job.get_vacancies(description="python") == []
+
+
+def test_delete(filled_sqlite_job):
+    filled_sqlite_job.delete("3")
+    assert filled_sqlite_job.get_vacancies(name="lead") == []
+    with pytest.raises(KeyError):
+        filled_sqlite_job.delete("3")
+
+
+def test_add_invalid_type(sqlite_job):
+    with pytest.raises(ValueError, match="Ожидается тип VacancyHH"):
+        sqlite_job.add({"id": "3"})  # type: ignore
+
+
+def test_save_to_csv(filled_sqlite_job, tmp_path):
+    csv_file = tmp_path / "vacancies.csv"
+    filled_sqlite_job.save_to_csv(str(csv_file))
+    with open(csv_file, encoding="utf-8") as f:
+        reader = list(csv.DictReader(f))
+    assert [row["name"] for row in reader] == [
+        "Python Developer",
+        "Java Developer",
+        "Python Team Lead",
+    ]
+
+
+def test_top_by_salary(filled_sqlite_job):
+    filled_sqlite_job.add(VacancyHH({"id": "4", "name": "Python Intern"}))
+    assert [v.id for v in filled_sqlite_job.top_by_salary(2)] == ["3", "2"]
+    assert [v.id for v in filled_sqlite_job.top_by_salary(10, name="python")] == [
+        "3",
+        "1",
+        "4",
+    ]
+    assert filled_sqlite_job.top_by_salary(0) == []
+
+
+def test_find_vacancies(filled_sqlite_job):
+    assert [v.id for v in filled_sqlite_job.find_vacancies("python")] == ["1", "3"]
+    assert filled_sqlite_job.find_vacancies("pyth") == []
+    assert [v.id for v in filled_sqlite_job.find_vacancies("яндекс pyth", True)] == [
+        "3"
+    ]
+    assert filled_sqlite_job.find_vacancies("яндекс", fields=["name"]) == []
+    assert [v.id for v in filled_sqlite_job.find_vacancies("", salary="^12")] == ["2"]
+
+
+@pytest.mark.parametrize("keyword", ["cafe", "café", "CAFÉ", "кафе"])
+def test_find_vacancies_keeps_diacritics_like_json_storage(
+    sqlite_job, tmp_path, keyword
+):
+    vacancies = [
+        VacancyHH({"id": "1", "name": "Бариста", "employer": "Café Pushkin"}),
+        VacancyHH({"id": "2", "name": "Повар", "employer": "Cafe Central"}),
+        VacancyHH({"id": "3", "name": "Официант", "employer": "Кафе Ёлка"}),
+    ]
+    json_job = DataJobHHJSON(str(tmp_path / "vacancies.json"), use_cache=True)
+    json_job.add_many(vacancies)
+    sqlite_job.add_many(vacancies)
+
+    expected = sorted(v.id for v in json_job.find_vacancies(keyword))
+    assert expected
+    assert sorted(v.id for v in sqlite_job.find_vacancies(keyword)) == expected
+
+
+def test_fts_index_without_diacritics_is_rebuilt(tmp_path):
+    file_path = str(tmp_path / "vacancies.db")
+    job = DataJobHHSQLite(file_path)
+    job.add(VacancyHH({"id": "1", "name": "Бариста", "employer": "Café Pushkin"}))
+    job.close()
+    # База прежней версии: индекс с токенизатором по умолчанию
+    connection = sqlite3.connect(file_path)
+    with connection:
+        connection.execute("DROP TABLE vacancies_fts")
+        connection.execute(
+            "CREATE VIRTUAL TABLE vacancies_fts USING fts5("
+            "name, employer, content='vacancies', content_rowid='rowid')"
+        )
+        connection.execute(
+            "INSERT INTO vacancies_fts (vacancies_fts) VALUES ('rebuild')"
+        )
+    connection.close()
+
+    job = DataJobHHSQLite(file_path)
+    assert job.find_vacancies("cafe") == []
+    assert [v.id for v in job.find_vacancies("café")] == ["1"]
+    job.close()
+
+
+def test_iter_vacancies(filled_sqlite_job):
+    vacancies = filled_sqlite_job.iter_vacancies(name="python")
+    assert next(vacancies).id == "1"
+    assert [vacancy.id for vacancy in vacancies] == ["3"]
+
+
+def test_add_many_reports_changes(filled_sqlite_job, mock_vacancies_data):
+    stats = filled_sqlite_job.add_many(
+        [
+            VacancyHH(mock_vacancies_data["1"]),
+            VacancyHH({**mock_vacancies_data["2"], "salary": 130000}),
+            VacancyHH({"id": "4", "name": "Go Developer"}),
+        ]
+    )
+    assert stats == {"inserted": 1, "updated": 1, "skipped": 1}
+    assert filled_sqlite_job.top_by_salary(2)[1].salary == 130000
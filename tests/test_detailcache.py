@@ -0,0 +1,33 @@
+import os
+import time
+
+import pytest
+from detailcache import VacancyDetailsCache
+
+
+def test_set_and_get(tmp_path):
+    cache = VacancyDetailsCache(str(tmp_path / "details"))
+    assert cache.get("1") is None
+    cache.set("1", {"id": "1", "name": "Python Developer"})
+    assert cache.get("1") == {"id": "1", "name": "Python Developer"}
+    assert [path.name for path in (tmp_path / "details").iterdir()] == ["1.json"]
+
+
+def test_expired_entry(tmp_path):
+    cache = VacancyDetailsCache(str(tmp_path), ttl=60)
+    cache.set("1", {"id": "1"})
+    expired = time.time() - 120
+    os.utime(tmp_path / "1.json", (expired, expired))
+    assert cache.get("1") is None
+
+
+def test_corrupted_entry(tmp_path):
+    cache = VacancyDetailsCache(str(tmp_path))
+    (tmp_path / "1.json").write_text("{", encoding="utf-8")
+    assert cache.get("1") is None
+
+
+def test_invalid_id(tmp_path):
+    cache = VacancyDetailsCache(str(tmp_path))
+    with pytest.raises(ValueError, match="Некорректный id вакансии"):
+        cache.get("../secret")
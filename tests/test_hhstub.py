@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+import pytest
+import requests
+from apijobhh import APIJobHH
+from hhstub import DEFAULT_NEWEST
+
+
+def test_search_vacancies_pages(stub_server):
+    stub_server(found=250)
+    vacancies = APIJobHH().search_vacancies("python", pages_count=10, max_workers=4)
+
+    assert len(vacancies) == 250
+    assert [v["id"] for v in vacancies[:2]] == ["1000000", "1000001"]
+    assert len({v["id"] for v in vacancies}) == 250
+
+
+def test_vacancy_details_and_dictionaries(stub_server):
+    server = stub_server(found=10)
+
+    details = APIJobHH.get_vacancy_details("1000003")
+    assert details["id"] == "1000003"
+    assert "description" in details
+
+    rates = requests.get(f"{server.url}/dictionaries", timeout=5).json()
+    assert {c["code"] for c in rates["currency"]} >= {"RUR", "USD"}
+    assert requests.get(f"{server.url}/vacancies/1000010", timeout=5).status_code == 404
+
+
+def test_depth_limit_rejects_deep_pages(stub_server):
+    server = stub_server(found=5000, max_depth=200)
+    response = requests.get(
+        f"{server.url}/vacancies", params={"page": 2, "per_page": 100}, timeout=5
+    )
+    assert response.status_code == 400
+    assert server.stats["depth_errors"] == 1
+
+    first = requests.get(
+        f"{server.url}/vacancies", params={"per_page": 100}, timeout=5
+    ).json()
+    assert first["found"] == 5000
+    assert first["pages"] == 2
+
+
+def test_harvest_vacancies_splits_windows(stub_server):
+    stub_server(found=600, max_depth=200, interval=60)
+    api = APIJobHH()
+    vacancies = api.harvest_vacancies(
+        "python",
+        date_from=DEFAULT_NEWEST - timedelta(hours=12),
+        date_to=DEFAULT_NEWEST,
+        max_depth=200,
+    )
+
+    assert len(vacancies) == 600
+    assert api.harvest_stats["partitions"] > 1
+    assert api.harvest_stats["truncated"] == 0
+
+
+def test_errors_and_throttling_are_counted(stub_server):
+    server = stub_server(found=10, error_rate=1.0, seed=1)
+    with pytest.raises(ConnectionError, match="503"):
+        APIJobHH().search_vacancies("python")
+    assert server.stats["errors"] == 1
+
+    server.error_rate = 0.0
+    server.rate_limit = 1
+    server.retry_after = 0
+    statuses = [
+        requests.get(f"{server.url}/dictionaries", timeout=5).status_code
+        for _ in range(3)
+    ]
+    assert statuses[0] == 200
+    assert 429 in statuses
+    assert server.stats["throttled"] >= 1
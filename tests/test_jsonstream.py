@@ -0,0 +1,38 @@
+import io
+import json
+
+import pytest
+from jsonstream import iter_object_items
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1024])
+def test_items_match_json_load(chunk_size):
+    data = {
+        "1": {"id": "1", "name": 'Python "Dev" {x}', "salary": 123456.5},
+        "2": {"id": "2", "name": "Разработчик", "salary": None, "tags": [1, 2]},
+        "3": 1234567890,
+        "4": "строка, с запятой}",
+    }
+    text = json.dumps(data, ensure_ascii=False, indent=4)
+    items = list(iter_object_items(io.StringIO(text), chunk_size=chunk_size))
+    assert dict(items) == data
+    assert [key for key, _ in items] == ["1", "2", "3", "4"]
+
+
+@pytest.mark.parametrize("text", ["", "   ", "{}", " { \n } "])
+def test_empty(text):
+    assert list(iter_object_items(io.StringIO(text), chunk_size=2)) == []
+
+
+@pytest.mark.parametrize("text", ["[]", '{"1": {"id": "1"}', '{"1" {}}', "{1: 2}"])
+def test_invalid(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_object_items(io.StringIO(text), chunk_size=2))
+
+
+def test_reads_lazily():
+    text = json.dumps({str(i): {"id": str(i)} for i in range(1000)})
+    file = io.StringIO(text)
+    items = iter_object_items(file, chunk_size=64)
+    assert next(items) == ("0", {"id": "0"})
+    assert file.tell() < 200
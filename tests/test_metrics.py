@@ -0,0 +1,128 @@
+import json
+
+import pytest
+import responses
+from datajobhhjson import DataJobHHJSON
+from metrics import Histogram, Metrics, metrics
+from transport import HHTransport, endpoint_of
+from vacancyhh import VacancyHH
+
+
+@pytest.fixture
+def enabled_metrics():
+    metrics.reset()
+    metrics.enable()
+    yield metrics
+    metrics.disable()
+    metrics.reset()
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((0.1, 1))
+    for value in (0.05, 0.1, 0.5, 2):
+        histogram.observe(value)
+
+    assert histogram.cumulative() == [2, 3, 4]
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(2.65)
+
+
+def test_disabled_metrics_record_nothing():
+    registry = Metrics()
+    events = []
+    registry.add_hook(lambda *event: events.append(event))
+
+    registry.inc("requests_total")
+    with registry.timer("request_seconds"):
+        pass
+
+    assert registry.snapshot() == {"counters": [], "histograms": []}
+    assert events == []
+
+
+def test_counters_histograms_and_hooks():
+    registry = Metrics(buckets=(0.5, 1))
+    registry.enable()
+    events = []
+    registry.add_hook(lambda *event: events.append(event))
+
+    registry.inc("requests_total", endpoint="/vacancies")
+    registry.inc("requests_total", 2, endpoint="/vacancies")
+    registry.observe("request_seconds", 0.7, endpoint="/vacancies")
+
+    assert registry.counter_value("requests_total", endpoint="/vacancies") == 3
+    assert registry.histogram("request_seconds", endpoint="/vacancies").count == 1
+    assert events[0] == ("counter", "requests_total", 1, {"endpoint": "/vacancies"})
+    assert events[-1] == (
+        "histogram",
+        "request_seconds",
+        0.7,
+        {"endpoint": "/vacancies"},
+    )
+
+    text = registry.to_prometheus()
+    assert "# TYPE hhapi_requests_total counter" in text
+    assert 'hhapi_requests_total{endpoint="/vacancies"} 3' in text
+    assert 'hhapi_request_seconds_bucket{endpoint="/vacancies",le="0.5"} 0' in text
+    assert 'hhapi_request_seconds_bucket{endpoint="/vacancies",le="+Inf"} 1' in text
+    assert 'hhapi_request_seconds_count{endpoint="/vacancies"} 1' in text
+
+    registry.inc("response_bytes_total", 3350520)
+    registry.inc("response_bytes_total", 0.25)
+    assert "hhapi_response_bytes_total 3350520.25" in registry.to_prometheus()
+
+    snapshot = json.loads(registry.to_json())
+    assert snapshot["counters"][0]["value"] == 3
+    assert snapshot["histograms"][0]["buckets"] == {"0.5": 0, "1": 1, "+Inf": 1}
+
+
+def test_endpoint_of_collapses_ids():
+    assert endpoint_of("https://api.hh.ru/vacancies/12345") == "/vacancies/{id}"
+    assert endpoint_of("https://api.hh.ru/vacancies?text=python") == "/vacancies"
+
+
+@responses.activate
+def test_transport_records_requests_bytes_and_retries(enabled_metrics):
+    url = "https://api.hh.ru/vacancies"
+    responses.add(responses.GET, url, status=503)
+    responses.add(responses.GET, url, json={"items": []}, status=200)
+    transport = HHTransport(max_retries=1, sleep=lambda delay: None)
+
+    assert transport.get_json(url) == {"items": []}
+
+    labels = {"endpoint": "/vacancies"}
+    assert metrics.counter_value("http_requests_total", status="503", **labels) == 1
+    assert metrics.counter_value("http_requests_total", status="200", **labels) == 1
+    assert metrics.counter_value("http_retries_total", **labels) == 1
+    assert metrics.counter_value("http_response_bytes_total", **labels) > 0
+    assert metrics.histogram("http_request_seconds", **labels).count == 2
+    assert metrics.histogram("json_parse_seconds", source="http").count == 1
+
+
+def test_json_storage_records_io_and_parse_time(enabled_metrics, temp_json_file):
+    data_job = DataJobHHJSON(temp_json_file)
+    data_job.add_many(
+        [VacancyHH({"id": "1", "name": "Python"}), VacancyHH({"id": "2"})]
+    )
+    assert len(data_job.get_vacancies()) == 2
+
+    labels = {"storage": "json"}
+    assert metrics.counter_value("storage_write_bytes_total", **labels) > 0
+    assert metrics.counter_value("storage_read_bytes_total", **labels) > 0
+    assert (
+        metrics.counter_value("storage_records_total", operation="save", **labels) == 2
+    )
+    assert metrics.histogram("storage_parse_seconds", **labels).count >= 1
+    assert metrics.histogram("storage_dump_seconds", **labels).count == 1
+
+
+def test_vacancy_batch_construction_is_counted(enabled_metrics):
+    items = [
+        {"id": "1", "salary": {"from": 1000, "to": None, "currency": "USD"}},
+        {"id": "2", "employer": {"name": "Компания"}},
+    ]
+    vacancies = list(VacancyHH.from_api_items(items, {"USD": 0.01}))
+    assert vacancies[0].salary == 100000
+
+    assert metrics.counter_value("vacancy_records_total", source="api") == 2
+    assert metrics.histogram("vacancy_build_seconds", source="api").count == 1
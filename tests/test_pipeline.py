@@ -0,0 +1,56 @@
+import pytest
+from apijobhh import APIJobHH
+from datajobhhjson import DataJobHHJSON
+from datajobhhsqlite import DataJobHHSQLite
+from pipeline import IngestPipeline
+
+
+def test_pipeline_stores_all_pages_in_batches(stub_server, tmp_path, mocker):
+    stub_server(found=350)
+    data_job = DataJobHHJSON(str(tmp_path / "vacancies.json"))
+    add_many = mocker.spy(data_job, "add_many")
+    pipeline = IngestPipeline(
+        APIJobHH(),
+        data_job,
+        fetch_workers=3,
+        normalize_workers=2,
+        queue_size=2,
+        batch_size=150,
+        currency_rates={"RUR": 1.0, "USD": 0.01, "EUR": 0.01},
+    )
+
+    stats = pipeline.run("python", pages_count=10)
+
+    assert stats["fetched"] == 350
+    assert stats["inserted"] == 350
+    assert len(data_job.get_vacancies()) == 350
+    # Пакеты по 150 вакансий и остаток
+    assert add_many.call_count == 3
+    assert stats["stages"]["fetch"]["items"] == 4
+    assert stats["stages"]["normalize"]["items"] == 350
+    assert stats["stages"]["store"]["items"] == 350
+    assert stats["bottleneck"] in stats["stages"]
+
+
+def test_pipeline_merges_several_keywords(stub_server, tmp_path):
+    stub_server(found=350)
+    data_job = DataJobHHSQLite(str(tmp_path / "vacancies.db"))
+    pipeline = IngestPipeline(APIJobHH(), data_job, currency_rates={})
+
+    stats = pipeline.run(["python", "django"], pages_count=2)
+
+    # Имитация отдаёт одинаковую выдачу на оба запроса
+    assert stats["fetched"] == 400
+    assert stats["inserted"] == 200
+    assert stats["skipped"] == 200
+    data_job.close()
+
+
+def test_pipeline_raises_stage_error(stub_server, tmp_path):
+    stub_server(found=350, error_rate=1.0)
+    data_job = DataJobHHJSON(str(tmp_path / "vacancies.json"))
+    pipeline = IngestPipeline(APIJobHH(), data_job, currency_rates={})
+
+    with pytest.raises(ConnectionError, match="503"):
+        pipeline.run("python", pages_count=3)
+    assert data_job.get_vacancies() == []
@@ -0,0 +1,135 @@
+import asyncio
+import fcntl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import responses
+from ratelimit import GLOBAL, RateLimiter
+from transport import HHTransport
+
+
+def make_limiter(**options):
+    sleeps = []
+    limiter = RateLimiter(sleep=sleeps.append, **options)
+    return limiter, sleeps
+
+
+def test_burst_then_wait():
+    limiter, sleeps = make_limiter(rate=2)
+
+    assert limiter.acquire() == 0
+    assert limiter.acquire() == 0
+    assert limiter.acquire() == pytest.approx(0.5, abs=0.05)
+    assert sleeps == [pytest.approx(0.5, abs=0.05)]
+
+
+def test_endpoint_budget_is_separate_from_global():
+    limiter, sleeps = make_limiter(rate=100, budgets={"/dictionaries": 1})
+
+    assert limiter.acquire("https://api.hh.ru/dictionaries") == 0
+    assert limiter.acquire("https://api.hh.ru/dictionaries") == pytest.approx(
+        1, abs=0.05
+    )
+    assert limiter.acquire("https://api.hh.ru/vacancies?page=1") == 0
+
+
+def test_aimd_on_throttling_and_recovery():
+    limiter, _ = make_limiter(rate=8, increase=1, decrease=0.5, min_rate=1)
+
+    limiter.on_response("https://api.hh.ru/vacancies", 429)
+    assert limiter.rate() == 4
+    limiter.on_response("https://api.hh.ru/vacancies", 429)
+    limiter.on_response("https://api.hh.ru/vacancies", 429)
+    limiter.on_response("https://api.hh.ru/vacancies", 429)
+    assert limiter.rate() == 1
+
+    for _ in range(20):
+        limiter.on_response("https://api.hh.ru/vacancies", 200)
+    assert limiter.rate() == 8
+
+
+def test_retry_after_pauses_requests():
+    limiter, _ = make_limiter(rate=10, decrease=1)
+
+    limiter.on_response("https://api.hh.ru/vacancies", 429, retry_after=2)
+    assert limiter.acquire() == pytest.approx(2.1, abs=0.05)
+
+
+def test_concurrent_threads_queue_up():
+    limiter, sleeps = make_limiter(rate=10)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        delays = list(executor.map(lambda _: limiter.acquire(), range(30)))
+
+    # 10 запросов из запаса ведра, остальные 20 — по одному каждые 0.1 секунды
+    assert sum(1 for delay in delays if delay == 0) >= 10
+    assert max(delays) == pytest.approx(2, abs=0.05)
+    assert len(sleeps) == sum(1 for delay in delays if delay > 0)
+
+
+def test_acquire_async_does_not_block_loop():
+    limiter = RateLimiter(rate=50, burst=1)
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire_async() for _ in range(5)))
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) == pytest.approx(0.08, abs=0.05)
+
+
+def test_on_response_async_does_not_block_loop(tmp_path):
+    lock_file = tmp_path / "rate.lock"
+    limiter = RateLimiter(rate=2, lock_file=str(lock_file))
+    ticks = []
+
+    async def tick():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def respond():
+        await limiter.on_response_async("https://api.hh.ru/vacancies", 429)
+        return time.monotonic()
+
+    async def run():
+        # Пока файл заблокирован другим владельцем, цикл событий продолжает работу
+        with open(lock_file, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            threading.Timer(0.2, fcntl.flock, (f, fcntl.LOCK_UN)).start()
+            responded_at, _ = await asyncio.gather(respond(), tick())
+            return responded_at
+
+    responded_at = asyncio.run(run())
+    assert len(ticks) == 5
+    assert ticks[-1] < responded_at
+    assert limiter.rate() == 1
+
+
+def test_file_backed_budget_is_shared(tmp_path):
+    lock_file = str(tmp_path / "rate.lock")
+    first, _ = make_limiter(rate=2, lock_file=lock_file)
+    second, _ = make_limiter(rate=2, lock_file=lock_file)
+
+    assert first.acquire() == 0
+    assert first.acquire() == 0
+    assert second.acquire() == pytest.approx(0.5, abs=0.05)
+    assert second.rate(GLOBAL) == 2
+
+
+@responses.activate
+def test_transport_reports_throttling_to_limiter():
+    url = "https://api.hh.ru/vacancies"
+    responses.add(responses.GET, url, status=429, headers={"Retry-After": "0"})
+    responses.add(responses.GET, url, json={"items": []}, status=200)
+    limiter, _ = make_limiter(rate=8, increase=1)
+    transport_sleeps = []
+    transport = HHTransport(
+        max_retries=1, rate_limiter=limiter, sleep=transport_sleeps.append
+    )
+
+    assert transport.get_json(url) == {"items": []}
+    assert limiter.rate() == 5  # 8 * 0.5 после 429, затем +1 после 200
+    assert transport_sleeps == [0.0]
@@ -0,0 +1,103 @@
+import pytest
+import responses
+from responsecache import (
+    CachedResponse,
+    DiskResponseCache,
+    MemoryResponseCache,
+    TieredResponseCache,
+)
+from responses import matchers
+from transport import HHTransport
+
+URL = "https://api.hh.ru/dictionaries"
+
+
+def make_entry(body: bytes, stored_at: float = 0.0) -> CachedResponse:
+    return CachedResponse(body, '"v1"', None, stored_at)
+
+
+def test_ttl_for_uses_longest_prefix():
+    cache = MemoryResponseCache(ttls={"/vacancies": 10, "/vacancies/1": 20})
+    assert cache.ttl_for("https://api.hh.ru/vacancies?text=python") == 10
+    assert cache.ttl_for("https://api.hh.ru/vacancies/123") == 20
+    assert cache.ttl_for("https://api.hh.ru/areas") == 0
+
+
+def test_memory_cache_lru_eviction():
+    cache = MemoryResponseCache(max_entries=2, max_bytes=10)
+    cache.set("a", make_entry(b"1111"))
+    cache.set("b", make_entry(b"2222"))
+    assert cache.get("a") is not None  # "a" становится недавно использованной
+    cache.set("c", make_entry(b"3333"))
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+    cache.set("d", make_entry(b"4444444"))  # Превышение размера вытесняет старые
+    assert cache.get("a") is None and cache.get("c") is None
+    assert cache.stats["evictions"] == 3
+
+
+def test_disk_cache_persists_and_evicts(tmp_path):
+    cache = DiskResponseCache(str(tmp_path), max_bytes=400)
+    cache.set("a", make_entry(b'{"value": 1}', stored_at=5.0))
+
+    reopened = DiskResponseCache(str(tmp_path), max_bytes=400)
+    entry = reopened.get("a")
+    assert entry.data == {"value": 1}
+    assert (entry.etag, entry.stored_at) == ('"v1"', 5.0)
+
+    reopened.set("b", make_entry(b"x" * 250))
+    assert reopened.get("a") is None
+    assert reopened.get("b") is not None
+
+
+def test_tiered_cache_promotes_disk_entries(tmp_path):
+    DiskResponseCache(str(tmp_path)).set("a", make_entry(b"[1]"))
+    cache = TieredResponseCache(disk=DiskResponseCache(str(tmp_path)))
+    assert cache.get("a").data == [1]
+    assert cache.memory.get("a") is not None
+
+
+@responses.activate
+def test_transport_serves_fresh_entries_and_revalidates_stale():
+    responses.add(
+        responses.GET,
+        URL,
+        json={"currency": []},
+        headers={"ETag": '"v1"'},
+        status=200,
+    )
+    responses.add(
+        responses.GET,
+        URL,
+        status=304,
+        match=[matchers.header_matcher({"If-None-Match": '"v1"'})],
+    )
+    cache = MemoryResponseCache(ttls={"/dictionaries": 60})
+    transport = HHTransport(cache=cache)
+
+    first = transport.get_json(URL)
+    assert transport.get_json(URL) is first
+    assert len(responses.calls) == 1
+
+    cache.ttls["/dictionaries"] = 0  # Запись устарела и перепроверяется
+    assert transport.get_json(URL) is first
+    assert len(responses.calls) == 2
+    assert cache.stats == {"hits": 1, "misses": 1, "revalidated": 1, "evictions": 0}
+
+
+@responses.activate
+def test_transport_cache_keys_include_params():
+    url = "https://api.hh.ru/vacancies"
+    for page in ("0", "1"):
+        responses.add(
+            responses.GET,
+            url,
+            json={"page": page},
+            match=[matchers.query_param_matcher({"page": page})],
+        )
+    transport = HHTransport(max_retries=0, cache=MemoryResponseCache())
+    assert transport.get_json(url, params={"page": 0}) == {"page": "0"}
+    assert transport.get_json(url, params={"page": 1}) == {"page": "1"}
+    with pytest.raises(ConnectionError):
+        transport.get_json(url, params={"page": 2})
@@ -0,0 +1,88 @@
+import pytest
+from datajobhhjson import DataJobHHJSON
+from snapshot import VacancySnapshot
+from vacancycollection import to_epoch
+from vacancyhh import VacancyHH
+
+
+@pytest.fixture
+def vacancies():
+    salaries = [100000, None, 50000.5, 150000, 100000, 200000]
+    return [
+        VacancyHH(
+            {
+                "id": str(10 - i),
+                "name": f"Вакансия {i}",
+                "employer": None if i == 2 else f"Работодатель {i}",
+                "url": f"http://example.com/{i}",
+                "salary": salary,
+                "published_at": f"2024-12-0{i + 1}T10:00:00+0300",
+            }
+        )
+        for i, salary in enumerate(salaries)
+    ]
+
+
+@pytest.fixture
+def snapshot(tmp_path, vacancies):
+    path = tmp_path / "vacancies.snap"
+    assert VacancySnapshot.write(vacancies, str(path)) == 6
+    with VacancySnapshot(str(path)) as snapshot:
+        yield snapshot
+
+
+def test_round_trip(snapshot, vacancies):
+    assert len(snapshot) == 6
+    assert [v.to_dict() for v in snapshot.iter_vacancies()] == [
+        v.to_dict() for v in vacancies
+    ]
+    assert isinstance(snapshot.get("10").salary, int)
+    assert snapshot.get("8").salary == 50000.5
+    assert snapshot.get("8").employer is None
+
+
+def test_get_by_id(snapshot):
+    assert snapshot.get("7").name == "Вакансия 3"
+    assert snapshot.get(5).name == "Вакансия 5"
+    assert snapshot.get("1") is None
+    assert snapshot.get("99") is None
+
+
+def test_salary_range(snapshot):
+    assert [v.id for v in snapshot.salary_range(100000, 150000)] == ["7", "10", "6"]
+    assert [v.id for v in snapshot.salary_range(max_salary=60000)] == ["8"]
+    assert [v.id for v in snapshot.salary_range(min_salary=160000)] == ["5"]
+    assert len(list(snapshot.salary_range())) == 5
+    assert list(snapshot.salary_range(300000)) == []
+
+
+def test_top_by_salary_matches_data_job(tmp_path, snapshot, vacancies):
+    data_job = DataJobHHJSON(str(tmp_path / "vacancies.json"))
+    data_job.add_many(vacancies)
+    for n in range(8):
+        assert [v.id for v in snapshot.top_by_salary(n)] == [
+            v.id for v in data_job.top_by_salary(n)
+        ]
+    assert [v.id for v in snapshot.top_by_salary(2, name="[34]")] == ["7", "6"]
+
+
+def test_criteria_and_published_between(snapshot):
+    assert [v.id for v in snapshot.get_vacancies(name="вакансия [01]")] == ["10", "9"]
+    start = to_epoch("2024-12-02T00:00:00+0300")
+    end = to_epoch("2024-12-03T23:59:59+0300")
+    assert [v.id for v in snapshot.published_between(start, end)] == ["9", "8"]
+    assert len(list(snapshot.published_between())) == 6
+
+
+def test_empty_snapshot_and_bad_file(tmp_path):
+    path = tmp_path / "empty.snap"
+    VacancySnapshot.write([], str(path))
+    with VacancySnapshot(str(path)) as snapshot:
+        assert len(snapshot) == 0
+        assert snapshot.get("1") is None
+        assert snapshot.top_by_salary(3) == []
+
+    bad = tmp_path / "vacancies.json"
+    bad.write_text("{}", encoding="utf-8")
+    with pytest.raises(ValueError):
+        VacancySnapshot(str(bad))
@@ -0,0 +1,157 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+import responses
+from apijobhh import APIJobHH
+from datajobhhjson import DataJobHHJSON
+from responses import matchers
+from sync import SyncState, newest_published_at, sync_vacancies
+from vacancyhh import VacancyHH
+
+URL = "https://api.hh.ru/vacancies"
+
+
+def item(vacancy_id, published_at, salary_from=100000):
+    return {
+        "id": vacancy_id,
+        "name": f"Python Developer {vacancy_id}",
+        "published_at": published_at,
+        "salary": {"from": salary_from, "currency": "RUR"},
+    }
+
+
+@pytest.fixture(autouse=True)
+def currency_rates():
+    with patch.object(APIJobHH, "_APIJobHH__currency_rates", {"RUR": 1}):
+        yield
+
+
+def test_sync_state(tmp_path):
+    state = SyncState(str(tmp_path / "state" / "sync.json"))
+    assert state.get_watermark("Python") is None
+    state.set_watermark(" Python  developer", "2024-12-01T10:00:00+0300")
+    assert state.get_watermark("python developer") == "2024-12-01T10:00:00+0300"
+
+
+def test_newest_published_at_compares_dates_not_strings():
+    vacancies = [
+        VacancyHH({"id": "1", "published_at": "2024-12-01T11:00:00+0500"}),
+        VacancyHH({"id": "2", "published_at": "2024-12-01T10:00:00+0300"}),
+        VacancyHH({"id": "3"}),
+    ]
+    assert newest_published_at(vacancies) == "2024-12-01T10:00:00+0300"
+    assert newest_published_at([]) is None
+
+
+@responses.activate
+def test_incremental_sync(temp_json_file, tmp_path):
+    responses.add(
+        responses.GET,
+        URL,
+        json={
+            "items": [
+                item("2", "2024-12-02T10:00:00+0300"),
+                item("1", "2024-12-01T10:00:00+0300"),
+            ],
+            "pages": 1,
+        },
+        match=[matchers.query_param_matcher({"text": "python"}, strict_match=False)],
+    )
+    state = SyncState(str(tmp_path / "sync.json"))
+    data_job = DataJobHHJSON(str(temp_json_file))
+
+    stats = sync_vacancies(APIJobHH(), data_job, "python", state)
+    assert stats == {
+        "fetched": 2,
+        "inserted": 2,
+        "updated": 0,
+        "skipped": 0,
+        "watermark": "2024-12-02T10:00:00+0300",
+        "truncated": False,
+    }
+
+    # Следующая синхронизация запрашивает только вакансии новее отметки
+    responses.replace(
+        responses.GET,
+        URL,
+        json={
+            "items": [
+                item("3", "2024-12-03T10:00:00+0300"),
+                item("2", "2024-12-02T10:00:00+0300", salary_from=150000),
+                item("2", "2024-12-02T10:00:00+0300", salary_from=150000),
+            ],
+            "pages": 1,
+        },
+        match=[
+            matchers.query_param_matcher(
+                {"date_from": "2024-12-02T10:00:00+0300"}, strict_match=False
+            )
+        ],
+    )
+    stats = sync_vacancies(APIJobHH(), data_job, "python", state)
+    assert stats == {
+        "fetched": 3,
+        "inserted": 1,
+        "updated": 1,
+        "skipped": 1,
+        "watermark": "2024-12-03T10:00:00+0300",
+        "truncated": False,
+    }
+    assert [vacancy.id for vacancy in data_job.get_vacancies()] == ["2", "1", "3"]
+    assert data_job.get_vacancies(id="^2$")[0].salary == 150000
+
+
+def synced_store(server, temp_json_file, tmp_path, synced: int):
+    """
+    Хранилище и отметка после синхронизации, загрузившей synced самых старых
+    вакансий сервера-имитации: более новые опубликованы после неё
+    """
+    oldest = server.found - synced
+    data_job = DataJobHHJSON(str(temp_json_file))
+    data_job.add_many(
+        VacancyHH.from_api_items(
+            [server.vacancy(index) for index in range(oldest, server.found)],
+            APIJobHH().currency_rates,
+        )
+    )
+    state = SyncState(str(tmp_path / "sync.json"))
+    state.set_watermark("python", server.vacancy(oldest)["published_at"])
+    return data_job, state
+
+
+def test_truncated_sync_fetches_whole_window(stub_server, temp_json_file, tmp_path):
+    server = stub_server(found=350)
+    data_job, state = synced_store(server, temp_json_file, tmp_path, 100)
+
+    # 250 новых вакансий не помещаются на одну страницу выдачи
+    stats = sync_vacancies(APIJobHH(), data_job, "python", state, pages_count=1)
+
+    assert stats["fetched"] == 251
+    assert stats["inserted"] == 250
+    assert stats["truncated"] is False
+    assert stats["watermark"] == server.vacancy(0)["published_at"]
+    assert len(data_job.get_vacancies()) == 350
+
+
+def test_broad_first_sync_sets_watermark(stub_server, temp_json_file, tmp_path):
+    # Выдача больше ограничения hh.ru на глубину: 5000 вакансий за последние дни
+    newest = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(hours=1)
+    server = stub_server(found=5000, newest=newest)
+    state = SyncState(str(tmp_path / "sync.json"))
+    data_job = DataJobHHJSON(str(temp_json_file))
+
+    stats = sync_vacancies(
+        APIJobHH(), data_job, "python", state, pages_count=1, max_workers=4
+    )
+    assert stats["inserted"] == 5000
+    assert stats["truncated"] is False
+    assert stats["watermark"] == server.vacancy(0)["published_at"]
+    assert state.get_watermark("python") == stats["watermark"]
+
+    # Следующая синхронизация запрашивает только окно после отметки
+    requests_before = server.stats["requests"]
+    stats = sync_vacancies(APIJobHH(), data_job, "python", state, pages_count=1)
+    assert stats["fetched"] == 1
+    assert stats["skipped"] == 1
+    assert server.stats["requests"] == requests_before + 1
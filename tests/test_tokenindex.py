@@ -0,0 +1,76 @@
+import pytest
+from tokenindex import DEFAULT_FIELDS, TokenIndex, keyword_matcher, tokenize
+
+
+@pytest.fixture
+def index():
+    index = TokenIndex()
+    index.add("1", {"name": "Python Developer", "employer": "Яндекс"})
+    index.add("2", {"name": "Java Developer", "employer": "Сбер"})
+    index.add("3", {"name": "Senior Python-разработчик", "employer": None})
+    return index
+
+
+def test_tokenize():
+    assert tokenize("Senior Python-Разработчик (C++)") == [
+        "senior",
+        "python",
+        "разработчик",
+        "c",
+    ]
+    assert tokenize(None) == []
+
+
+def test_search_exact_words(index):
+    assert index.search("python") == {"1", "3"}
+    assert index.search("PYTHON developer") == {"1"}
+    assert index.search("яндекс") == {"1"}
+    assert index.search("pyth") == set()
+    assert index.search("") == {"1", "2", "3"}
+
+
+def test_search_prefix(index):
+    assert index.search("pyth", prefix=True) == {"1", "3"}
+    assert index.search("dev разраб", prefix=True) == set()
+    assert index.search("сб", prefix=True) == {"2"}
+
+
+def test_search_fields(index):
+    assert index.search("яндекс", fields=["name"]) == set()
+    with pytest.raises(ValueError, match="Поля не проиндексированы"):
+        index.search("python", fields=["url"])
+
+
+def test_add_replaces_and_remove(index):
+    index.add("1", {"name": "Go Developer"})
+    assert index.search("python") == {"3"}
+    assert index.search("go", prefix=True) == {"1"}
+
+    index.remove("1")
+    index.remove("unknown")
+    assert index.search("developer") == {"2"}
+    assert index.search("go", prefix=True) == set()
+    assert len(index) == 2
+
+
+@pytest.mark.parametrize(
+    "keyword,prefix,fields",
+    [
+        ("python", False, None),
+        ("PYTHON developer", False, None),
+        ("pyth", False, None),
+        ("pyth", True, None),
+        ("разраб сен", True, None),
+        ("яндекс", False, ["name"]),
+        ("", False, None),
+    ],
+)
+def test_keyword_matcher_agrees_with_index(index, keyword, prefix, fields):
+    vacancies = {
+        "1": {"name": "Python Developer", "employer": "Яндекс"},
+        "2": {"name": "Java Developer", "employer": "Сбер"},
+        "3": {"name": "Senior Python-разработчик", "employer": None},
+    }
+    matches = keyword_matcher(keyword, prefix, fields or DEFAULT_FIELDS)
+    found = {vacancy_id for vacancy_id, v in vacancies.items() if matches(v)}
+    assert found == index.search(keyword, prefix, fields)
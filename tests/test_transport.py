@@ -0,0 +1,66 @@
+import pytest
+import requests
+import responses
+from transport import HHTransport
+
+URL = "https://api.hh.ru/vacancies"
+
+
+@pytest.fixture
+def sleeps():
+    return []
+
+
+@pytest.fixture
+def transport(sleeps):
+    return HHTransport(max_retries=2, backoff_factor=0.1, sleep=sleeps.append)
+
+
+@responses.activate
+def test_retry_after_is_honoured(transport, sleeps):
+    responses.add(responses.GET, URL, status=429, headers={"Retry-After": "3"})
+    responses.add(responses.GET, URL, json={"items": []}, status=200)
+
+    assert transport.get_json(URL) == {"items": []}
+    assert sleeps == [3.0]
+    assert transport.stats == {"requests": 2, "retries": 1, "failures": 0}
+
+
+@responses.activate
+def test_server_errors_are_retried_with_backoff(transport, sleeps):
+    responses.add(responses.GET, URL, status=503)
+    responses.add(responses.GET, URL, status=502)
+    responses.add(responses.GET, URL, json={"items": [1]}, status=200)
+
+    assert transport.get_json(URL) == {"items": [1]}
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 0.1
+    assert 0 <= sleeps[1] <= 0.2
+
+
+@responses.activate
+def test_failure_after_retries(transport):
+    responses.add(responses.GET, URL, status=500)
+
+    with pytest.raises(ConnectionError, match="Ошибка получения данных: 500"):
+        transport.get_json(URL)
+    assert transport.stats == {"requests": 3, "retries": 2, "failures": 1}
+
+
+@responses.activate
+def test_connection_error_is_raised_after_retries(transport):
+    responses.add(responses.GET, URL, body=requests.ConnectionError("refused"))
+
+    with pytest.raises(ConnectionError, match="Ошибка соединения"):
+        transport.get(URL)
+    assert transport.stats["failures"] == 1
+
+
+@responses.activate
+def test_client_errors_are_not_retried(transport, sleeps):
+    responses.add(responses.GET, URL, status=404)
+
+    assert transport.get(URL).status_code == 404
+    assert sleeps == []
+    transport.reset_stats()
+    assert transport.stats == {"requests": 0, "retries": 0, "failures": 0}
@@ -0,0 +1,83 @@
+import math
+
+import pytest
+from vacancycollection import MISSING_EPOCH, VacancyCollection, to_epoch
+from vacancyhh import VacancyHH
+
+
+@pytest.fixture
+def collection():
+    salaries = [100000, None, 50000, 150000, 100000, 200000]
+    return VacancyCollection.from_vacancies(
+        VacancyHH(
+            {
+                "id": str(i),
+                "name": f"Vacancy {i}",
+                "salary": salary,
+                "published_at": f"2024-12-0{i + 1}T10:00:00+0300",
+            }
+        )
+        for i, salary in enumerate(salaries)
+    )
+
+
+def test_columns(collection):
+    assert len(collection) == 6
+    assert collection.ids == ["0", "1", "2", "3", "4", "5"]
+    assert math.isnan(collection.salaries[1])
+    assert collection.published_at[0] == to_epoch("2024-12-01T07:00:00+00:00")
+    assert collection.salary_count == 5
+
+
+def test_from_api_items():
+    items = [
+        {"id": "1", "name": "Dev", "salary": {"from": 1000, "currency": "USD"}},
+        {"id": "2", "name": "QA", "salary": None},
+    ]
+    collection = VacancyCollection.from_api_items(items, {"USD": 0.01})
+    assert list(collection.salaries)[0] == 100000
+    assert collection.published_at[1] == MISSING_EPOCH
+
+
+def test_filters(collection):
+    assert collection.filter_salary(100000, 150000).ids == ["0", "3", "4"]
+    assert collection.filter_salary(min_salary=150001).ids == ["5"]
+    assert collection.filter_salary().ids == ["0", "2", "3", "4", "5"]
+    start, end = to_epoch("2024-12-02"), to_epoch("2024-12-04")
+    assert collection.filter_published(start, end).ids == ["1", "2"]
+
+
+def test_sorting_matches_vacancy_ordering(collection):
+    assert collection.sort_by_salary().ids == ["5", "3", "0", "4", "2", "1"]
+    assert collection.sort_by_salary(descending=False).ids == [
+        "2",
+        "0",
+        "4",
+        "3",
+        "5",
+        "1",
+    ]
+    assert collection.top_by_salary(3).ids == ["5", "3", "0"]
+    assert collection.top_by_salary(10).ids == ["5", "3", "0", "4", "2"]
+    assert collection.top_by_salary(0).ids == []
+
+
+def test_statistics(collection):
+    assert collection.mean_salary() == 120000
+    assert collection.percentile(0) == 50000
+    assert collection.percentile(50) == 100000
+    assert collection.percentile(90) == 180000
+    assert collection.percentile(100) == 200000
+    with pytest.raises(ValueError):
+        collection.percentile(101)
+
+    counts, edges = collection.histogram(bins=3)
+    assert edges == [50000, 100000, 150000, 200000]
+    assert counts == [1, 2, 2]
+
+
+def test_empty_collection():
+    collection = VacancyCollection.from_vacancies([])
+    assert math.isnan(collection.mean_salary())
+    assert math.isnan(collection.percentile(50))
+    assert collection.histogram(bins=2)[0] == [0, 0]
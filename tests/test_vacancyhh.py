@@ -84,3 +84,47 @@ def test_vacancy_string_representation():
         "Зарплата: 90 000 ₽"
     )
     assert str(vacancy) == expected_str
+
+
+def test_from_api_items_matches_constructor():
+    items = [
+        {
+            "id": "1",
+            "url": "http://example.com",
+            "name": "Python Developer",
+            "published_at": "2024-01-01",
+            "employer": {"name": "Company XYZ"},
+            "salary": {"from": 100000, "to": 150000, "currency": "USD"},
+        },
+        {"id": "2", "name": "Java Developer", "salary": {"from": 90000}},
+        {"id": "3", "employer": None, "salary": None},
+        {"id": "4", "salary": {"from": None, "to": None, "currency": "RUR"}},
+        # Внутренний формат: работодатель строкой, зарплата числом
+        {"id": "5", "employer": "Company XYZ", "salary": 120000},
+        {"id": "6", "employer": "", "salary": 0.5},
+        {"id": "7", "salary": "не число"},
+    ]
+    currency_rates = {"USD": 75.0}
+
+    batch = VacancyHH.from_api_items(items, currency_rates)
+    assert not isinstance(batch, list)  # Объекты создаются по мере перебора
+    assert [vacancy.to_dict() for vacancy in batch] == [
+        VacancyHH(item, currency_rates).to_dict() for item in items
+    ]
+
+    with pytest.raises(ValueError, match="Ожидается наличие id вакансии."):
+        list(VacancyHH.from_api_items([{"name": "Без id"}]))
+    with pytest.raises(ValueError, match="Ожидается словарь"):
+        list(VacancyHH.from_api_items(["1"]))
+
+
+def test_from_storage_records():
+    records = [
+        VacancyHH({"id": "1", "employer": {"name": "XYZ"}, "salary": 1000}).to_dict(),
+        {"id": "2", "name": "Java Developer"},
+    ]
+    vacancies = list(VacancyHH.from_storage_records(records))
+    assert [vacancy.to_dict() for vacancy in vacancies] == [
+        VacancyHH(record).to_dict() for record in records
+    ]
+    assert vacancies[0] > vacancies[1]